@@ -24,15 +24,42 @@ CREATE TABLE Player (
     INJURY_DESIGNATION TEXT,
     INJURY_DATE TEXT,
     INJURY_DESCRIPTION TEXT,
+    ROW_HASH TEXT,
+    ACTIVE INTEGER DEFAULT 1,
+    LAST_UPDATED TEXT,
     FOREIGN KEY (TEAM_ABBR) REFERENCES Team(ABBREVIATION)
     FOREIGN KEY (TEAM_ID) REFERENCES TEAM(TEAM_ID),
     UNIQUE (PLAYER_ID)
 );
 
+CREATE TABLE Player_History (
+    PLAYER_HISTORY_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    PLAYER_ID INTEGER,
+    CHANGE_TYPE TEXT, -- [Added, Updated, Retired, Returned, Baseline]
+    CHANGE_DATE TEXT,
+    FULL_NAME TEXT,
+    POSITION TEXT,
+    TEAM_ABBR TEXT,
+    TEAM_ID INTEGER,
+    HEIGHT TEXT,
+    WEIGHT INTEGER,
+    AGE INTEGER,
+    EXPERIENCE TEXT,
+    COLLEGE TEXT,
+    JERSEY_NUMBER INTEGER,
+    INJURY_DESIGNATION TEXT,
+    INJURY_DATE TEXT,
+    INJURY_DESCRIPTION TEXT,
+    ROW_HASH TEXT,
+    FOREIGN KEY (PLAYER_ID) REFERENCES Player(PLAYER_ID)
+);
+
+CREATE INDEX IDX_PLAYER_HISTORY_PLAYER ON Player_History (PLAYER_ID, CHANGE_DATE);
+
 CREATE TABLE Game (
     GAME_ID TEXT PRIMARY KEY,
     GAME_WEEK TEXT,
-    GAME_DATE TEXT,
+    GAME_DATE TEXT, -- YYYY-MM-DD
     GAME_TIME TEXT,
     GAME_TYPE TEXT,
     HOME_TEAM TEXT CHECK(LENGTH(HOME_TEAM) <= 3),
@@ -46,6 +73,8 @@ CREATE TABLE Game (
     WINNING_TEAM_ID INTEGER,
     SEASON_ID TEXT,
     PRIMETIME TEXT, 
+    GAME_DATE_KEY INTEGER, -- YYYYMMDD
+    KICKOFF_UTC TEXT, -- YYYY-MM-DDTHH:MM:SSZ
     FOREIGN KEY (HOME_TEAM_ID) REFERENCES Team(TEAM_ID),
     FOREIGN KEY (AWAY_TEAM_ID) REFERENCES Team(TEAM_ID),
     FOREIGN KEY (WINNING_TEAM_ID) REFERENCES Team(TEAM_ID),
@@ -135,6 +164,22 @@ CREATE TABLE Team_Game_Stats (
     POINTS_ALLOWED INTEGER,
     DEF_SACKS INTEGER,
     DEF_YARDS_ALLOWED INTEGER,
+    OFF_THIRD_DOWN_CONVERSIONS INTEGER,
+    OFF_THIRD_DOWN_ATTEMPTS INTEGER,
+    OFF_FOURTH_DOWN_CONVERSIONS INTEGER,
+    OFF_FOURTH_DOWN_ATTEMPTS INTEGER,
+    OFF_PASS_COMPLETIONS INTEGER,
+    OFF_PASS_ATTEMPTS INTEGER,
+    OFF_RED_ZONE_SCORED INTEGER,
+    OFF_RED_ZONE_ATTEMPTS INTEGER,
+    SACKS_TAKEN INTEGER,
+    SACK_YARDS_LOST INTEGER,
+    PENALTY_COUNT INTEGER,
+    PENALTY_YARDS INTEGER,
+    POSSESSION_SECONDS INTEGER,
+    HOME_LEAGUE_PTS REAL, -- Team defense (DST) fantasy points, see Clean.calculate_dst_points
+    DK_PTS REAL,
+    FD_PTS REAL,
     FOREIGN KEY (TEAM_ID) REFERENCES Team(TEAM_ID),
     FOREIGN KEY (GAME_ID) REFERENCES Game(GAME_ID),
     FOREIGN KEY (VERSUS_TEAM_ID) REFERENCES Team(TEAM_ID),
@@ -151,6 +196,159 @@ CREATE TABLE Weather (
     WIND_SPEED INTEGER,
     PRECIPITATION REAL,
     CONDITION TEXT,
+    OBSERVATION_TIME_LOCAL TEXT, -- YYYY-MM-DDTHH:MM:SS (stadium's local time)
+    OBSERVATION_TIME_UTC TEXT, -- YYYY-MM-DDTHH:MM:SSZ
     FOREIGN KEY (GAME_ID) REFERENCES Game(GAME_ID),
     UNIQUE (WEATHER_ID)
-);
\ No newline at end of file
+);
+
+CREATE INDEX IDX_GAME_DATE_KEY ON Game (GAME_DATE_KEY);
+CREATE INDEX IDX_GAME_KICKOFF_UTC ON Game (KICKOFF_UTC);
+CREATE INDEX IDX_GAME_SEASON_WEEK ON Game (SEASON_ID, GAME_WEEK);
+CREATE INDEX IDX_WEATHER_GAME_OBSERVATION ON Weather (GAME_ID, OBSERVATION_TIME_UTC);
+CREATE INDEX IDX_WEATHER_OBSERVATION_UTC ON Weather (OBSERVATION_TIME_UTC);
+
+CREATE TABLE Quarantine (
+    QUARANTINE_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    GAME_ID TEXT,
+    TABLE_NAME TEXT,
+    REASON TEXT,
+    ROW_DATA TEXT, -- JSON of the failing row
+    QUARANTINED_AT TEXT
+);
+
+CREATE INDEX IDX_QUARANTINE_GAME ON Quarantine (GAME_ID);
+
+CREATE TABLE Dead_Letter (
+    DEAD_LETTER_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ITEM_TYPE TEXT CHECK(ITEM_TYPE IN ('game', 'weather')),
+    ITEM_KEY TEXT, -- GAME_ID
+    PAYLOAD TEXT, -- JSON of the arguments needed to fetch the item again
+    ERROR TEXT,
+    ATTEMPTS INTEGER, -- Fetch attempts across every run and replay
+    FIRST_FAILED_AT TEXT,
+    LAST_FAILED_AT TEXT,
+    RESOLVED_AT TEXT, -- NULL until the item is loaded
+    UNIQUE (ITEM_TYPE, ITEM_KEY)
+);
+
+CREATE INDEX IDX_DEAD_LETTER_UNRESOLVED ON Dead_Letter (RESOLVED_AT, ITEM_TYPE);
+
+CREATE TABLE Data_Version (
+    DATA_VERSION_ID INTEGER PRIMARY KEY CHECK(DATA_VERSION_ID = 1), -- Single row
+    VERSION INTEGER NOT NULL,
+    UPDATED_AT TEXT
+);
+
+INSERT INTO Data_Version (DATA_VERSION_ID, VERSION, UPDATED_AT) VALUES (1, 0, NULL);
+
+-- Join keys of the read API queries
+CREATE INDEX IDX_PLAYER_GAME_STATS_PLAYER ON Player_Game_Stats (PLAYER_ID, GAME_ID);
+CREATE INDEX IDX_PLAYER_GAME_STATS_GAME ON Player_Game_Stats (GAME_ID);
+CREATE INDEX IDX_TEAM_GAME_STATS_GAME ON Team_Game_Stats (GAME_ID);
+
+-- Confirmed matches of external player names (salary files, ADP, injury feeds) to players, see player_resolver.py
+CREATE TABLE Player_Alias (
+    PLAYER_ALIAS_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    SOURCE TEXT NOT NULL DEFAULT '', -- Where the name comes from, e.g., 'dk_salaries' ('' if not given)
+    ALIAS_NAME TEXT, -- Name as it appears in the source
+    ALIAS_KEY TEXT, -- Normalized name (PlayerResolver.normalize_name)
+    TEAM TEXT DEFAULT '', -- Team the name was confirmed for ('' if any team)
+    POSITION TEXT DEFAULT '', -- Position the name was confirmed for ('' if any position)
+    PLAYER_ID INTEGER,
+    CONFIRMED_AT TEXT,
+    FOREIGN KEY (PLAYER_ID) REFERENCES Player(PLAYER_ID),
+    UNIQUE (SOURCE, ALIAS_KEY, TEAM, POSITION)
+);
+
+-- Full-text indexes over the injury text of Player and Player_History, kept in sync by triggers (see NFL_Queries.injury_search)
+CREATE VIRTUAL TABLE Player_Injury_Search USING fts5(
+    INJURY_DESIGNATION,
+    INJURY_DESCRIPTION,
+    content='Player',
+    content_rowid='PLAYER_ID',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER TRG_PLAYER_INJURY_SEARCH_INSERT AFTER INSERT ON Player BEGIN
+    INSERT INTO Player_Injury_Search (rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES (new.PLAYER_ID, new.INJURY_DESIGNATION, new.INJURY_DESCRIPTION);
+END;
+
+CREATE TRIGGER TRG_PLAYER_INJURY_SEARCH_DELETE AFTER DELETE ON Player BEGIN
+    INSERT INTO Player_Injury_Search (Player_Injury_Search, rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES ('delete', old.PLAYER_ID, old.INJURY_DESIGNATION, old.INJURY_DESCRIPTION);
+END;
+
+CREATE TRIGGER TRG_PLAYER_INJURY_SEARCH_UPDATE AFTER UPDATE OF PLAYER_ID, INJURY_DESIGNATION, INJURY_DESCRIPTION ON Player BEGIN
+    INSERT INTO Player_Injury_Search (Player_Injury_Search, rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES ('delete', old.PLAYER_ID, old.INJURY_DESIGNATION, old.INJURY_DESCRIPTION);
+    INSERT INTO Player_Injury_Search (rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES (new.PLAYER_ID, new.INJURY_DESIGNATION, new.INJURY_DESCRIPTION);
+END;
+
+CREATE VIRTUAL TABLE Player_History_Injury_Search USING fts5(
+    INJURY_DESIGNATION,
+    INJURY_DESCRIPTION,
+    content='Player_History',
+    content_rowid='PLAYER_HISTORY_ID',
+    tokenize='porter unicode61'
+);
+
+-- Player_History is append-only, deletes are only covered so the index can't point at missing rows
+CREATE TRIGGER TRG_PLAYER_HISTORY_INJURY_SEARCH_INSERT AFTER INSERT ON Player_History BEGIN
+    INSERT INTO Player_History_Injury_Search (rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES (new.PLAYER_HISTORY_ID, new.INJURY_DESIGNATION, new.INJURY_DESCRIPTION);
+END;
+
+CREATE TRIGGER TRG_PLAYER_HISTORY_INJURY_SEARCH_DELETE AFTER DELETE ON Player_History BEGIN
+    INSERT INTO Player_History_Injury_Search (Player_History_Injury_Search, rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES ('delete', old.PLAYER_HISTORY_ID, old.INJURY_DESIGNATION, old.INJURY_DESCRIPTION);
+END;
+
+-- Leagues scored by league_scoring.py (fantasy_scoring.json platforms and leagues/*.json), with a hash of their rules
+CREATE TABLE League (
+    LEAGUE_ID TEXT PRIMARY KEY,
+    SOURCE TEXT, -- Scoring file the league is defined in
+    SCORING_HASH TEXT, -- Hash of the league's scoring rules, the league is rescored when they change
+    SCORED_AT TEXT
+);
+
+-- Fantasy points of every player game in every league (long format, one row per league and player game)
+CREATE TABLE Player_Game_Score (
+    PLAYER_GAME_ID INTEGER,
+    LEAGUE_ID TEXT,
+    PTS REAL,
+    PRIMARY KEY (PLAYER_GAME_ID, LEAGUE_ID),
+    FOREIGN KEY (PLAYER_GAME_ID) REFERENCES Player_Game_Stats(PLAYER_GAME_ID),
+    FOREIGN KEY (LEAGUE_ID) REFERENCES League(LEAGUE_ID)
+) WITHOUT ROWID; -- Keyed by player game first, reads join it from Player_Game_Stats (no second index to keep up on writes)
+
+-- Reloaded games get new PLAYER_GAME_IDs, their old scores go with the old rows
+CREATE TRIGGER TRG_PLAYER_GAME_SCORE_DELETE AFTER DELETE ON Player_Game_Stats BEGIN
+    DELETE FROM Player_Game_Score WHERE PLAYER_GAME_ID = old.PLAYER_GAME_ID;
+END;
+
+-- Schedule context of every team's games (rest days, byes, road streaks, travel), built by team_game_context.py
+CREATE TABLE Team_Game_Context (
+    GAME_ID TEXT,
+    TEAM_ID INTEGER,
+    TEAM_ABBR TEXT CHECK(LENGTH(TEAM_ABBR) <= 3),
+    OPPONENT_TEAM_ID INTEGER,
+    SEASON_ID TEXT,
+    GAME_TYPE TEXT,
+    HOME_OR_AWAY TEXT, -- [Home, Away] as listed in Game, see NEUTRAL_SITE
+    NEUTRAL_SITE INTEGER, -- 1 if the game wasn't played at the home team's stadium (international games, Super Bowl, ...)
+    PREVIOUS_GAME_ID TEXT,
+    DAYS_REST INTEGER, -- Days since the team's previous game of the season (preseason counted separately), NULL for the first
+    OPPONENT_DAYS_REST INTEGER,
+    POST_BYE INTEGER, -- 1 after at least bye_min_rest_days of rest (config.json Team_Game_Context), not in the preseason or the bye_excluded_weeks (Super Bowl)
+    CONSECUTIVE_ROAD_GAMES INTEGER, -- Games in a row away from the team's stadium including this one, 0 at home
+    TRAVEL_MILES REAL, -- Great-circle miles from the team's stadium to the game's site
+    PRIMARY KEY (GAME_ID, TEAM_ID),
+    FOREIGN KEY (GAME_ID) REFERENCES Game(GAME_ID),
+    FOREIGN KEY (TEAM_ID) REFERENCES Team(TEAM_ID),
+    FOREIGN KEY (OPPONENT_TEAM_ID) REFERENCES Team(TEAM_ID)
+);
+
+CREATE INDEX IDX_TEAM_GAME_CONTEXT_SEASON_TEAM ON Team_Game_Context (SEASON_ID, TEAM_ID);
@@ -0,0 +1,29 @@
+-- Player rows are synced by hash instead of deleted and reloaded every run (see player_sync.py)
+ALTER TABLE Player ADD COLUMN ROW_HASH TEXT;
+ALTER TABLE Player ADD COLUMN ACTIVE INTEGER DEFAULT 1;
+ALTER TABLE Player ADD COLUMN LAST_UPDATED TEXT;
+
+-- Append-only log of player changes (team, injury designation, etc.)
+CREATE TABLE Player_History (
+    PLAYER_HISTORY_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    PLAYER_ID INTEGER,
+    CHANGE_TYPE TEXT, -- [Added, Updated, Retired, Returned, Baseline]
+    CHANGE_DATE TEXT,
+    FULL_NAME TEXT,
+    POSITION TEXT,
+    TEAM_ABBR TEXT,
+    TEAM_ID INTEGER,
+    HEIGHT TEXT,
+    WEIGHT INTEGER,
+    AGE INTEGER,
+    EXPERIENCE TEXT,
+    COLLEGE TEXT,
+    JERSEY_NUMBER INTEGER,
+    INJURY_DESIGNATION TEXT,
+    INJURY_DATE TEXT,
+    INJURY_DESCRIPTION TEXT,
+    ROW_HASH TEXT,
+    FOREIGN KEY (PLAYER_ID) REFERENCES Player(PLAYER_ID)
+);
+
+CREATE INDEX IDX_PLAYER_HISTORY_PLAYER ON Player_History (PLAYER_ID, CHANGE_DATE);
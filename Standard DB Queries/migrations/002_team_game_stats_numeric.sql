@@ -0,0 +1,30 @@
+-- Numeric columns parsed from the composite TEXT team stats ('5-12', '31:22'), see Clean.split_composite_fields
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_THIRD_DOWN_CONVERSIONS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_THIRD_DOWN_ATTEMPTS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_FOURTH_DOWN_CONVERSIONS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_FOURTH_DOWN_ATTEMPTS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_PASS_COMPLETIONS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_PASS_ATTEMPTS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_RED_ZONE_SCORED INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN OFF_RED_ZONE_ATTEMPTS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN SACKS_TAKEN INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN SACK_YARDS_LOST INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN PENALTY_COUNT INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN PENALTY_YARDS INTEGER;
+ALTER TABLE Team_Game_Stats ADD COLUMN POSSESSION_SECONDS INTEGER;
+
+-- Backfill existing rows (values without a '-' / ':' become 0, matching convert_column_types)
+UPDATE Team_Game_Stats SET
+    OFF_THIRD_DOWN_CONVERSIONS = CASE WHEN instr(OFF_THIRD_DOWN_EFFICIENCY, '-') > 0 THEN CAST(substr(OFF_THIRD_DOWN_EFFICIENCY, 1, instr(OFF_THIRD_DOWN_EFFICIENCY, '-') - 1) AS INTEGER) ELSE 0 END,
+    OFF_THIRD_DOWN_ATTEMPTS = CASE WHEN instr(OFF_THIRD_DOWN_EFFICIENCY, '-') > 0 THEN CAST(substr(OFF_THIRD_DOWN_EFFICIENCY, instr(OFF_THIRD_DOWN_EFFICIENCY, '-') + 1) AS INTEGER) ELSE 0 END,
+    OFF_FOURTH_DOWN_CONVERSIONS = CASE WHEN instr(OFF_FOURTH_DOWN_EFFICIENCY, '-') > 0 THEN CAST(substr(OFF_FOURTH_DOWN_EFFICIENCY, 1, instr(OFF_FOURTH_DOWN_EFFICIENCY, '-') - 1) AS INTEGER) ELSE 0 END,
+    OFF_FOURTH_DOWN_ATTEMPTS = CASE WHEN instr(OFF_FOURTH_DOWN_EFFICIENCY, '-') > 0 THEN CAST(substr(OFF_FOURTH_DOWN_EFFICIENCY, instr(OFF_FOURTH_DOWN_EFFICIENCY, '-') + 1) AS INTEGER) ELSE 0 END,
+    OFF_PASS_COMPLETIONS = CASE WHEN instr(OFF_PASS_COMPLETIONS_AND_ATTEMPTS, '-') > 0 THEN CAST(substr(OFF_PASS_COMPLETIONS_AND_ATTEMPTS, 1, instr(OFF_PASS_COMPLETIONS_AND_ATTEMPTS, '-') - 1) AS INTEGER) ELSE 0 END,
+    OFF_PASS_ATTEMPTS = CASE WHEN instr(OFF_PASS_COMPLETIONS_AND_ATTEMPTS, '-') > 0 THEN CAST(substr(OFF_PASS_COMPLETIONS_AND_ATTEMPTS, instr(OFF_PASS_COMPLETIONS_AND_ATTEMPTS, '-') + 1) AS INTEGER) ELSE 0 END,
+    OFF_RED_ZONE_SCORED = CASE WHEN instr(OFF_RED_ZONE_SCORED_AND_ATTEMPTED, '-') > 0 THEN CAST(substr(OFF_RED_ZONE_SCORED_AND_ATTEMPTED, 1, instr(OFF_RED_ZONE_SCORED_AND_ATTEMPTED, '-') - 1) AS INTEGER) ELSE 0 END,
+    OFF_RED_ZONE_ATTEMPTS = CASE WHEN instr(OFF_RED_ZONE_SCORED_AND_ATTEMPTED, '-') > 0 THEN CAST(substr(OFF_RED_ZONE_SCORED_AND_ATTEMPTED, instr(OFF_RED_ZONE_SCORED_AND_ATTEMPTED, '-') + 1) AS INTEGER) ELSE 0 END,
+    SACKS_TAKEN = CASE WHEN instr(SACKS_TAKEN_AND_YARDS_LOST, '-') > 0 THEN CAST(substr(SACKS_TAKEN_AND_YARDS_LOST, 1, instr(SACKS_TAKEN_AND_YARDS_LOST, '-') - 1) AS INTEGER) ELSE 0 END,
+    SACK_YARDS_LOST = CASE WHEN instr(SACKS_TAKEN_AND_YARDS_LOST, '-') > 0 THEN CAST(substr(SACKS_TAKEN_AND_YARDS_LOST, instr(SACKS_TAKEN_AND_YARDS_LOST, '-') + 1) AS INTEGER) ELSE 0 END,
+    PENALTY_COUNT = CASE WHEN instr(PENALTIES, '-') > 0 THEN CAST(substr(PENALTIES, 1, instr(PENALTIES, '-') - 1) AS INTEGER) ELSE 0 END,
+    PENALTY_YARDS = CASE WHEN instr(PENALTIES, '-') > 0 THEN CAST(substr(PENALTIES, instr(PENALTIES, '-') + 1) AS INTEGER) ELSE 0 END,
+    POSSESSION_SECONDS = CASE WHEN instr(POSSESSION_TIME, ':') > 0 THEN CAST(substr(POSSESSION_TIME, 1, instr(POSSESSION_TIME, ':') - 1) AS INTEGER) * 60 + CAST(substr(POSSESSION_TIME, instr(POSSESSION_TIME, ':') + 1) AS INTEGER) ELSE 0 END;
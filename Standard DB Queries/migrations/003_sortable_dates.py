@@ -0,0 +1,58 @@
+# Converts Game.GAME_DATE from 'MM-DD-YYYY' to ISO-8601 'YYYY-MM-DD' and adds sortable/indexed date keys:
+#   Game.GAME_DATE_KEY (YYYYMMDD integer), Game.KICKOFF_UTC, Weather.OBSERVATION_TIME_LOCAL and Weather.OBSERVATION_TIME_UTC
+# Runs as python (see db_helper.apply_migrations) because the UTC conversions need each stadium's timezone.
+
+import json
+import os
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'config.json')
+
+
+def to_utc(local_dt, tz_name):
+    return local_dt.replace(tzinfo=ZoneInfo(tz_name)).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def migrate(conn):
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    team_timezones = {team: info['timezone'] for team, info in config['Weather_Table_Mapping'].items() if 'timezone' in info}
+
+    conn.execute("ALTER TABLE Game ADD COLUMN GAME_DATE_KEY INTEGER")
+    conn.execute("ALTER TABLE Game ADD COLUMN KICKOFF_UTC TEXT")
+    conn.execute("ALTER TABLE Weather ADD COLUMN OBSERVATION_TIME_LOCAL TEXT")
+    conn.execute("ALTER TABLE Weather ADD COLUMN OBSERVATION_TIME_UTC TEXT")
+
+    # Game dates and kickoff (GAME_TIME is Eastern time)
+    game_updates = []
+    game_dates = {}
+    for game_id, game_date, game_time, home_team in conn.execute("SELECT GAME_ID, GAME_DATE, GAME_TIME, HOME_TEAM FROM Game").fetchall():
+        date = datetime.strptime(game_date, '%m-%d-%Y')
+        try:
+            kickoff_utc = to_utc(datetime.strptime(f"{date:%Y-%m-%d} {game_time}", '%Y-%m-%d %I:%M %p'), 'America/New_York')
+        except (TypeError, ValueError):
+            kickoff_utc = ''
+        game_dates[game_id] = (date, home_team)
+        game_updates.append((f"{date:%Y-%m-%d}", int(f"{date:%Y%m%d}"), kickoff_utc, game_id))
+    conn.executemany("UPDATE Game SET GAME_DATE = ?, GAME_DATE_KEY = ?, KICKOFF_UTC = ? WHERE GAME_ID = ?", game_updates)
+
+    # Weather observations (TIME is local to the home team's stadium)
+    weather_updates = []
+    for weather_id, game_id, obs_time in conn.execute("SELECT WEATHER_ID, GAME_ID, TIME FROM Weather").fetchall():
+        if game_id not in game_dates:
+            continue
+        date, home_team = game_dates[game_id]
+        try:
+            observed = datetime.strptime(f"{date:%Y-%m-%d} {obs_time}", '%Y-%m-%d %I:%M %p')
+        except (TypeError, ValueError):
+            continue
+        observed_utc = to_utc(observed, team_timezones[home_team]) if home_team in team_timezones else None
+        weather_updates.append((observed.strftime('%Y-%m-%dT%H:%M:%S'), observed_utc, weather_id))
+    conn.executemany("UPDATE Weather SET OBSERVATION_TIME_LOCAL = ?, OBSERVATION_TIME_UTC = ? WHERE WEATHER_ID = ?", weather_updates)
+
+    conn.execute("CREATE INDEX IDX_GAME_DATE_KEY ON Game (GAME_DATE_KEY)")
+    conn.execute("CREATE INDEX IDX_GAME_KICKOFF_UTC ON Game (KICKOFF_UTC)")
+    conn.execute("CREATE INDEX IDX_GAME_SEASON_WEEK ON Game (SEASON_ID, GAME_WEEK)")
+    conn.execute("CREATE INDEX IDX_WEATHER_GAME_OBSERVATION ON Weather (GAME_ID, OBSERVATION_TIME_UTC)")
+    conn.execute("CREATE INDEX IDX_WEATHER_OBSERVATION_UTC ON Weather (OBSERVATION_TIME_UTC)")
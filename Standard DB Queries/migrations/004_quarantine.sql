@@ -0,0 +1,11 @@
+-- Rows that failed pre-load validation (see validate.py), their game is held back from the load
+CREATE TABLE Quarantine (
+    QUARANTINE_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    GAME_ID TEXT,
+    TABLE_NAME TEXT,
+    REASON TEXT,
+    ROW_DATA TEXT, -- JSON of the failing row
+    QUARANTINED_AT TEXT
+);
+
+CREATE INDEX IDX_QUARANTINE_GAME ON Quarantine (GAME_ID);
@@ -0,0 +1,15 @@
+-- Game/weather fetches that failed after every retry, replayed with `python run_pipeline.py replay`
+CREATE TABLE Dead_Letter (
+    DEAD_LETTER_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ITEM_TYPE TEXT CHECK(ITEM_TYPE IN ('game', 'weather')),
+    ITEM_KEY TEXT, -- GAME_ID
+    PAYLOAD TEXT, -- JSON of the arguments needed to fetch the item again
+    ERROR TEXT,
+    ATTEMPTS INTEGER, -- Fetch attempts across every run and replay
+    FIRST_FAILED_AT TEXT,
+    LAST_FAILED_AT TEXT,
+    RESOLVED_AT TEXT, -- NULL until the item is loaded
+    UNIQUE (ITEM_TYPE, ITEM_KEY)
+);
+
+CREATE INDEX IDX_DEAD_LETTER_UNRESOLVED ON Dead_Letter (RESOLVED_AT, ITEM_TYPE);
@@ -0,0 +1,13 @@
+-- Counter bumped by every load that changes data, read API caches (see queries.py) are keyed on it
+CREATE TABLE Data_Version (
+    DATA_VERSION_ID INTEGER PRIMARY KEY CHECK(DATA_VERSION_ID = 1), -- Single row
+    VERSION INTEGER NOT NULL,
+    UPDATED_AT TEXT
+);
+
+INSERT INTO Data_Version (DATA_VERSION_ID, VERSION, UPDATED_AT) VALUES (1, 0, NULL);
+
+-- Join keys of the read API queries
+CREATE INDEX IDX_PLAYER_GAME_STATS_PLAYER ON Player_Game_Stats (PLAYER_ID, GAME_ID);
+CREATE INDEX IDX_PLAYER_GAME_STATS_GAME ON Player_Game_Stats (GAME_ID);
+CREATE INDEX IDX_TEAM_GAME_STATS_GAME ON Team_Game_Stats (GAME_ID);
@@ -0,0 +1,22 @@
+# Adds team defense (DST) fantasy points to Team_Game_Stats (HOME_LEAGUE_PTS, DK_PTS, FD_PTS) and scores the existing rows.
+# Runs as python (see db_helper.apply_migrations) because the points come from fantasy_scoring.json through
+# Clean.calculate_dst_points, the same code the pipeline and `run_pipeline.py rescore` use.
+
+import pandas as pd
+
+PLATFORMS = ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']
+
+
+def migrate(conn):
+    from clean import Clean
+
+    for platform in PLATFORMS:
+        conn.execute(f"ALTER TABLE Team_Game_Stats ADD COLUMN {platform} REAL")
+
+    cleaner = Clean()
+    team_game_df = pd.read_sql_query("SELECT * FROM Team_Game_Stats", conn)
+    for platform in PLATFORMS:
+        team_game_df[platform] = cleaner.calculate_dst_points(team_game_df, platform)
+
+    rows = team_game_df[PLATFORMS + ['TEAM_GAME_ID']].astype(object).values.tolist()
+    conn.executemany(f"UPDATE Team_Game_Stats SET {', '.join(f'{platform} = ?' for platform in PLATFORMS)} WHERE TEAM_GAME_ID = ?", rows)
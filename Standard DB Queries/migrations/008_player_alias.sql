@@ -0,0 +1,13 @@
+-- Confirmed matches of external player names (salary files, ADP, injury feeds) to players, see player_resolver.py
+CREATE TABLE Player_Alias (
+    PLAYER_ALIAS_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    SOURCE TEXT NOT NULL DEFAULT '', -- Where the name comes from, e.g., 'dk_salaries' ('' if not given)
+    ALIAS_NAME TEXT, -- Name as it appears in the source
+    ALIAS_KEY TEXT, -- Normalized name (PlayerResolver.normalize_name)
+    TEAM TEXT DEFAULT '', -- Team the name was confirmed for ('' if any team)
+    POSITION TEXT DEFAULT '', -- Position the name was confirmed for ('' if any position)
+    PLAYER_ID INTEGER,
+    CONFIRMED_AT TEXT,
+    FOREIGN KEY (PLAYER_ID) REFERENCES Player(PLAYER_ID),
+    UNIQUE (SOURCE, ALIAS_KEY, TEAM, POSITION)
+);
@@ -0,0 +1,49 @@
+-- Full-text indexes over the injury text of Player and Player_History (see NFL_Queries.injury_search)
+-- External content tables: the text stays in Player/Player_History, the triggers keep the indexes in sync
+CREATE VIRTUAL TABLE Player_Injury_Search USING fts5(
+    INJURY_DESIGNATION,
+    INJURY_DESCRIPTION,
+    content='Player',
+    content_rowid='PLAYER_ID',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER TRG_PLAYER_INJURY_SEARCH_INSERT AFTER INSERT ON Player BEGIN
+    INSERT INTO Player_Injury_Search (rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES (new.PLAYER_ID, new.INJURY_DESIGNATION, new.INJURY_DESCRIPTION);
+END;
+
+CREATE TRIGGER TRG_PLAYER_INJURY_SEARCH_DELETE AFTER DELETE ON Player BEGIN
+    INSERT INTO Player_Injury_Search (Player_Injury_Search, rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES ('delete', old.PLAYER_ID, old.INJURY_DESIGNATION, old.INJURY_DESCRIPTION);
+END;
+
+CREATE TRIGGER TRG_PLAYER_INJURY_SEARCH_UPDATE AFTER UPDATE OF PLAYER_ID, INJURY_DESIGNATION, INJURY_DESCRIPTION ON Player BEGIN
+    INSERT INTO Player_Injury_Search (Player_Injury_Search, rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES ('delete', old.PLAYER_ID, old.INJURY_DESIGNATION, old.INJURY_DESCRIPTION);
+    INSERT INTO Player_Injury_Search (rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES (new.PLAYER_ID, new.INJURY_DESIGNATION, new.INJURY_DESCRIPTION);
+END;
+
+CREATE VIRTUAL TABLE Player_History_Injury_Search USING fts5(
+    INJURY_DESIGNATION,
+    INJURY_DESCRIPTION,
+    content='Player_History',
+    content_rowid='PLAYER_HISTORY_ID',
+    tokenize='porter unicode61'
+);
+
+-- Player_History is append-only, deletes are only covered so the index can't point at missing rows
+CREATE TRIGGER TRG_PLAYER_HISTORY_INJURY_SEARCH_INSERT AFTER INSERT ON Player_History BEGIN
+    INSERT INTO Player_History_Injury_Search (rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES (new.PLAYER_HISTORY_ID, new.INJURY_DESIGNATION, new.INJURY_DESCRIPTION);
+END;
+
+CREATE TRIGGER TRG_PLAYER_HISTORY_INJURY_SEARCH_DELETE AFTER DELETE ON Player_History BEGIN
+    INSERT INTO Player_History_Injury_Search (Player_History_Injury_Search, rowid, INJURY_DESIGNATION, INJURY_DESCRIPTION)
+    VALUES ('delete', old.PLAYER_HISTORY_ID, old.INJURY_DESIGNATION, old.INJURY_DESCRIPTION);
+END;
+
+-- Index the rows that are already there
+INSERT INTO Player_Injury_Search (Player_Injury_Search) VALUES ('rebuild');
+INSERT INTO Player_History_Injury_Search (Player_History_Injury_Search) VALUES ('rebuild');
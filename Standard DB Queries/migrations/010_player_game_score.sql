@@ -0,0 +1,22 @@
+-- Leagues scored by league_scoring.py (fantasy_scoring.json platforms and leagues/*.json), with a hash of their rules
+CREATE TABLE League (
+    LEAGUE_ID TEXT PRIMARY KEY,
+    SOURCE TEXT, -- Scoring file the league is defined in
+    SCORING_HASH TEXT, -- Hash of the league's scoring rules, the league is rescored when they change
+    SCORED_AT TEXT
+);
+
+-- Fantasy points of every player game in every league (long format, one row per league and player game)
+CREATE TABLE Player_Game_Score (
+    PLAYER_GAME_ID INTEGER,
+    LEAGUE_ID TEXT,
+    PTS REAL,
+    PRIMARY KEY (PLAYER_GAME_ID, LEAGUE_ID),
+    FOREIGN KEY (PLAYER_GAME_ID) REFERENCES Player_Game_Stats(PLAYER_GAME_ID),
+    FOREIGN KEY (LEAGUE_ID) REFERENCES League(LEAGUE_ID)
+) WITHOUT ROWID; -- Keyed by player game first, reads join it from Player_Game_Stats (no second index to keep up on writes)
+
+-- Reloaded games get new PLAYER_GAME_IDs, their old scores go with the old rows
+CREATE TRIGGER TRG_PLAYER_GAME_SCORE_DELETE AFTER DELETE ON Player_Game_Stats BEGIN
+    DELETE FROM Player_Game_Score WHERE PLAYER_GAME_ID = old.PLAYER_GAME_ID;
+END;
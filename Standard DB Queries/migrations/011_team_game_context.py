@@ -0,0 +1,38 @@
+# Adds Team_Game_Context (rest days, byes, road streaks and travel of every team's games) and builds it for the games
+# already loaded. Runs as python (see db_helper.apply_migrations) because the rows come from
+# TeamGameContext.write_seasons, the same code the pipeline runs after every load.
+
+CREATE_TABLE = """
+CREATE TABLE Team_Game_Context (
+    GAME_ID TEXT,
+    TEAM_ID INTEGER,
+    TEAM_ABBR TEXT CHECK(LENGTH(TEAM_ABBR) <= 3),
+    OPPONENT_TEAM_ID INTEGER,
+    SEASON_ID TEXT,
+    GAME_TYPE TEXT,
+    HOME_OR_AWAY TEXT, -- [Home, Away] as listed in Game, see NEUTRAL_SITE
+    NEUTRAL_SITE INTEGER, -- 1 if the game wasn't played at the home team's stadium (international games, Super Bowl, ...)
+    PREVIOUS_GAME_ID TEXT,
+    DAYS_REST INTEGER, -- Days since the team's previous game of the season (preseason counted separately), NULL for the first
+    OPPONENT_DAYS_REST INTEGER,
+    POST_BYE INTEGER, -- 1 after at least bye_min_rest_days of rest (config.json Team_Game_Context), not in the preseason or the bye_excluded_weeks (Super Bowl)
+    CONSECUTIVE_ROAD_GAMES INTEGER, -- Games in a row away from the team's stadium including this one, 0 at home
+    TRAVEL_MILES REAL, -- Great-circle miles from the team's stadium to the game's site
+    PRIMARY KEY (GAME_ID, TEAM_ID),
+    FOREIGN KEY (GAME_ID) REFERENCES Game(GAME_ID),
+    FOREIGN KEY (TEAM_ID) REFERENCES Team(TEAM_ID),
+    FOREIGN KEY (OPPONENT_TEAM_ID) REFERENCES Team(TEAM_ID)
+);
+"""
+
+CREATE_INDEX = "CREATE INDEX IDX_TEAM_GAME_CONTEXT_SEASON_TEAM ON Team_Game_Context (SEASON_ID, TEAM_ID)"
+
+
+def migrate(conn):
+    from team_game_context import TeamGameContext
+
+    conn.execute(CREATE_TABLE)
+    conn.execute(CREATE_INDEX)
+
+    seasons = [row[0] for row in conn.execute("SELECT DISTINCT SEASON_ID FROM Game")]
+    TeamGameContext().write_seasons(conn, seasons)
@@ -1,13 +1,19 @@
 import sqlite3
+import glob
+import os
 
-def main():
+# Folder holding this script and the .sql files (so it also works when run from the project root, see run_pipeline.py reset-db)
+SQL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def main(db_path=os.path.join(SQL_DIR, '..', 'nfl_fantasy.db')):
     # Connect to the SQLite database
-    conn = sqlite3.connect('..\\nfl_fantasy.db')
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     delete_current_data(conn, cursor)
     init_tables(conn, cursor)
     init_teams_table(conn, cursor)
+    init_schema_version(conn, cursor)
 
 
     # Close connection
@@ -35,7 +41,7 @@ initialize tables form create_db.sql script (holds table names and all attribute
 """
 def init_tables(conn, cursor):
     # Read and execute the SQL query from the file
-    with open('create_db.sql', 'r') as file:
+    with open(os.path.join(SQL_DIR, 'create_db.sql'), 'r') as file:
         sql_query = file.read()
         cursor.executescript(sql_query)
 
@@ -45,7 +51,7 @@ def init_tables(conn, cursor):
 
 def init_teams_table(conn, cursor):
     # Reset teams table after db dropped with init_teams.sql
-    with open('init_teams.sql', 'r') as file:
+    with open(os.path.join(SQL_DIR, 'init_teams.sql'), 'r') as file:
         sql_query = file.read()
         cursor.executescript(sql_query)
 
@@ -53,4 +59,15 @@ def init_teams_table(conn, cursor):
     conn.commit()
 
 
-main()
\ No newline at end of file
+def init_schema_version(conn, cursor):
+    # create_db.sql already holds every migration, so mark the new db as up to date (see db_helper.apply_migrations)
+    migrations = sorted(int(os.path.basename(path)[:3]) for path in glob.glob(os.path.join(SQL_DIR, 'migrations', '[0-9][0-9][0-9]_*')))
+    schema_version = migrations[-1] if migrations else 0
+    cursor.execute(f"PRAGMA user_version = {schema_version};")
+
+    # Commit the changes
+    conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+## Cold start time of every run_pipeline.py subcommand (fresh python process each run, imports + config + setup only)
+## Uses the CLI's --dry-run flag, so nothing is scraped or written
+## Run from the project root: python benchmarks/cold_start.py [runs per command]
+
+import subprocess
+import statistics
+import sys
+import time
+
+COMMANDS = {
+    'players': ['players'],
+    'season': ['season', '2024'],
+    'game': ['game', '20231015_DET@TB'],
+    'rescore': ['rescore'],
+    'replay': ['replay'],
+    'reset-db': ['reset-db'],
+}
+
+# What every command paid before the CLI: run_pipeline.py imported all of these at module import time
+EAGER_IMPORTS = "import pandas, numpy, requests, selenium.webdriver, dotenv"
+
+
+def time_process(args, runs):
+    """ Median wall time (ms) of running a fresh python process with the given arguments """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    interpreter = time_process(['-c', 'pass'], runs)
+    eager = time_process(['-c', EAGER_IMPORTS], runs)
+    print(f"{'Command':<12}{'Cold start (ms)':>16}")
+    print(f"{'(python)':<12}{interpreter:>16.0f}")
+    print(f"{'(eager)':<12}{eager:>16.0f}  <- previous startup of every command (heavy imports only)")
+    for name, args in COMMANDS.items():
+        print(f"{name:<12}{time_process(['run_pipeline.py', '--dry-run'] + args, runs):>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
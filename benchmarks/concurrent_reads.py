@@ -0,0 +1,134 @@
+## Concurrent reader check: readers query a season while the pipeline reloads that whole season
+## Runs against a copy of nfl_fantasy.db in a temp folder, the real database isn't touched
+## Run from the project root: python benchmarks/concurrent_reads.py [season] [reader threads]
+##
+## - legacy:  default rollback journal, the season is deleted up front then reloaded game by game with a commit each
+##            (how run_pipeline loaded before), readers see a partial season or 'database is locked'
+## - publish: WAL connections (db_helper.connect_writer/connect_reader) and run_pipeline.load_games, which loads the
+##            season in one transaction, readers keep seeing the previous complete season until it commits
+## Exits with status 1 if a reader saw a partial season or an error in publish mode.
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+from db_helper import connect_writer, connect_reader, snapshot, apply_migrations, insert_df, delete_games, SEASON_TABLES
+from log_helper import NFL_Logging
+from run_pipeline import load_games
+from validate import Validate
+
+# Autoincrement IDs aren't part of the cleaned frames the pipeline loads
+ROW_ID_COLUMNS = {'Team_Game_Stats': 'TEAM_GAME_ID', 'Player_Game_Stats': 'PLAYER_GAME_ID', 'Weather': 'WEATHER_ID'}
+
+
+def read_season_frames(conn, season):
+    """ The season's rows as the per-game table frames extract_game produces """
+    frames = {}
+    for table in SEASON_TABLES:
+        df = pd.read_sql_query(f"SELECT * FROM {table} WHERE GAME_ID IN (SELECT GAME_ID FROM Game WHERE SEASON_ID = ?)", conn, params=[season])
+        frames[table] = df.drop(columns=ROW_ID_COLUMNS.get(table, []), errors='ignore')
+    return [{table: df[df['GAME_ID'] == game_id] for table, df in frames.items()} for game_id in frames['Game']['GAME_ID']]
+
+
+def season_counts(conn, season):
+    """ Row counts of the season in every per-game table """
+    return tuple(conn.execute(f"SELECT COUNT(*) FROM {table} WHERE GAME_ID IN (SELECT GAME_ID FROM Game WHERE SEASON_ID = ?)", (season,)).fetchone()[0] for table in SEASON_TABLES)
+
+
+def reader(connect, season, expected, stop, results):
+    """ Reads the season's row counts over and over, recording reads that weren't the complete season """
+    conn = connect()
+    while not stop.is_set():
+        try:
+            with snapshot(conn):
+                counts = season_counts(conn, season)
+            results['reads'] += 1
+            if counts != expected:
+                results['partial'] += 1
+        except sqlite3.OperationalError as e:
+            results['errors'] += 1
+            results['last_error'] = str(e)
+    conn.close()
+
+
+def legacy_load(db_path, season, games_frames):
+    """ Previous loading: delete the season, then insert and commit game by game """
+    conn = sqlite3.connect(db_path, timeout=5)
+    game_ids = [game_frames['Game']['GAME_ID'].iloc[0] for game_frames in games_frames]
+    delete_games(conn, game_ids)
+    conn.commit()
+    for game_frames in games_frames:
+        for table, df in game_frames.items():
+            insert_df(conn, table, df)
+        conn.commit()
+    conn.close()
+
+
+def publish_load(db_path, season, games_frames):
+    """ Current loading: validate and load the whole season in one transaction """
+    conn = connect_writer(db_path)
+    load_games(conn, games_frames, Validate(), NFL_Logging())
+    conn.close()
+
+
+def run(mode, source_db, season, reader_count):
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'nfl_fantasy.db')
+    shutil.copy(source_db, db_path)
+
+    conn = connect_writer(db_path) if mode == 'publish' else sqlite3.connect(db_path)
+    apply_migrations(conn)
+    games_frames = read_season_frames(conn, season)
+    expected = season_counts(conn, season)
+    conn.close()
+
+    if mode == 'publish':
+        connect = lambda: connect_reader(db_path)
+        load = publish_load
+    else:
+        connect = lambda: sqlite3.connect(db_path, timeout=0.1)
+        load = legacy_load
+
+    stop = threading.Event()
+    results = {'reads': 0, 'partial': 0, 'errors': 0, 'last_error': None}
+    threads = [threading.Thread(target=reader, args=(connect, season, expected, stop, results)) for _ in range(reader_count)]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    load(db_path, season, games_frames)
+    load_seconds = time.perf_counter() - start
+    time.sleep(0.2)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    check_conn = sqlite3.connect(db_path)
+    final_counts = season_counts(check_conn, season)
+    check_conn.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"{mode:<8} load {load_seconds:5.2f}s | reads {results['reads']:>6} | partial season {results['partial']:>5} | errors {results['errors']:>5} | season complete after load: {final_counts == expected}")
+    if results['last_error']:
+        print(f"         last error: {results['last_error']}")
+    return results, final_counts == expected
+
+
+def main():
+    season = sys.argv[1] if len(sys.argv) > 1 else '2023'
+    reader_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    run('legacy', 'nfl_fantasy.db', season, reader_count)
+    results, complete = run('publish', 'nfl_fantasy.db', season, reader_count)
+    if results['partial'] or results['errors'] or not complete:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+## Multi-league scoring (league_scoring.LeagueScorer)
+## Generates leagues with random variations of the HOME_LEAGUE_PTS rules, then times scoring every player game in every
+## league (matrix products only) and a full sync into Player_Game_Score. Checks the fantasy_scoring.json platforms
+## against the HOME_LEAGUE_PTS/DK_PTS/FD_PTS columns.
+## Runs against a copy of nfl_fantasy.db in a temp folder, the real database isn't touched
+## Run from the project root: python benchmarks/league_scoring.py [leagues]
+
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+from db_helper import connect_writer, apply_migrations
+from config_helper import load_fantasy_scoring
+from league_scoring import LeagueScorer
+
+
+def random_league(rng):
+    """ HOME_LEAGUE_PTS rules with other reception/touchdown points and yard bonus thresholds """
+    scoring = json.loads(json.dumps(load_fantasy_scoring()['HOME_LEAGUE_PTS']))
+    scoring['RECEIVING']['RECEIVING_RECEPTIONS'] = rng.choice([0, 0.5, 1])
+    scoring['PASSING']['PASSING_TOUCHDOWNS'] = rng.choice([4, 5, 6])
+    scoring['PASSING']['PASSING_INTERCEPTIONS'] = rng.choice([-1, -2, -3])
+    scoring['RUSHING'].pop('YARD_BONUS_100_199_YDS')
+    scoring['RUSHING'].pop('YARD_BONUS_200_PLUS_YDS')
+    scoring['RUSHING'][f"YARD_BONUS_{rng.choice([100, 125, 150])}_PLUS_YDS"] = rng.choice([1, 2, 3])
+    return scoring
+
+
+def main():
+    league_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rng = random.Random(7)
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'nfl_fantasy.db')
+    shutil.copy('nfl_fantasy.db', db_path)
+    conn = connect_writer(db_path)
+    apply_migrations(conn)
+
+    league_dir = os.path.join(temp_dir, 'leagues')
+    os.makedirs(league_dir)
+    with open(os.path.join(league_dir, 'benchmark.json'), 'w') as file:
+        json.dump({f"LEAGUE_{i:03d}": random_league(rng) for i in range(league_count)}, file)
+
+    scorer = LeagueScorer(league_dir)
+    stats_df = pd.read_sql_query("SELECT * FROM Player_Game_Stats", conn)
+
+    start = time.perf_counter()
+    points = scorer.score(stats_df)
+    score_seconds = time.perf_counter() - start
+    print(f"scored {points.shape[0]} player games x {points.shape[1]} leagues in {score_seconds * 1000:.1f}ms")
+
+    for platform in ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']:
+        differ = (points[:, scorer.league_ids.index(platform)] != stats_df[platform].to_numpy()).sum()
+        print(f"  {platform}: {differ} rows differ from the stored column")
+
+    start = time.perf_counter()
+    written = scorer.sync(conn)
+    print(f"full sync: {written} scores written in {time.perf_counter() - start:.2f}s")
+
+    game_ids = [row[0] for row in conn.execute("SELECT GAME_ID FROM Game ORDER BY GAME_DATE DESC LIMIT 16")]
+    start = time.perf_counter()
+    written = scorer.sync(conn, game_ids)
+    print(f"weekly sync (16 games): {written} scores written in {time.perf_counter() - start:.2f}s")
+
+    conn.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
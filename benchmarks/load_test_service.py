@@ -0,0 +1,100 @@
+## Load test for the stats service (stats_service.py) while a writer reloads batches of games like the pipeline does
+## Runs against a copy of nfl_fantasy.db in a temp folder, the real database isn't touched
+## Run from the project root: python benchmarks/load_test_service.py [seconds] [client threads]
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import threading
+import time
+import pandas as pd
+import requests
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.getcwd())
+from stats_service import StatsService
+from db_helper import connect_writer, apply_migrations, insert_df, delete_games, bump_data_version
+
+
+def writer(db_path, game_ids, stop, stats, interval=5, batch_size=32):
+    """ Like a pipeline load, reloads a batch of games' Player_Game_Stats rows in one transaction and bumps Data_Version """
+    conn = connect_writer(db_path)
+    while not stop.wait(interval):
+        batch = random.sample(game_ids, min(batch_size, len(game_ids)))
+        rows_df = pd.read_sql_query(f"SELECT * FROM Player_Game_Stats WHERE GAME_ID IN ({','.join(['?'] * len(batch))})", conn, params=batch).drop(columns='PLAYER_GAME_ID')
+        start = time.perf_counter()
+        with conn:
+            delete_games(conn, batch, tables=['Player_Game_Stats'])
+            insert_df(conn, 'Player_Game_Stats', rows_df)
+            bump_data_version(conn)
+        stats['write_seconds'].append(time.perf_counter() - start)
+    conn.close()
+
+
+def client(base_url, paths, stop, stats):
+    """ Requests random paths, revalidating with If-None-Match when it already has a response's ETag """
+    session = requests.Session()
+    etags = {}
+    while not stop.is_set():
+        path = random.choice(paths)
+        headers = {'If-None-Match': etags[path]} if path in etags else {}
+        start = time.perf_counter()
+        response = session.get(base_url + path, headers=headers)
+        stats['latencies'].append(time.perf_counter() - start)
+        stats['statuses'][response.status_code] = stats['statuses'].get(response.status_code, 0) + 1
+        if 'ETag' in response.headers:
+            etags[path] = response.headers['ETag']
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    client_count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'nfl_fantasy.db')
+    shutil.copy('nfl_fantasy.db', db_path)
+    shutil.copy('fantasy_scoring.json', temp_dir)
+    conn = connect_writer(db_path)
+    apply_migrations(conn)
+    season = conn.execute("SELECT MAX(SEASON_ID) FROM Game WHERE GAME_TYPE = 'Regular Season'").fetchone()[0]
+    game_ids = [row[0] for row in conn.execute("SELECT GAME_ID FROM Game WHERE SEASON_ID = ?", (season,))]
+    player_ids = [row[0] for row in conn.execute("SELECT DISTINCT PLAYER_ID FROM Player_Game_Stats ORDER BY PLAYER_ID LIMIT 200")]
+    conn.close()
+
+    # Mix of the endpoints other tools hit
+    paths = [f"/leaderboards/{season}/weeks/{week}?platform={platform}" for week in range(1, 19) for platform in ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']]
+    paths += [f"/leaderboards/{season}?platform={platform}" for platform in ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']]
+    paths += [f"/players/{player_id}/games?season={season}" for player_id in player_ids]
+    paths += [f"/games/{game_id}" for game_id in game_ids[:100]]
+
+    service = StatsService(db_path, pool_size=4)
+    server = make_server('127.0.0.1', 0, service.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    stop = threading.Event()
+    stats = {'latencies': [], 'statuses': {}, 'write_seconds': []}
+    threads = [threading.Thread(target=writer, args=(db_path, game_ids, stop, stats))]
+    threads += [threading.Thread(target=client, args=(base_url, paths, stop, stats)) for _ in range(client_count)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    service.pool.close()
+
+    latencies = pd.Series(stats['latencies']) * 1000
+    print(f"{len(latencies)} requests in {seconds}s with {client_count} clients > {len(latencies) / seconds:.0f} requests/s")
+    print(f"Latency (ms): p50 {latencies.quantile(0.5):.2f}, p95 {latencies.quantile(0.95):.2f}, p99 {latencies.quantile(0.99):.2f}, max {latencies.max():.2f}")
+    print(f"Status codes: {dict(sorted(stats['statuses'].items()))}")
+    print(f"Writer: {len(stats['write_seconds'])} load transactions committed, avg {pd.Series(stats['write_seconds']).mean() * 1000:.1f}ms")
+
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+## Memory benchmark for Clean's compact dtypes on every season in nfl_fantasy.db
+## Run from the project root: python benchmarks/memory_dtypes.py
+
+import sqlite3
+import sys
+import os
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+from clean import Clean
+
+
+def main():
+    conn = sqlite3.connect('nfl_fantasy.db')
+    cleaner = Clean()
+
+    tables = {
+        'Player': (cleaner.players_df_to_player_table_datatypes, cleaner.players_categorical_columns),
+        'Game': (cleaner.game_data_df_to_game_table_datatypes, cleaner.game_data_categorical_columns),
+        'Team_Game_Stats': (cleaner.team_game_df_to_team_game_table_datatypes, cleaner.team_game_categorical_columns),
+        'Player_Game_Stats': (cleaner.player_game_df_to_player_game_table_datatypes, cleaner.player_game_categorical_columns),
+        'Weather': (cleaner.weather_df_to_weather_table_datatypes, cleaner.weather_categorical_columns),
+    }
+
+    print(f"{'Table':<20}{'Rows':>8}{'Before (MB)':>14}{'After (MB)':>14}{'Ratio':>8}  Lossless")
+    for table, (column_types, categorical_columns) in tables.items():
+        df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+        # Match the cleaned frames (int64/float64/python str) the pipeline produced before compact dtypes
+        df = cleaner.restore_column_types(df)
+
+        compact_df = cleaner.compact_column_types(df.copy(), column_types, categorical_columns)
+        restored_df = cleaner.restore_column_types(compact_df)
+
+        before = df.memory_usage(deep=True).sum() / 1e6
+        after = compact_df.memory_usage(deep=True).sum() / 1e6
+        lossless = restored_df.equals(df)
+        print(f"{table:<20}{len(df):>8}{before:>14.2f}{after:>14.2f}{before / after:>8.1f}  {lossless}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
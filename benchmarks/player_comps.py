@@ -0,0 +1,64 @@
+## Player comps query latency (player_comps.PlayerComps)
+## Builds the stat cube and the comps vectors in a temp folder from a copy of nfl_fantasy.db, then times k-NN queries
+## for random player-seasons against a full sort over every vector (which also checks the blocked kernel's answers)
+## Run from the project root: python benchmarks/player_comps.py [queries]
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.getcwd())
+from db_helper import connect_writer, apply_migrations
+from player_comps import PlayerComps
+
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(7)
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'nfl_fantasy.db')
+    shutil.copy('nfl_fantasy.db', db_path)
+    conn = connect_writer(db_path)
+    apply_migrations(conn)
+
+    comps = PlayerComps(os.path.join(temp_dir, 'player_comps'), os.path.join(temp_dir, 'stat_cube'))
+    start = time.perf_counter()
+    comps.load(conn)
+    print(f"built and loaded {len(comps.vectors['PLAYER_ID'])} vectors in {time.perf_counter() - start:.2f}s")
+
+    keys = [key for key, row in comps.row_lookup.items() if comps.vectors['GAMES'][row] >= comps.min_games]
+    sample = [rng.choice(keys) for _ in range(queries)]
+
+    latencies, mismatches = [], 0
+    for player_id, season, window in sample:
+        start = time.perf_counter()
+        comps_df = comps.nearest(player_id, season, k=10, window=window)
+        latencies.append(time.perf_counter() - start)
+
+        # Same filters, every distance computed and sorted
+        row = comps.row_lookup[(player_id, season, window)]
+        eligible = (comps.vectors['WINDOW'] == window) & (comps.vectors['GAMES'] >= comps.min_games) & (comps.vectors['PLAYER_ID'] != player_id)
+        if comps.vectors['POSITION'][row] != '':
+            eligible &= comps.vectors['POSITION'] == comps.vectors['POSITION'][row]
+        distances = np.sqrt(((comps.normalized[eligible] - comps.normalized[row]) ** 2).sum(axis=1))
+        expected = np.sort(distances)[:10]
+        mismatches += not np.allclose(comps_df['DISTANCE'].to_numpy(), expected, atol=1e-3)
+
+    latencies = np.array(latencies) * 1000
+    print(f"{queries} queries: median {np.median(latencies):.2f}ms | p95 {np.percentile(latencies, 95):.2f}ms | {mismatches} differ from a full sort")
+
+    player_id, season, window = sample[0]
+    print(f"\ncomps of {player_id} {season} ({window}):")
+    print(comps.nearest(player_id, season, k=5, window=window).to_string(index=False))
+
+    conn.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+## Player name resolution throughput and accuracy (player_resolver.PlayerResolver)
+## Names from the Player table are rewritten the way other sources write them (punctuation, 'Last, First', suffixes,
+## typos, team abbreviations), resolved in one batch, and checked against the PLAYER_ID they came from.
+## Runs against a copy of nfl_fantasy.db in a temp folder, the real database isn't touched
+## Run from the project root: python benchmarks/resolve_players.py [copies of every name]
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+from db_helper import connect_writer, apply_migrations
+from player_resolver import PlayerResolver
+
+# Abbreviations other sources use for some teams (see team_aliases in config.json)
+SOURCE_TEAMS = {'JAX': 'JAC', 'WSH': 'WAS', 'LAR': 'LA'}
+
+
+def rewrite_name(name, rng):
+    """ One of the ways another source might write a name """
+    variant = rng.randrange(6)
+    if variant == 0:
+        return name
+    if variant == 1:
+        return name.replace('.', '').replace("'", '')
+    if variant == 2:
+        first, _, last = name.partition(' ')
+        return f"{last}, {first}"
+    if variant == 3:
+        return name.upper()
+    if variant == 4:
+        return name.replace(' Jr.', '').replace(' Sr.', '') if ' Jr.' in name or ' Sr.' in name else f"{name} Jr."
+    # Typo: two adjacent letters swapped
+    position = rng.randrange(1, len(name) - 2)
+    return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = random.Random(7)
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'nfl_fantasy.db')
+    shutil.copy('nfl_fantasy.db', db_path)
+    conn = connect_writer(db_path)
+    apply_migrations(conn)
+
+    players_df = pd.read_sql_query("SELECT PLAYER_ID, FULL_NAME, TEAM_ABBR, POSITION FROM Player", conn)
+    rows = []
+    for _ in range(copies):
+        for player in players_df.itertuples(index=False):
+            rows.append({'EXPECTED_ID': player.PLAYER_ID, 'Name': rewrite_name(player.FULL_NAME, rng),
+                         'Team': SOURCE_TEAMS.get(player.TEAM_ABBR, player.TEAM_ABBR), 'Position': player.POSITION})
+    source_df = pd.DataFrame(rows)
+
+    start = time.perf_counter()
+    resolver = PlayerResolver(conn, source='benchmark')
+    index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resolved_df = resolver.resolve_batch(source_df, 'Name', 'Team', 'Position')
+    resolve_seconds = time.perf_counter() - start
+    distinct = len(source_df[['Name', 'Team', 'Position']].drop_duplicates())
+
+    correct = (resolved_df['PLAYER_ID'] == resolved_df['EXPECTED_ID']).fillna(False)
+    wrong = resolved_df['PLAYER_ID'].notna() & ~correct
+    print(f"index built in {index_seconds:.2f}s, resolved {len(source_df)} rows ({distinct} distinct names) in {resolve_seconds:.2f}s ({distinct / resolve_seconds:,.0f} names/s)")
+    print(f"correct {correct.mean():.1%} | wrong {wrong.mean():.1%} | {resolved_df['MATCH_TYPE'].value_counts().to_dict()}")
+    for row in resolved_df[wrong].head(10).itertuples(index=False):
+        print(f"  wrong: {row.Name!r} ({row.Team} {row.Position}) > {row.FULL_NAME!r}")
+
+    # Confirmed aliases are answered before the index
+    resolver.confirm(conn, resolved_df.loc[correct, ['Name', 'PLAYER_ID', 'Team', 'Position']].drop_duplicates(['Name', 'Team', 'Position']).itertuples(index=False))
+    start = time.perf_counter()
+    resolver.resolve_batch(source_df, 'Name', 'Team', 'Position')
+    print(f"with confirmed aliases: {distinct / (time.perf_counter() - start):,.0f} names/s")
+
+    conn.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
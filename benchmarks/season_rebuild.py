@@ -0,0 +1,76 @@
+## Season rebuild timing: reloading a whole season with run_pipeline.load_games
+## Runs against a copy of nfl_fantasy.db in a temp folder, the real database isn't touched
+## Run from the project root: python benchmarks/season_rebuild.py [season] [rebuilds]
+##
+## Every rebuild replaces the season's rows, the file size and free pages show how much the in-place reloads leave
+## behind, and the last line shows the effect of run_pipeline's --vacuum.
+##
+## A staging build (season loaded into an attached, unindexed file with synchronous=OFF, then copied in with
+## INSERT ... SELECT) was measured here and dropped: it was slower than the in-place load (0.57s vs 0.41s best for
+## 2023, also with the main indexes dropped and rebuilt around the copy). A season is ~11k rows, so writing it twice
+## costs more than the index maintenance it saves, and a whole-file swap isn't safe under WAL readers.
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+from db_helper import connect_writer, apply_migrations, SEASON_TABLES
+from log_helper import NFL_Logging
+from run_pipeline import load_games
+from validate import Validate
+
+# Autoincrement IDs aren't part of the cleaned frames the pipeline loads
+ROW_ID_COLUMNS = {'Team_Game_Stats': 'TEAM_GAME_ID', 'Player_Game_Stats': 'PLAYER_GAME_ID', 'Weather': 'WEATHER_ID'}
+
+
+def read_season_frames(conn, season):
+    """ The season's rows as the per-game table frames extract_game produces """
+    frames = {}
+    for table in SEASON_TABLES:
+        df = pd.read_sql_query(f"SELECT * FROM {table} WHERE GAME_ID IN (SELECT GAME_ID FROM Game WHERE SEASON_ID = ?)", conn, params=[season])
+        frames[table] = df.drop(columns=ROW_ID_COLUMNS.get(table, []), errors='ignore')
+    return [{table: df[df['GAME_ID'] == game_id] for table, df in frames.items()} for game_id in frames['Game']['GAME_ID']]
+
+
+def file_stats(conn, db_path):
+    """ Database size in MB (after a checkpoint) and its number of free pages """
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(db_path) / 1e6, conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def run(source_db, season, rebuilds):
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'nfl_fantasy.db')
+    shutil.copy(source_db, db_path)
+    conn = connect_writer(db_path)
+    apply_migrations(conn)
+    games_frames = read_season_frames(conn, season)
+    validator, log = Validate(), NFL_Logging()
+
+    timings = []
+    for _ in range(rebuilds):
+        start = time.perf_counter()
+        load_games(conn, games_frames, validator, log)
+        timings.append(time.perf_counter() - start)
+    size, free_pages = file_stats(conn, db_path)
+    print(f"rebuild   best {min(timings):5.2f}s | mean {sum(timings) / len(timings):5.2f}s | {size:6.1f} MB, {free_pages} free pages")
+
+    conn.execute("VACUUM")
+    size, free_pages = file_stats(conn, db_path)
+    print(f"{'':<9} after VACUUM {size:6.1f} MB, {free_pages} free pages")
+    conn.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main():
+    season = sys.argv[1] if len(sys.argv) > 1 else '2023'
+    rebuilds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run('nfl_fantasy.db', season, rebuilds)
+
+
+if __name__ == "__main__":
+    main()
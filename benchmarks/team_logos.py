@@ -0,0 +1,67 @@
+## Team logo rendering (team_logos.TeamLogos)
+## Draws a 32-team scatter plot with logos as markers the way the notebooks did (Image.open per logo, every redraw)
+## and with the sprite sheets (cold: decode + save, warm: saved sheet in a new process, hot: process cache)
+## Logo cache goes to a temp folder, the project's logo_cache isn't touched
+## Run from the project root: python benchmarks/team_logos.py [redraws]
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from PIL import Image
+
+sys.path.insert(0, os.getcwd())
+from team_logos import TeamLogos
+
+
+def draw(teams, image_for, points):
+    """ One league-wide scatter plot, a logo per team """
+    fig, ax = plt.subplots(figsize=(10, 8))
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    for team, (x, y) in zip(teams, points):
+        ax.add_artist(AnnotationBbox(image_for(team), (x, y), frameon=False))
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def main():
+    redraws = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    cache_dir = tempfile.mkdtemp()
+    points = np.random.default_rng(7).random((32, 2))
+    teams = TeamLogos(cache_dir=cache_dir).teams
+
+    # Notebook way: every redraw decodes all 32 PNGs (300x300) and lets matplotlib scale them
+    start = time.perf_counter()
+    for _ in range(redraws):
+        draw(teams, lambda team: OffsetImage(Image.open(os.path.join('nfl-logos', f"{team}.png")), zoom=64 / 300), points)
+    png_seconds = (time.perf_counter() - start) / redraws
+
+    start = time.perf_counter()
+    TeamLogos(cache_dir=cache_dir).sheet(64)
+    cold_seconds = time.perf_counter() - start
+
+    TeamLogos.sheets.clear() # As if a new kernel started
+    start = time.perf_counter()
+    TeamLogos(cache_dir=cache_dir).sheet(64)
+    warm_seconds = time.perf_counter() - start
+
+    logos = TeamLogos(cache_dir=cache_dir)
+    start = time.perf_counter()
+    for _ in range(redraws):
+        draw(teams, lambda team: logos.offset_image(team, 64), points)
+    sheet_seconds = (time.perf_counter() - start) / redraws
+
+    print(f"per chart: PNGs {png_seconds * 1000:.1f}ms | sprite sheet {sheet_seconds * 1000:.1f}ms ({png_seconds / sheet_seconds:.1f}x)")
+    print(f"64px sheet: decode + save {cold_seconds * 1000:.1f}ms | load in a new process {warm_seconds * 1000:.2f}ms")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import pandas as pd
-import json
+import numpy as np
+import importlib.util
 from datetime import datetime, timedelta
 from log_helper import NFL_Logging
+from config_helper import load_config, load_fantasy_scoring
 import os
 import inspect
 
@@ -10,18 +12,31 @@ class Clean:
     Class used to clean and organize NFL game data for insertion into a local database.
     """
 
-    def __init__(self):
+    # Stages with a fast path implementation, switched on in the Clean_Fast_Paths section of 'config.json' once
+    # shadow.py shows they match the legacy implementation
+    FAST_PATHS = ('organize_game_info_df', 'calculate_fantasy_points')
+
+    # Column added by convert_column_types(record_coerced=True) listing the values of a row that weren't numbers
+    # (checked by Validate, never loaded into the database)
+    COERCED_COLUMN = 'COERCED_VALUES'
+
+    def __init__(self, fast_paths=None):
         """
         Initializes the Clean class.
 
         Loads configuration settings from 'config.json' to initialize filtering lists, renaming maps, and data type mappings
         used for cleaning and organizing NFL game data.
+
+        Parameters
+        ----------
+        fast_paths : iterable of str, optional
+            Stages (see FAST_PATHS) to run with their fast path implementation. Defaults to the ones enabled in 'config.json'.
         """
         self.log = NFL_Logging()
         # Open config.json file to reference defined dataframe structure
         # (Put defined lists/dicts in config.json to declutter files)
-        with open('config.json') as f:
-            config = json.load(f)
+        config = load_config()
+        self.fast_paths = set(config['Clean_Fast_Paths']['enabled'] if fast_paths is None else fast_paths)
 
         self.game_filtered_fields = config['Game_Table_Mapping']['dataframe_field_filters']                      # To filter desired game fields from API
         self.home_team_filtered_fields = config['Team_Game_Stats_Mapping']['hometeam_dataframe_field_filters']   # To filter desired game fields from API
@@ -45,6 +60,27 @@ class Clean:
         self.player_game_df_to_player_game_table_datatypes = config['Player_Game_Stats_Mapping']['df_datatypes_to_db_datatypes']
         self.weather_df_to_weather_table_datatypes = config['Weather_Table_Mapping']['df_datatypes_to_db_datatypes'] 
 
+        # Composite TEXT team stats (e.g., '5-12', '31:22') and the numeric columns they are split into
+        self.team_game_composite_fields = config['Team_Game_Stats_Mapping']['composite_fields_split']
+        self.team_game_clock_fields = config['Team_Game_Stats_Mapping']['clock_fields_to_seconds']
+
+        # Team stats behind the DEFENSE scoring categories in fantasy_scoring.json (counted stats and tiered stats)
+        self.dst_stat_fields = config['Team_Game_Stats_Mapping']['dst_scoring_stat_fields']
+        self.dst_tier_fields = config['Team_Game_Stats_Mapping']['dst_scoring_tier_fields']
+
+        # Stadium timezone for each team (weather observation times are local to the home team's stadium)
+        self.team_timezones = {team: info['timezone'] for team, info in config['Weather_Table_Mapping'].items() if 'timezone' in info}
+
+        # Low-cardinality TEXT columns for each table that are held as pandas categoricals in cleaned dataframes
+        self.players_categorical_columns = config['Player_Table_Mapping']['categorical_columns']
+        self.game_data_categorical_columns = config['Game_Table_Mapping']['categorical_columns']
+        self.team_game_categorical_columns = config['Team_Game_Stats_Mapping']['categorical_columns']
+        self.player_game_categorical_columns = config['Player_Game_Stats_Mapping']['categorical_columns']
+        self.weather_categorical_columns = config['Weather_Table_Mapping']['categorical_columns']
+
+        # Other TEXT columns use Arrow-backed strings when pyarrow is installed (falls back to python objects)
+        self.text_dtype = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') is not None else 'object'
+
 
     def organize_game_info_df(self, game_info_df):
         """
@@ -82,6 +118,54 @@ class Clean:
         home_team_id = game_data_df.at[0,'teamIDHome']
         away_team_id = game_data_df.at[0,'teamIDAway']
 
+        # Collect every player's stats into one row per player
+        if 'organize_game_info_df' in self.fast_paths:
+            players_stats_df = self.pivot_player_stats(game_info_df, home_team_id, away_team_id)
+        else:
+            players_stats_df = self.collect_player_stats(game_info_df, home_team_id, away_team_id)
+
+        # Filter out players with 0 stats (i.e., defensive players, kickers, punters, etc.)        
+        # Create a boolean mask for rows where all specified columns are empty or NaN
+        mask = players_stats_df[self.player_stat_columns].isna().all(axis=1) | (players_stats_df[self.player_stat_columns] == '').all(axis=1)
+        # Drop the rows where the mask is True
+        players_stats_df = players_stats_df[~mask]
+
+        # Drop 'teamAbv' and 'Passing.rtg' fields from dataframe
+        try:
+            players_stats_df = players_stats_df.drop(columns=['teamAbv'])
+            players_stats_df = players_stats_df.drop(columns=['Passing.rtg'])
+        except KeyError:
+            self.log.warning("Couldn't drop teamAbv + Passing.rtg from player_stats_df")
+            pass
+
+        # There is a bug with the API for the January 2, 2024 BUF @ CIN game that was cancelled during the game
+        # This section accounts for it
+        if players_stats_df["gameID"].iloc[0] == '20230102_BUF@CIN':
+            players_stats_df['Rushing.rushYds'] = players_stats_df['Rushing.rushYds'].fillna(players_stats_df['Rushing.russYds'])
+            players_stats_df = players_stats_df.drop(columns=['Rushing.russYds'])
+
+        return game_data_df, home_team_data_df, away_team_data_df, players_stats_df
+    
+
+    def collect_player_stats(self, game_info_df, home_team_id, away_team_id):
+        """
+        Collects the player stats of a game (the playerStats.* fields) into one row per player, one field at a time.
+        Used by organize_game_info_df (pivot_player_stats is the fast path of this loop).
+
+        Parameters
+        ----------
+        game_info_df : DataFrame
+            The DataFrame containing raw game data.
+        home_team_id : str
+            Team ID of the home team.
+        away_team_id : str
+            Team ID of the away team.
+
+        Returns
+        -------
+        DataFrame
+            One row per player with their stats (not yet filtered).
+        """
         # Make dataframe to hold all player stats from game param:
         players_stats_df = pd.DataFrame(columns=self.player_data_cols)
 
@@ -122,28 +206,62 @@ class Clean:
                 # Insert stat into player's game data
                 players_stats_df.loc[players_stats_df['playerID'] == player_id, stat_category] = stat_value
 
-        # Filter out players with 0 stats (i.e., defensive players, kickers, punters, etc.)        
-        # Create a boolean mask for rows where all specified columns are empty or NaN
-        mask = players_stats_df[self.player_stat_columns].isna().all(axis=1) | (players_stats_df[self.player_stat_columns] == '').all(axis=1)
-        # Drop the rows where the mask is True
-        players_stats_df = players_stats_df[~mask]
+        return players_stats_df
 
-        # Drop 'teamAbv' and 'Passing.rtg' fields from dataframe
-        try:
-            players_stats_df = players_stats_df.drop(columns=['teamAbv'])
-            players_stats_df = players_stats_df.drop(columns=['Passing.rtg'])
-        except KeyError:
-            self.log.warning("Couldn't drop teamAbv + Passing.rtg from player_stats_df")
-            pass
 
-        # There is a bug with the API for the January 2, 2024 BUF @ CIN game that was cancelled during the game
-        # This section accounts for it
-        if players_stats_df["gameID"].iloc[0] == '20230102_BUF@CIN':
-            players_stats_df['Rushing.rushYds'] = players_stats_df['Rushing.rushYds'].fillna(players_stats_df['Rushing.russYds'])
-            players_stats_df = players_stats_df.drop(columns=['Rushing.russYds'])
+    def pivot_player_stats(self, game_info_df, home_team_id, away_team_id):
+        """
+        Fast path of collect_player_stats (enabled with 'organize_game_info_df' in the Clean_Fast_Paths section of
+        'config.json'). Parses every playerStats.* field name in one pass and builds the DataFrame once, instead of
+        updating it with .loc for every field. Returns the same rows and columns (compare them with shadow.py).
+
+        Parameters
+        ----------
+        game_info_df : DataFrame
+            The DataFrame containing raw game data.
+        home_team_id : str
+            Team ID of the home team.
+        away_team_id : str
+            Team ID of the away team.
+
+        Returns
+        -------
+        DataFrame
+            One row per player with their stats (not yet filtered).
+        """
+        players = {}
+        columns = list(self.player_data_cols)
+        known_columns = set(columns)
+
+        for fieldname in game_info_df:
+            if 'playerStats.' not in fieldname or any(substring in fieldname for substring in ['Defense', 'Punting', 'Kicking', 'scoringPlays']):
+                continue
+            parts = fieldname.split('.')
+            if len(parts) == 3:
+                stat_category = parts[2]
+            elif len(parts) == 4:
+                stat_category = parts[2] + '.' + parts[3]
+            else:
+                continue
+
+            player = players.setdefault(parts[1], {'playerID': parts[1]})
+            stat_value = game_info_df[fieldname].values[0]
+            if stat_category == 'teamID':
+                if stat_value == home_team_id:
+                    player['teamIDPlayedAgainst'] = away_team_id
+                    player['homeOrAway'] = 'Home'
+                elif stat_value == away_team_id:
+                    player['teamIDPlayedAgainst'] = home_team_id
+                    player['homeOrAway'] = 'Away'
+            player[stat_category] = stat_value
+
+            # New columns are added in the order they're first seen (same column order as collect_player_stats)
+            if stat_category not in known_columns:
+                columns.append(stat_category)
+                known_columns.add(stat_category)
+
+        return pd.DataFrame(list(players.values()), columns=columns)
 
-        return game_data_df, home_team_data_df, away_team_data_df, players_stats_df
-    
 
     def clean_players(self, players_df):
         """
@@ -170,6 +288,7 @@ class Clean:
 
         # Remap data types for SQL Player table. 
         players_df = self.convert_column_types(players_df, self.players_df_to_player_table_datatypes)
+        players_df = self.compact_column_types(players_df, self.players_df_to_player_table_datatypes, self.players_categorical_columns)
 
         self.log.info("Successfully cleaned players_df to load into database. ")
         return players_df
@@ -200,7 +319,7 @@ class Clean:
             self.log.critical(f"Error renaming game_data_df columns: {e}")
 
         # Remap data types for SQL Game table. 
-        game_data_df = self.convert_column_types(game_data_df, self.game_data_df_to_game_table_datatypes)
+        game_data_df = self.convert_column_types(game_data_df, self.game_data_df_to_game_table_datatypes, record_coerced=True)
 
         # Wrangle winning team ID > store ID of team who won and add to dataframe (if tie, enter None)
         game_data_df['WINNING_TEAM_ID'] = game_data_df.apply(
@@ -209,19 +328,27 @@ class Clean:
             axis=1
         )
 
-        # Format GAME_DATE to desired format (YYYYMMDD -> MM-DD-YYYY)
+        # Sortable integer date key (YYYYMMDD) for indexed range queries, taken before GAME_DATE is reformatted
+        game_data_df['GAME_DATE_KEY'] = pd.to_numeric(game_data_df['GAME_DATE'], errors='coerce').fillna(0).astype(int)
+
+        # Format GAME_DATE to desired format (YYYYMMDD -> YYYY-MM-DD, ISO-8601 so it sorts correctly as text)
         game_data_df['GAME_DATE'] = self.format_date(game_data_df['GAME_DATE'].iloc[0])
-        # Ensure date is datetime 
-        # game_data_df['GAME_DATE'] = pd.to_datetime(game_data_df['GAME_DATE'])
+        game_dates = pd.to_datetime(game_data_df['GAME_DATE'], format='%Y-%m-%d')
 
         # Assign SEASON_ID into dataframe (pull from date of game). Season ID's are the starting year of season (e.g., 23-24 > 2023)
-        game_data_df['SEASON_ID'] = game_data_df['GAME_DATE'].apply(
-            lambda date: pd.to_datetime(date).year - 1 if pd.to_datetime(date) < pd.to_datetime(f'03-01-{pd.to_datetime(date).year}') else pd.to_datetime(date).year
-        )
+        game_data_df['SEASON_ID'] = game_dates.dt.year - (game_dates.dt.month < 3).astype(int)
+
+        # Kickoff as a UTC timestamp (GAME_TIME from the API is Eastern time)
+        kickoff = pd.to_datetime(game_data_df['GAME_DATE'] + ' ' + game_data_df['GAME_TIME'].astype(str), format='%Y-%m-%d %I:%M %p', errors='coerce')
+        kickoff = kickoff.dt.tz_localize('America/New_York', ambiguous='NaT', nonexistent='NaT').dt.tz_convert('UTC')
+        game_data_df['KICKOFF_UTC'] = kickoff.dt.strftime('%Y-%m-%dT%H:%M:%SZ').fillna('')
 
         # Record if a game is a 'primetime' game. Defining as starting at 8PM or later. 
         game_data_df['PRIMETIME'] = self.check_if_primetime(game_data_df['GAME_TIME'].iloc[0])
 
+        # Shrink dataframe to compact dtypes (restored with restore_column_types before loading into database)
+        game_data_df = self.compact_column_types(game_data_df, self.game_data_df_to_game_table_datatypes, self.game_data_categorical_columns)
+
         self.log.info("Successfully cleaned game_data_df to load into database. ")
         return game_data_df
     
@@ -249,13 +376,53 @@ class Clean:
         except Exception as e:
             self.log.critical(f"Error renaming team_game_df columns: {e}")
 
+        # Parse composite stats ('5-12', '31:22') into numeric columns (converted to INTEGER below)
+        team_game_df = self.split_composite_fields(team_game_df)
+
         # Remap data types for SQL Player table. 
-        team_game_df = self.convert_column_types(team_game_df, self.team_game_df_to_team_game_table_datatypes)
+        team_game_df = self.convert_column_types(team_game_df, self.team_game_df_to_team_game_table_datatypes, record_coerced=True)
+
+        # Add fields for team defense (DST) fantasy points scored across different platforms (Home league, DK DFS, FD DFS)
+        for platform in ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']:
+            team_game_df[platform] = self.calculate_dst_points(team_game_df, platform)
+
+        team_game_df = self.compact_column_types(team_game_df, self.team_game_df_to_team_game_table_datatypes, self.team_game_categorical_columns)
 
         self.log.info("Successfully cleaned team_game_df to load into database. ")
         return team_game_df
     
 
+    def split_composite_fields(self, team_game_df):
+        """
+        Parses the composite TEXT team stats into numeric columns, e.g., OFF_THIRD_DOWN_EFFICIENCY '5-12' into
+        OFF_THIRD_DOWN_CONVERSIONS 5 and OFF_THIRD_DOWN_ATTEMPTS 12, and POSSESSION_TIME '31:22' into POSSESSION_SECONDS 1882.
+        The original TEXT columns are kept. Values that don't match the expected pattern are left empty (and become 0 in
+        convert_column_types).
+
+        Parameters
+        ----------
+        team_game_df : DataFrame
+            The team game DataFrame with SQL table column names.
+
+        Returns
+        -------
+        DataFrame
+            The DataFrame with the parsed numeric columns added.
+        """
+        for column, (first_column, second_column) in self.team_game_composite_fields.items():
+            if column in team_game_df.columns:
+                parts = team_game_df[column].astype(str).str.extract(r'^\s*(\d+)\s*-\s*(-?\d+)\s*$')
+                team_game_df[first_column] = parts[0]
+                team_game_df[second_column] = parts[1]
+
+        for column, seconds_column in self.team_game_clock_fields.items():
+            if column in team_game_df.columns:
+                parts = team_game_df[column].astype(str).str.extract(r'^\s*(\d+):(\d{2})\s*$').astype(float)
+                team_game_df[seconds_column] = parts[0] * 60 + parts[1]
+
+        return team_game_df
+
+
     def clean_player_game_stats(self, player_game_stats_df):
         """
         Cleans the player game DataFrame (player stats from particular game) by renaming columns and converting data types. Then wrangle fantasy 
@@ -281,27 +448,34 @@ class Clean:
             self.log.critical(f"Error renaming player_game_stats_df columns: {e}")
 
         # Remap data types for SQL Player table. 
-        player_game_stats_df = self.convert_column_types(player_game_stats_df, self.player_game_df_to_player_game_table_datatypes)
+        player_game_stats_df = self.convert_column_types(player_game_stats_df, self.player_game_df_to_player_game_table_datatypes, record_coerced=True)
 
         # Add fields for fantasy points scored across different platforms (Home league, DK DFS, FD DFS)
-        for platform in ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']:
-            player_game_stats_df[f'{platform}'] = player_game_stats_df.apply(
-                lambda row: self.calculate_fantasy_points(row, platform), axis=1,
-            )
+        player_game_stats_df = self.add_fantasy_points(player_game_stats_df)
+
+        # Shrink dataframe to compact dtypes (restored with restore_column_types before loading into database)
+        player_game_stats_df = self.compact_column_types(player_game_stats_df, self.player_game_df_to_player_game_table_datatypes, self.player_game_categorical_columns)
 
         self.log.info("Successfully cleaned player_game_stats_df to load into database. ")
         return player_game_stats_df
 
 
-    def clean_weather_df(self, weather_df, game_time):
+    def clean_weather_df(self, weather_df, game_time, game_date=None, home_team=None):
         """
         Cleans a weather data DataFrame (weather data related to a particular game) by dropping empty rows, filtering for weather during
-        game time, dropping unwanted columns, and then cleaning units out of rows. 
+        game time, dropping unwanted columns, and then cleaning units out of rows. When the game date and home team are given, each
+        observation also gets full local and UTC timestamps (observation times are local to the stadium).
 
         Parameters
         ----------
         player_game_stats_df : DataFrame
             The DataFrame containing a weather dataframe to be cleaned
+        game_time : str
+            Start time of the game (e.g., '8:20 PM')
+        game_date : str, optional
+            Date of the game in 'YYYY-MM-DD' format
+        home_team : str, optional
+            Abbreviation of the home team (used to look up the stadium's timezone)
 
         Returns
         -------
@@ -356,13 +530,87 @@ class Clean:
         except Exception as e:
             self.log.critical(f"Error renaming weather_df columns: {e}")
 
+        # Full timestamps for each observation (TIME is the stadium's local time)
+        if game_date is not None and home_team in self.team_timezones:
+            observed = pd.to_datetime(game_date + ' ' + filtered_df['TIME'].astype(str), format='%Y-%m-%d %I:%M %p', errors='coerce')
+            filtered_df['OBSERVATION_TIME_LOCAL'] = observed.dt.strftime('%Y-%m-%dT%H:%M:%S')
+            observed = observed.dt.tz_localize(self.team_timezones[home_team], ambiguous='NaT', nonexistent='NaT').dt.tz_convert('UTC')
+            filtered_df['OBSERVATION_TIME_UTC'] = observed.dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
         # Remap data types for SQL Game_Weather table
-        filtered_df = self.convert_column_types(filtered_df, self.weather_df_to_weather_table_datatypes)
+        filtered_df = self.convert_column_types(filtered_df, self.weather_df_to_weather_table_datatypes, record_coerced=True)
+        filtered_df = self.compact_column_types(filtered_df, self.weather_df_to_weather_table_datatypes, self.weather_categorical_columns)
         
         self.log.info("Successfully cleaned a weather_df to load into database. ")
         return filtered_df
 
 
+    def add_fantasy_points(self, player_game_stats_df):
+        """
+        Adds the HOME_LEAGUE_PTS, DK_PTS and FD_PTS fantasy points columns to player game stats (with SQL column names
+        and numeric types). Scored row by row with calculate_fantasy_points, or all rows at once with
+        calculate_fantasy_points_df when the 'calculate_fantasy_points' fast path is enabled.
+        """
+        for platform in ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']:
+            if 'calculate_fantasy_points' in self.fast_paths:
+                player_game_stats_df[platform] = self.calculate_fantasy_points_df(player_game_stats_df, platform)
+            else:
+                player_game_stats_df[platform] = player_game_stats_df.apply(
+                    lambda row: self.calculate_fantasy_points(row, platform), axis=1,
+                )
+        return player_game_stats_df
+
+
+    def calculate_fantasy_points_df(self, player_game_stats_df, platform):
+        """
+        Fast path of calculate_fantasy_points, scores every row of the DataFrame at once with the same rules (points are
+        added in the same order and rounded with round(), so the results are identical).
+
+        Parameters
+        ----------
+        player_game_stats_df : DataFrame
+            Player game stats with SQL column names and numeric types.
+        platform : str
+            The scoring platform, 'HOME_LEAGUE_PTS', 'DK_PTS' or 'FD_PTS'.
+
+        Returns
+        -------
+        numpy.ndarray
+            The fantasy points of each row.
+        """
+        scoring_guide = load_fantasy_scoring()
+        platform_scoring_guide = scoring_guide.get(platform, {})
+
+        points = np.zeros(len(player_game_stats_df))
+        for category, stats in platform_scoring_guide.items():
+            for stat, multiplier in stats.items():
+                if stat in player_game_stats_df.columns:
+                    points = points + player_game_stats_df[stat].to_numpy(dtype=float) * multiplier
+
+        passing_yards = player_game_stats_df['PASSING_YARDS'].to_numpy(dtype=float)
+        rushing_yards = player_game_stats_df['RUSHING_RUSH_YARDS'].to_numpy(dtype=float)
+        receiving_yards = player_game_stats_df['RECEIVING_REC_YARDS'].to_numpy(dtype=float)
+
+        # Yard bonuses for Home League and DK, FD has no yard bonuses (see calculate_fantasy_points)
+        if platform == 'HOME_LEAGUE_PTS':
+            bonuses = [
+                (passing_yards, 'PASSING', 300, 400, 'YARD_BONUS_300_399_YDS', 'YARD_BONUS_400_PLUS_YDS'),
+                (rushing_yards, 'RUSHING', 100, 200, 'YARD_BONUS_100_199_YDS', 'YARD_BONUS_200_PLUS_YDS'),
+                (receiving_yards, 'RECEIVING', 100, 200, 'YARD_BONUS_100_199_YDS', 'YARD_BONUS_200_PLUS_YDS'),
+            ]
+            for yards, category, low, high, low_bonus, high_bonus in bonuses:
+                points = points + np.where((yards >= low) & (yards < high), platform_scoring_guide[category].get(low_bonus, 0), 0)
+                points = points + np.where(yards >= high, platform_scoring_guide[category].get(high_bonus, 0), 0)
+
+        elif platform == 'DK_PTS':
+            points = points + np.where(passing_yards >= 300, platform_scoring_guide['PASSING'].get('YARD_BONUS_300_PLUS_YDS', 0), 0)
+            points = points + np.where(rushing_yards >= 100, platform_scoring_guide['RUSHING'].get('YARD_BONUS_100_PLUS_YDS', 0), 0)
+            points = points + np.where(receiving_yards >= 100, platform_scoring_guide['RECEIVING'].get('YARD_BONUS_100_PLUS_YDS', 0), 0)
+
+        # Python's round (not np.round) so halves round exactly like calculate_fantasy_points
+        return np.array([round(value, 2) for value in points.tolist()])
+
+
     def calculate_fantasy_points(self, row, platform):
         """
         Calculate the fantasy points for a given player based on their game statistics and the specified scoring platform. Use the reference
@@ -382,9 +630,8 @@ class Clean:
         Returns:
             float: The total fantasy points calculated for the player based on the provided scoring platform and statistics.
         """
-        # Load the fantasy scoring rules from the JSON file
-        with open('fantasy_scoring.json', 'r') as f:
-            scoring_guide = json.load(f)
+        # Load the fantasy scoring rules from the JSON file (parsed once per process, this runs for every row)
+        scoring_guide = load_fantasy_scoring()
         
         # Get the scoring guide for the specific platform
         platform_scoring_guide = scoring_guide.get(platform, {})
@@ -424,6 +671,80 @@ class Clean:
         return round(points, 2)
 
 
+    def compile_dst_tiers(self, defense_scoring, tier_stat):
+        """
+        Compiles the tiers of a DEFENSE scoring category from their keys in fantasy_scoring.json, e.g., POINTS_ALLOWED_0,
+        POINTS_ALLOWED_1_6, POINTS_ALLOWED_35_PLUS or YARDS_ALLOWED_SUB_100, into bound arrays for np.digitize.
+
+        Parameters
+        ----------
+        defense_scoring : dict
+            The DEFENSE section of a platform's scoring guide.
+        tier_stat : str
+            The tiered category, 'POINTS_ALLOWED' or 'YARDS_ALLOWED'.
+
+        Returns
+        -------
+        tuple
+            (lower bounds, upper bounds, points) arrays sorted by lower bound, or None if the platform doesn't score the category.
+        """
+        tiers = []
+        for key, points in defense_scoring.items():
+            if not key.startswith(f"{tier_stat}_"):
+                continue
+            bounds = key[len(tier_stat) + 1:].split('_')
+            if bounds[0] == 'SUB':
+                tiers.append((-np.inf, float(bounds[1]) - 1, points))
+            elif bounds[-1] == 'PLUS':
+                tiers.append((float(bounds[0]), np.inf, points))
+            else:
+                tiers.append((float(bounds[0]), float(bounds[-1]), points))
+
+        if not tiers:
+            return None
+        tiers.sort()
+        lower, upper, points = (np.array(values, dtype=float) for values in zip(*tiers))
+        return lower, upper, points
+
+
+    def calculate_dst_points(self, team_game_df, platform):
+        """
+        Calculate the team defense (DST) fantasy points of every row of a team game stats DataFrame at once, using the DEFENSE
+        section of the platform's scoring in fantasy_scoring.json. Counted stats (sacks, interceptions, ...) are multiplied
+        by their points, points and yards allowed are binned into their tiers with np.digitize.
+
+        Parameters
+        ----------
+        team_game_df : DataFrame
+            Team game stats with SQL table column names (one row per team and game).
+        platform : str
+            The scoring platform, 'HOME_LEAGUE_PTS', 'DK_PTS' or 'FD_PTS'.
+
+        Returns
+        -------
+        numpy.ndarray
+            The DST fantasy points of each row.
+        """
+        defense_scoring = load_fantasy_scoring().get(platform, {}).get('DEFENSE', {})
+        points = np.zeros(len(team_game_df))
+
+        for stat, column in self.dst_stat_fields.items():
+            if stat in defense_scoring and column in team_game_df.columns:
+                points += pd.to_numeric(team_game_df[column], errors='coerce').fillna(0).to_numpy(dtype=float) * defense_scoring[stat]
+
+        for stat, column in self.dst_tier_fields.items():
+            tiers = self.compile_dst_tiers(defense_scoring, stat)
+            if tiers is None or column not in team_game_df.columns:
+                continue
+            lower, upper, tier_points = tiers
+            values = pd.to_numeric(team_game_df[column], errors='coerce').fillna(0).to_numpy(dtype=float)
+            # Tier with the highest lower bound <= value, values in a gap between tiers score nothing
+            tier = np.clip(np.digitize(values, lower) - 1, 0, None)
+            points += np.where((values >= lower[tier]) & (values <= upper[tier]), tier_points[tier], 0)
+
+        return np.round(points, 2)
+
+
     def check_if_primetime(self, time):
         """
         Determines if a given time is 8:00 PM or later and can be considered 'primetime'.
@@ -452,7 +773,7 @@ class Clean:
             return 'No'
 
 
-    def convert_column_types(self, df, column_types):
+    def convert_column_types(self, df, column_types, record_coerced=False):
         """
         Converts the data types of specified columns in a DataFrame to match given SQL data types.
 
@@ -464,45 +785,165 @@ class Clean:
             The DataFrame containing columns to be converted.
         column_types : dict
             A dictionary mapping DataFrame columns to their respective SQL data types.
+        record_coerced : bool
+            If True, adds a COERCED_COLUMN column naming the non-numeric values of each row that were coerced to 0
+            (e.g., "PASS_YDS='--'"), so Validate can quarantine those rows. Used for the tables loaded per game.
 
         Returns
         -------
         DataFrame
             The DataFrame with columns converted to the specified data types.
         """
+        coerced_values = np.full(len(df), '', dtype=object)
         for column, sql_type in column_types.items():
             try:
+                if sql_type in ("INTEGER", "REAL"):
+                    # Values that aren't numbers get coerced to 0, note which ones so it doesn't happen silently
+                    numbers = pd.to_numeric(df[column], errors='coerce')
+                    coerced = (numbers.isna() & df[column].notna() & (df[column].astype(str) != '')).to_numpy()
+                    if coerced.any():
+                        self.log.warning(f"Coerced {coerced.sum()} non-numeric values in column {column} to 0")
+                        coerced_values[coerced] = coerced_values[coerced] + (column + "='" + df[column][coerced].astype(str) + "'; ").to_numpy()
                 if sql_type == "INTEGER":
-                    df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(int)
+                    df[column] = numbers.fillna(0).astype(int)
                 elif sql_type == "REAL":
-                    df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0.0).astype(float)
+                    df[column] = numbers.fillna(0.0).astype(float)
                 elif sql_type == "TEXT":
                     df[column] = df[column].fillna('').astype(str)
                 else:
                     self.log.warning(f"SQL type {sql_type} for column {column} is not handled.")
             except Exception as e:
                 self.log.critical(f"Error converting column {column} to {sql_type}: {e}")
+        if record_coerced:
+            df[self.COERCED_COLUMN] = coerced_values
+        return df
+
+
+    def build_dtype_plan(self, df, column_types, categorical_columns):
+        """
+        Builds a compact dtype for each column of a cleaned DataFrame from its SQL type in config.json.
+
+        - INTEGER columns get the smallest signed integer width that holds the column's values.
+        - REAL columns become float32 when every value survives the float32 round trip in restore_column_types
+          (shortest float32 repr back to float64), otherwise they stay float64.
+        - TEXT columns listed in categorical_columns become categoricals, any other TEXT column uses self.text_dtype.
+
+        Parameters
+        ----------
+        df : DataFrame
+            The cleaned DataFrame (output of convert_column_types).
+        column_types : dict
+            A dictionary mapping DataFrame columns to their respective SQL data types.
+        categorical_columns : list
+            Low-cardinality TEXT columns to hold as categoricals (may include columns wrangled after the type map, e.g., PRIMETIME).
+
+        Returns
+        -------
+        dict
+            A dictionary mapping DataFrame columns to their compact dtypes.
+        """
+        plan = {}
+        for column, sql_type in column_types.items():
+            if column not in df.columns:
+                continue
+            if sql_type == "INTEGER":
+                # Leave columns with missing values alone (only happens for frames that skipped convert_column_types)
+                if not pd.api.types.is_integer_dtype(df[column].dtype):
+                    continue
+                plan[column] = 'int64'
+                if len(df) > 0:
+                    col_min, col_max = df[column].min(), df[column].max()
+                    for int_type in [np.int8, np.int16, np.int32]:
+                        if np.iinfo(int_type).min <= col_min and col_max <= np.iinfo(int_type).max:
+                            plan[column] = np.dtype(int_type).name
+                            break
+            elif sql_type == "REAL":
+                values = df[column].to_numpy(dtype='float64')
+                restored = values.astype('float32').astype(str).astype('float64')
+                plan[column] = 'float32' if np.array_equal(values, restored) else 'float64'
+            elif sql_type == "TEXT":
+                plan[column] = 'category' if column in categorical_columns else self.text_dtype
+
+        # Categorical columns that are wrangled in after the type map (e.g., PRIMETIME)
+        for column in categorical_columns:
+            if column in df.columns and column not in plan:
+                plan[column] = 'category'
+        return plan
+
+
+    def compact_column_types(self, df, column_types, categorical_columns):
+        """
+        Converts a cleaned DataFrame to the compact dtypes from build_dtype_plan. Use restore_column_types to get
+        back the exact int64/float64/str values before inserting into the database.
+
+        Parameters
+        ----------
+        df : DataFrame
+            The cleaned DataFrame (output of convert_column_types).
+        column_types : dict
+            A dictionary mapping DataFrame columns to their respective SQL data types.
+        categorical_columns : list
+            Low-cardinality TEXT columns to hold as categoricals.
+
+        Returns
+        -------
+        DataFrame
+            The DataFrame with compact column dtypes.
+        """
+        plan = self.build_dtype_plan(df, column_types, categorical_columns)
+        try:
+            df = df.astype(plan)
+        except Exception as e:
+            self.log.critical(f"Error compacting column types: {e}")
+        return df
+
+
+    def restore_column_types(self, df):
+        """
+        Converts a compact DataFrame back to the dtypes the database load expects (int64, float64, and python str),
+        reversing compact_column_types without losing any values.
+
+        Parameters
+        ----------
+        df : DataFrame
+            A DataFrame produced by one of the clean functions.
+
+        Returns
+        -------
+        DataFrame
+            The DataFrame with int64/float64/object columns, ready for to_sql.
+        """
+        df = df.copy()
+        for column in df.columns:
+            dtype = df[column].dtype
+            if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+                df[column] = df[column].astype(object)
+            elif pd.api.types.is_integer_dtype(dtype):
+                df[column] = df[column].astype('int64')
+            elif dtype == np.float32:
+                # Go through the shortest float32 repr so e.g. 4.4 comes back as 4.4 (not 4.400000095367432)
+                df[column] = df[column].to_numpy().astype(str).astype('float64')
         return df
 
 
     def format_date(self, date_str):
         """
-        Converts a date string from 'YYYYMMDD' format to 'MM-DD-YYYY' format.
+        Converts a date string from 'YYYYMMDD' format to ISO-8601 'YYYY-MM-DD' format.
 
         Parameters:
         date_str (str): A string representing a date in 'YYYYMMDD' format.
 
         Returns:
-        str: A string representing the date in 'MM-DD-YYYY' format.
+        str: A string representing the date in 'YYYY-MM-DD' format.
 
         Example:
         >>> format_date('20220804')
-        '08-04-2022'
+        '2022-08-04'
         """
         # Extract year, month, and day from the input string
         year = date_str[:4]
         month = date_str[4:6]
         day = date_str[6:]
 
-        # Return the date in MM-DD-YYYY format
-        return f"{month}-{day}-{year}"
+        # Return the date in YYYY-MM-DD format
+        return f"{year}-{month}-{day}"
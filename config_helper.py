@@ -0,0 +1,26 @@
+import json
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def read_json_file(path):
+    """
+    Parses a JSON file once per process, later calls return the same (cached) object.
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_config(path='config.json'):
+    """
+    Returns the parsed 'config.json' (shared between every class in the process, so treat it as read only).
+    """
+    return read_json_file(os.path.abspath(path))
+
+
+def load_fantasy_scoring(path='fantasy_scoring.json'):
+    """
+    Returns the parsed 'fantasy_scoring.json' (shared between every caller in the process, so treat it as read only).
+    """
+    return read_json_file(os.path.abspath(path))
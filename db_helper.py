@@ -0,0 +1,268 @@
+import os
+import glob
+import json
+import pathlib
+import sqlite3
+import importlib.util
+import inspect
+from contextlib import contextmanager
+from datetime import datetime
+from log_helper import NFL_Logging
+
+# Numbered schema changes applied on top of create_db.sql (tracked with PRAGMA user_version)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Standard DB Queries', 'migrations')
+
+# Tables holding per-game rows (reloaded together for every game in a season)
+SEASON_TABLES = ['Game', 'Team_Game_Stats', 'Player_Game_Stats', 'Weather']
+
+
+def connect_writer(db_path='nfl_fantasy.db', timeout=30.0):
+    """
+    Opens the pipeline's connection to the database in WAL mode.
+
+    With WAL, readers keep reading the last committed version of the database while a load transaction is writing,
+    and only see the load once it commits (the publish boundary, see run_pipeline.load_games). WAL is stored in the
+    database file, so every later connection uses it too.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to nfl_fantasy.db.
+    timeout : float
+        Seconds to wait on another writer's lock before failing (busy timeout).
+    """
+    conn = sqlite3.connect(db_path, timeout=timeout)
+    conn.execute("PRAGMA journal_mode = WAL")
+    # Safe with WAL (a crash can only lose the last commits, never corrupt), and commits don't wait on a disk sync
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def connect_reader(db_path='nfl_fantasy.db', timeout=5.0, check_same_thread=True):
+    """
+    Opens a read-only connection to the database (for notebooks, the read API and the stats service).
+
+    Parameters
+    ----------
+    db_path : str
+        Path to nfl_fantasy.db.
+    timeout : float
+        Seconds to wait on a lock before failing (busy timeout, e.g., while a WAL checkpoint runs).
+    check_same_thread : bool
+        False if the connection is shared between threads (e.g., a connection pool).
+    """
+    db_uri = pathlib.Path(os.path.abspath(db_path)).as_uri() + '?mode=ro'
+    return sqlite3.connect(db_uri, uri=True, timeout=timeout, check_same_thread=check_same_thread)
+
+
+@contextmanager
+def snapshot(conn):
+    """
+    Runs the reads inside the with block in one read transaction, so they all see the same committed version of the
+    database (e.g., a Data_Version and the rows it belongs to), even if the pipeline commits a load in between.
+    """
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except Exception:
+        # A failed pandas read has already rolled back, only end the transaction if it's still open
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    if conn.in_transaction:
+        conn.execute("COMMIT")
+
+
+def list_migrations():
+    """
+    Returns the migration files as a sorted list of (version, path) tuples.
+
+    Migrations are named NNN_description.sql (run as a SQL script) or NNN_description.py (must define migrate(conn),
+    used when existing rows need a backfill that is awkward in SQL).
+    """
+    migrations = []
+    for path in glob.glob(os.path.join(MIGRATIONS_DIR, '*')):
+        filename = os.path.basename(path)
+        if filename[:3].isdigit() and filename.endswith(('.sql', '.py')):
+            migrations.append((int(filename[:3]), path))
+    return sorted(migrations)
+
+
+def latest_migration_version():
+    """
+    Returns the version of the newest migration (the schema version of a database freshly built from create_db.sql).
+    """
+    migrations = list_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def apply_migrations(conn, log=None):
+    """
+    Brings an existing database up to the current schema by applying every migration newer than its user_version.
+    Each migration runs in its own explicit transaction together with the user_version bump (DDL included, sqlite3
+    would otherwise commit it right away), and is rolled back entirely if any statement fails.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the NFL database.
+    log : NFL_Logging, optional
+        Logger to record applied migrations.
+    """
+    log = log or NFL_Logging()
+    log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+
+    current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    pending = [(version, path) for version, path in list_migrations() if version > current_version]
+    if not pending:
+        return
+
+    # Manage the transactions ourselves while migrating (sqlite3 only opens them implicitly before INSERT/UPDATE/DELETE)
+    conn.commit()
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        for version, path in pending:
+            try:
+                if path.endswith('.sql'):
+                    with open(path, 'r') as file:
+                        sql_script = file.read()
+                    conn.executescript(f"BEGIN;\n{sql_script}\nPRAGMA user_version = {version};\nCOMMIT;")
+                else:
+                    spec = importlib.util.spec_from_file_location(f"migration_{version:03d}", path)
+                    migration = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(migration)
+                    conn.execute("BEGIN")
+                    migration.migrate(conn)
+                    conn.execute(f"PRAGMA user_version = {version}")
+                    conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                log.critical(f"Database migration {os.path.basename(path)} failed and was rolled back")
+                raise
+
+            log.info(f"Applied database migration {os.path.basename(path)}")
+    finally:
+        conn.isolation_level = isolation_level
+
+
+def insert_df(conn, table, df):
+    """
+    Inserts the rows of a DataFrame into a table with executemany. Unlike DataFrame.to_sql this doesn't commit, so
+    several inserts can share one transaction.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the NFL database.
+    table : str
+        Name of the table to insert into (DataFrame columns must match table columns).
+    df : DataFrame
+        Rows to insert (NaN/None become NULL).
+    """
+    if df is None or len(df) == 0:
+        return
+    columns = list(df.columns)
+    rows = df.astype(object).where(df.notna(), None).values.tolist()
+    conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})", rows)
+
+
+def delete_games(conn, game_ids, tables=SEASON_TABLES):
+    """
+    Deletes every row belonging to the given games from the per-game tables (doesn't commit).
+    """
+    if not game_ids:
+        return
+    for table in tables:
+        conn.execute(f"DELETE FROM {table} WHERE GAME_ID IN ({','.join(['?'] * len(game_ids))})", list(game_ids))
+
+
+def analyze_tables(conn, tables=SEASON_TABLES):
+    """
+    Refreshes the query planner's statistics (sqlite_stat1) of the given tables after a load and commits, so index
+    choices follow the reloaded rows. Takes a few milliseconds on the current database.
+    """
+    for table in tables:
+        conn.execute(f"ANALYZE {table}")
+    conn.commit()
+
+
+def record_dead_letter(conn, item_type, item_key, payload, error, attempts):
+    """
+    Records (or updates) a permanently failed game/weather fetch in the Dead_Letter table and commits.
+    A failure of an item that was already dead-lettered adds to its attempts and marks it unresolved again.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the NFL database.
+    item_type : str
+        'game' or 'weather'.
+    item_key : str
+        GAME_ID of the item.
+    payload : dict
+        Arguments needed to fetch the item again (stored as JSON).
+    error : str
+        The last error of the fetch.
+    attempts : int
+        Number of fetch attempts made.
+    """
+    failed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO Dead_Letter (ITEM_TYPE, ITEM_KEY, PAYLOAD, ERROR, ATTEMPTS, FIRST_FAILED_AT, LAST_FAILED_AT)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ITEM_TYPE, ITEM_KEY) DO UPDATE SET
+                PAYLOAD = excluded.PAYLOAD, ERROR = excluded.ERROR, ATTEMPTS = ATTEMPTS + excluded.ATTEMPTS,
+                LAST_FAILED_AT = excluded.LAST_FAILED_AT, RESOLVED_AT = NULL
+            """,
+            (item_type, item_key, json.dumps(payload, default=str), error, attempts, failed_at, failed_at),
+        )
+
+
+def read_dead_letters(conn, item_type=None):
+    """
+    Returns the unresolved dead letters (optionally only one item type) as a DataFrame, oldest first.
+    """
+    import pandas as pd # Only needed here, keeps pandas out of the CLI's startup (see run_pipeline.py)
+
+    query = "SELECT * FROM Dead_Letter WHERE RESOLVED_AT IS NULL"
+    params = []
+    if item_type is not None:
+        query += " AND ITEM_TYPE = ?"
+        params.append(item_type)
+    return pd.read_sql_query(query + " ORDER BY DEAD_LETTER_ID", conn, params=params)
+
+
+def resolve_dead_letters(conn, item_type, item_keys):
+    """
+    Marks the dead letters of loaded items as resolved (doesn't commit, so it can share the load's transaction).
+    """
+    if not item_keys:
+        return
+    resolved_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn.execute(
+        f"UPDATE Dead_Letter SET RESOLVED_AT = ? WHERE RESOLVED_AT IS NULL AND ITEM_TYPE = ? AND ITEM_KEY IN ({','.join(['?'] * len(item_keys))})",
+        [resolved_at, item_type] + list(item_keys),
+    )
+
+
+def bump_data_version(conn):
+    """
+    Increments the Data_Version counter (doesn't commit, call it inside the load's transaction so readers see the new
+    version together with the new rows). Cached reads keyed on the old version are then treated as stale.
+    """
+    conn.execute("UPDATE Data_Version SET VERSION = VERSION + 1, UPDATED_AT = ? WHERE DATA_VERSION_ID = 1", (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
+
+
+def read_data_version(conn):
+    """
+    Returns the current Data_Version counter (0 if the table isn't there yet).
+    """
+    try:
+        row = conn.execute("SELECT VERSION FROM Data_Version WHERE DATA_VERSION_ID = 1").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
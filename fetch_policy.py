@@ -0,0 +1,215 @@
+import requests
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from log_helper import NFL_Logging
+from config_helper import load_config
+
+
+class FetchError(Exception):
+    """
+    Raised when a fetch permanently failed (retries exhausted, non-retryable response, or the host's circuit is open).
+    """
+
+    def __init__(self, url, reason, attempts=0, retryable=True, retry_after=None):
+        super().__init__(reason)
+        self.url = url
+        self.reason = reason
+        self.attempts = attempts
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return f"{self.reason} (url: {self.url}, attempts: {self.attempts})"
+
+
+class FetchPolicy:
+    """
+    Class used to run fetches (API requests and selenium page loads) with retries and circuit breaking.
+
+    - Failed attempts are retried with jittered exponential backoff ("full jitter": a random delay between 0 and
+      min(max_delay, base_delay * 2^attempt)), a Retry-After header on a 429/503 response is honored instead.
+    - Every host has a circuit breaker: after circuit_failure_threshold consecutive failed fetches the circuit opens and
+      fetches to that host fail fast for circuit_reset_seconds, then a single trial fetch is let through (half open).
+
+    Settings are read from the 'Fetch_Policy' section of 'config.json'.
+    """
+
+    def __init__(self):
+        """
+        Initializes the FetchPolicy class.
+
+        Loads retry and circuit breaker settings from 'config.json'.
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+        policy = config['Fetch_Policy']
+
+        self.max_attempts = policy['max_attempts']
+        self.base_delay = policy['base_delay_seconds']
+        self.max_delay = policy['max_delay_seconds']
+        self.max_retry_after = policy['max_retry_after_seconds']
+        self.timeout = policy['request_timeout_seconds']
+        self.retry_statuses = set(policy['retry_statuses'])
+        self.circuit_failure_threshold = policy['circuit_failure_threshold']
+        self.circuit_reset_seconds = policy['circuit_reset_seconds']
+
+        # Circuit state per host: {'failures': consecutive failed fetches, 'opened_at': time.monotonic() or None}
+        self.circuits = {}
+
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """
+        Returns the seconds to wait before the next attempt (attempt starts at 1).
+
+        Parameters
+        ----------
+        attempt : int
+            Number of the attempt that just failed.
+        retry_after : float, optional
+            Seconds requested by the server's Retry-After header (capped at max_retry_after).
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+    def parse_retry_after(self, value):
+        """
+        Parses a Retry-After header, either delay seconds ('120') or an HTTP date. Returns seconds or None.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+    def circuit_allows(self, host):
+        """
+        Returns True if a fetch to the host may run (circuit closed, or open long enough for a half open trial).
+        """
+        circuit = self.circuits.get(host)
+        if circuit is None or circuit['opened_at'] is None:
+            return True
+        return time.monotonic() - circuit['opened_at'] >= self.circuit_reset_seconds
+
+
+    def record_success(self, host):
+        """ Closes the host's circuit. """
+        circuit = self.circuits.get(host)
+        if circuit is not None and circuit['opened_at'] is not None:
+            self.log.info(f"Circuit closed for {host}")
+        self.circuits[host] = {'failures': 0, 'opened_at': None}
+
+
+    def record_failure(self, host):
+        """ Counts a failed fetch against the host, opening (or re-opening after a failed trial) its circuit. """
+        circuit = self.circuits.setdefault(host, {'failures': 0, 'opened_at': None})
+        circuit['failures'] += 1
+        if circuit['failures'] >= self.circuit_failure_threshold:
+            if circuit['opened_at'] is None:
+                self.log.warning(f"Circuit opened for {host} after {circuit['failures']} consecutive failed fetches")
+            circuit['opened_at'] = time.monotonic()
+
+
+    def run(self, url, fetch, retry_exceptions=(requests.exceptions.RequestException,)):
+        """
+        Runs fetch() until it succeeds, retrying the given exceptions with backoff.
+
+        Parameters
+        ----------
+        url : str
+            The URL being fetched (its host picks the circuit breaker).
+        fetch : callable
+            Function doing a single attempt. It may raise FetchError itself: retryable errors are retried (using
+            their retry_after attribute if set), non-retryable errors are raised straight away.
+        retry_exceptions : tuple
+            Exception types raised by fetch() that count as a retryable failure.
+
+        Returns
+        -------
+        object
+            Whatever fetch() returned.
+
+        Raises
+        ------
+        FetchError
+            If the host's circuit is open, the error isn't retryable, or every attempt failed.
+        """
+        host = urlparse(url).netloc
+        if not self.circuit_allows(host):
+            raise FetchError(url, f"Circuit open for {host}", attempts=0)
+
+        # Half open: a single trial attempt, a failure re-opens the circuit without going through the backoff schedule
+        half_open = self.circuits.get(host, {}).get('opened_at') is not None
+        max_attempts = 1 if half_open else self.max_attempts
+        if half_open:
+            self.log.info(f"Circuit half open for {host}, trying a single fetch")
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                result = fetch()
+                self.record_success(host)
+                return result
+            except FetchError as e:
+                if not e.retryable:
+                    e.attempts = attempt
+                    raise
+                error, retry_after = e.reason, e.retry_after
+            except retry_exceptions as e:
+                error, retry_after = f"{type(e).__name__}: {e}", None
+
+            if attempt == max_attempts:
+                break
+            delay = self.backoff_delay(attempt, retry_after)
+            self.log.warning(f"Attempt {attempt}/{max_attempts} failed for {url} ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        self.record_failure(host)
+        raise FetchError(url, error, attempts=max_attempts)
+
+
+    def get(self, url, headers=None, params=None, on_attempt=None):
+        """
+        Sends a GET request under the fetch policy and returns the response.
+
+        429 and 5xx responses (retry_statuses) are retried, other 4xx responses fail straight away.
+
+        Parameters
+        ----------
+        url : str
+            The URL to request.
+        headers : dict, optional
+            Request headers.
+        params : dict, optional
+            Query parameters.
+        on_attempt : callable, optional
+            Called before every attempt (used by Scrape to count API calls against the daily limit).
+
+        Returns
+        -------
+        requests.Response
+            The successful response.
+        """
+        def fetch():
+            if on_attempt is not None:
+                on_attempt()
+            response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+            if response.status_code in self.retry_statuses:
+                raise FetchError(url, f"HTTP {response.status_code}", retry_after=self.parse_retry_after(response.headers.get('Retry-After')))
+            if response.status_code >= 400:
+                raise FetchError(url, f"HTTP {response.status_code}", retryable=False)
+            return response
+
+        return self.run(url, fetch)
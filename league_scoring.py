@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+import hashlib
+import glob
+import json
+import os
+import inspect
+from datetime import datetime
+from log_helper import NFL_Logging
+from config_helper import load_config, load_fantasy_scoring, read_json_file
+from db_helper import bump_data_version
+
+
+class LeagueScorer:
+    """
+    Class used to score every player game in every league at once into the Player_Game_Score table (one row per league
+    and player game).
+
+    The league registry is fantasy_scoring.json (HOME_LEAGUE_PTS, DK_PTS, FD_PTS) plus every leagues/*.json file, all in
+    the fantasy_scoring.json format (league ID > category > stat > points). The rules are compiled into
+        - a weight matrix (stat x league) of the points per stat, e.g., RECEIVING_RECEPTIONS 0.5
+        - a bonus matrix (yard tier x league) of the YARD_BONUS_<low>_<high>_YDS / YARD_BONUS_<low>_PLUS_YDS keys
+    so a batch of player games is scored with two matrix products: stats @ weights + tier masks @ bonuses.
+    DEFENSE categories are team scoring (see Clean.calculate_dst_points) and are skipped.
+
+    Examples:
+        >>> LeagueScorer().sync(conn)
+    """
+
+    def __init__(self, league_dir=None):
+        """
+        Initializes the LeagueScorer class.
+
+        Loads the league directory and the yard column behind each category's yard bonuses from the 'League_Registry'
+        section of 'config.json', then reads the registry.
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+        settings = config['League_Registry']
+        self.league_dir = league_dir or settings['directory']
+        self.include_fantasy_scoring = settings['include_fantasy_scoring']
+        self.yard_bonus_columns = settings['yard_bonus_columns']
+
+        self.leagues = self.load_registry()
+        self.league_ids = list(self.leagues)
+        self.stat_columns, self.weights, self.bonus_tiers, self.bonuses = self.compile_leagues()
+
+
+    def load_registry(self):
+        """
+        Reads every league from fantasy_scoring.json and leagues/*.json.
+
+        Returns
+        -------
+        dict
+            League ID -> {'source': file name, 'scoring': the league's rules}.
+
+        Raises
+        ------
+        ValueError
+            If two files define the same league ID.
+        """
+        sources = [('fantasy_scoring.json', load_fantasy_scoring())] if self.include_fantasy_scoring else []
+        for path in sorted(glob.glob(os.path.join(self.league_dir, '*.json'))):
+            sources.append((os.path.basename(path), read_json_file(os.path.abspath(path))))
+
+        leagues = {}
+        for source, scoring_guide in sources:
+            for league_id, scoring in scoring_guide.items():
+                if league_id in leagues:
+                    raise ValueError(f"League {league_id} is defined in both {leagues[league_id]['source']} and {source}")
+                leagues[league_id] = {'source': source, 'scoring': scoring}
+        return leagues
+
+
+    def compile_leagues(self):
+        """
+        Compiles the registry into the weight and bonus matrices.
+
+        Returns
+        -------
+        tuple
+            (stat columns, weights (stat x league), bonus tiers [(yard column, low, high)], bonuses (tier x league)).
+            A tier covers low <= yards < high (high is inf for _PLUS_ bonuses). Yard bonuses of categories without a
+            yard column in yard_bonus_columns score nothing (same as Clean.calculate_fantasy_points).
+        """
+        stat_columns, bonus_tiers, skipped_bonuses = [], [], []
+        weights, bonuses = {}, {}
+        for j, league_id in enumerate(self.league_ids):
+            for category, stats in self.leagues[league_id]['scoring'].items():
+                if category == 'DEFENSE':
+                    continue
+                for stat, points in stats.items():
+                    if stat.startswith('YARD_BONUS_'):
+                        if category not in self.yard_bonus_columns:
+                            skipped_bonuses.append(f"{league_id} {category}.{stat}")
+                            continue
+                        # YARD_BONUS_300_399_YDS > [300, 400), YARD_BONUS_400_PLUS_YDS > [400, inf)
+                        bounds = stat[len('YARD_BONUS_'):-len('_YDS')].split('_')
+                        tier = (self.yard_bonus_columns[category], float(bounds[0]), np.inf if bounds[1] == 'PLUS' else float(bounds[1]) + 1)
+                        if tier not in bonus_tiers:
+                            bonus_tiers.append(tier)
+                        bonuses[(bonus_tiers.index(tier), j)] = bonuses.get((bonus_tiers.index(tier), j), 0) + points
+                    else:
+                        if stat not in stat_columns:
+                            stat_columns.append(stat)
+                        weights[(stat_columns.index(stat), j)] = weights.get((stat_columns.index(stat), j), 0) + points
+
+        if skipped_bonuses:
+            self.log.warning(f"Yard bonuses of categories without a yard column (League_Registry.yard_bonus_columns in config.json) are ignored: {skipped_bonuses}")
+
+        weight_matrix = np.zeros((len(stat_columns), len(self.league_ids)))
+        for (i, j), points in weights.items():
+            weight_matrix[i, j] = points
+        bonus_matrix = np.zeros((len(bonus_tiers), len(self.league_ids)))
+        for (i, j), points in bonuses.items():
+            bonus_matrix[i, j] = points
+        return stat_columns, weight_matrix, bonus_tiers, bonus_matrix
+
+
+    def scoring_hash(self, league_id):
+        """ Returns a hash of a league's rules (leagues are rescored when it changes). """
+        rules = json.dumps(self.leagues[league_id]['scoring'], sort_keys=True)
+        return hashlib.sha1(rules.encode('utf-8')).hexdigest()[:16]
+
+
+    def score(self, stats_df):
+        """
+        Scores player game stats in every league.
+
+        Parameters
+        ----------
+        stats_df : DataFrame
+            Player game stats with SQL column names (NULL stats count as 0).
+
+        Returns
+        -------
+        numpy.ndarray
+            Points of shape (player game, league), in the order of self.league_ids, rounded to 2 decimals.
+        """
+        columns = [column for column in self.stat_columns if column in stats_df.columns]
+        stats = stats_df[columns].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=float)
+        points = stats @ self.weights[[self.stat_columns.index(column) for column in columns]]
+
+        if self.bonus_tiers:
+            masks = np.zeros((len(stats_df), len(self.bonus_tiers)))
+            for i, (column, low, high) in enumerate(self.bonus_tiers):
+                if column not in stats_df.columns:
+                    continue
+                yards = pd.to_numeric(stats_df[column], errors='coerce').fillna(0).to_numpy(dtype=float)
+                masks[:, i] = (yards >= low) & (yards < high)
+            points += masks @ self.bonuses
+
+        return np.round(points, 2)
+
+
+    def sync(self, conn, game_ids=None):
+        """
+        Brings Player_Game_Score up to date in one transaction: leagues that are new or whose rules changed are scored
+        over every player game, the other leagues only over the given games, and leagues no longer in the registry are
+        dropped. Scores of reloaded games' old rows are removed by a trigger on Player_Game_Stats.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        game_ids : list of str, optional
+            IDs of the games that were just (re)loaded. None scores every game in every league.
+
+        Returns
+        -------
+        int
+            Number of scores written.
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+        stored = dict(conn.execute("SELECT LEAGUE_ID, SCORING_HASH FROM League").fetchall())
+        hashes = {league_id: self.scoring_hash(league_id) for league_id in self.league_ids}
+        changed = [league_id for league_id in self.league_ids if game_ids is None or stored.get(league_id) != hashes[league_id]]
+        unchanged = [league_id for league_id in self.league_ids if league_id not in changed]
+        removed = [league_id for league_id in stored if league_id not in self.leagues]
+
+        # Stats that aren't Player_Game_Stats columns score nothing (same as Clean.calculate_fantasy_points)
+        # The yard columns behind the bonus tiers are read too (a league may have a yard bonus without per-yard points)
+        table_columns = [row[1] for row in conn.execute("PRAGMA table_info(Player_Game_Stats)")]
+        needed_columns = list(dict.fromkeys(self.stat_columns + [column for column, _, _ in self.bonus_tiers]))
+        unknown = [column for column in needed_columns if column not in table_columns]
+        if unknown:
+            self.log.warning(f"League scoring stats that aren't Player_Game_Stats columns are ignored: {unknown}")
+        columns = ', '.join(['PLAYER_GAME_ID'] + [column for column in needed_columns if column in table_columns])
+        written = 0
+        scored_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with conn:
+            for league_id in removed:
+                conn.execute("DELETE FROM Player_Game_Score WHERE LEAGUE_ID = ?", (league_id,))
+                conn.execute("DELETE FROM League WHERE LEAGUE_ID = ?", (league_id,))
+
+            if changed:
+                stats_df = pd.read_sql_query(f"SELECT {columns} FROM Player_Game_Stats", conn)
+                written += self.write_scores(conn, stats_df, changed)
+            if unchanged and game_ids:
+                stats_df = pd.read_sql_query(f"SELECT {columns} FROM Player_Game_Stats WHERE GAME_ID IN ({','.join(['?'] * len(game_ids))})", conn, params=list(game_ids))
+                written += self.write_scores(conn, stats_df, unchanged)
+
+            conn.executemany(
+                "INSERT INTO League (LEAGUE_ID, SOURCE, SCORING_HASH, SCORED_AT) VALUES (?, ?, ?, ?) ON CONFLICT(LEAGUE_ID) DO UPDATE SET SOURCE = excluded.SOURCE, SCORING_HASH = excluded.SCORING_HASH, SCORED_AT = excluded.SCORED_AT",
+                [(league_id, self.leagues[league_id]['source'], hashes[league_id], scored_at) for league_id in self.league_ids],
+            )
+            if written or removed:
+                bump_data_version(conn)
+
+        self.log.info(f"Scored {written} player games over {len(self.league_ids)} leagues ({len(changed)} rescored in full, {len(removed)} removed)")
+        return written
+
+
+    def write_scores(self, conn, stats_df, league_ids):
+        """ Scores a batch of player games in the given leagues and upserts them into Player_Game_Score (doesn't commit). """
+        if stats_df.empty:
+            return 0
+        points = self.score(stats_df)[:, [self.league_ids.index(league_id) for league_id in league_ids]]
+
+        # Long format: every player game repeated for each league
+        player_game_ids = np.repeat(stats_df['PLAYER_GAME_ID'].to_numpy(dtype=np.int64), len(league_ids)).tolist()
+        leagues = np.tile(np.array(league_ids, dtype=object), len(stats_df)).tolist()
+        conn.executemany(
+            "INSERT INTO Player_Game_Score (PLAYER_GAME_ID, LEAGUE_ID, PTS) VALUES (?, ?, ?) ON CONFLICT(PLAYER_GAME_ID, LEAGUE_ID) DO UPDATE SET PTS = excluded.PTS",
+            zip(player_game_ids, leagues, points.ravel().tolist()),
+        )
+        return points.size
@@ -0,0 +1,325 @@
+import re
+import os
+import inspect
+import unicodedata
+from collections import Counter
+from datetime import datetime
+import pandas as pd
+from log_helper import NFL_Logging
+from config_helper import load_config
+
+
+class PlayerResolver:
+    """
+    Class used to match player names from external data (salary files, ADP, injury feeds) to Player.PLAYER_ID.
+
+    Names are normalized (accents, punctuation, initials and suffixes like Jr. removed) and indexed once, together
+    with every name and team a player had in Player_History and Player_Game_Stats:
+    - an exact index of normalized names, and
+    - a trigram index (trigram -> names containing it), so a misspelled name is only compared with the names sharing
+      a trigram with it instead of every player.
+    Candidates are ranked by trigram similarity plus a bonus for a matching team/position, a name whose two best
+    candidates are too close is left ambiguous. Confirmed matches are stored per source in the Player_Alias table
+    (optionally for a team/position) and take precedence over the index while the player fits the given team/position.
+
+    Settings are read from the 'Player_Resolver' section of 'config.json'.
+
+    Examples:
+        >>> resolver = PlayerResolver(conn, source='dk_salaries')
+        >>> resolver.resolve('Marvin Jones', team='JAC', position='WR')
+        {'PLAYER_ID': 15072, 'FULL_NAME': 'Marvin Jones Jr.', 'MATCH_TYPE': 'exact', 'MATCH_SCORE': 1.15}
+        >>> matches_df = resolver.resolve_batch(salaries_df, name_column='Name', team_column='TeamAbbrev', position_column='Position')
+    """
+
+    def __init__(self, conn, source=None):
+        """
+        Initializes the PlayerResolver class and builds its indexes.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        source : str, optional
+            Name of the external source (e.g., 'dk_salaries'). Only aliases confirmed for this source are used.
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+        settings = config['Player_Resolver']
+
+        self.source = source
+        self.min_similarity = settings['min_similarity']
+        self.ambiguity_margin = settings['ambiguity_margin']
+        self.team_bonus = settings['team_bonus']
+        self.position_bonus = settings['position_bonus']
+        self.name_suffixes = set(settings['name_suffixes'])
+        self.team_aliases = settings['team_aliases']
+
+        self.build_index(conn)
+        self.load_aliases(conn)
+
+
+    def normalize_name(self, name):
+        """
+        Normalizes a player name for matching, e.g., 'A.J. Brown', 'A. J. Brown' and 'Brown, AJ' all become 'aj brown',
+        and 'Marvin Jones Jr.' becomes 'marvin jones'.
+        """
+        if name is None or pd.isna(name):
+            return ''
+        name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+        # 'Last, First' > 'First Last'
+        if ',' in name:
+            last, first = name.split(',', 1)
+            name = f"{first} {last}"
+        name = re.sub(r"[.'`]", '', name.lower())
+        name = re.sub(r'[^a-z0-9]+', ' ', name)
+        # Initials written apart ('a j brown') are joined ('aj brown')
+        name = re.sub(r'\b([a-z])\s+(?=[a-z]\b)', r'\1', name)
+        return ' '.join(word for word in name.split() if word not in self.name_suffixes)
+
+
+    def normalize_team(self, team):
+        """ Maps a team abbreviation from another source to the database's abbreviation (e.g., 'JAC' > 'JAX'). """
+        if team is None or pd.isna(team):
+            return None
+        team = str(team).strip().upper()
+        return self.team_aliases.get(team, team)
+
+
+    def normalize_position(self, position):
+        """ Upper-cases a position from another source (None if missing). """
+        if position is None or pd.isna(position):
+            return None
+        return str(position).strip().upper()
+
+
+    def trigrams(self, name_key):
+        """ Returns the set of trigrams of a normalized name (padded so word starts/ends count). """
+        padded = f"  {name_key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+    def build_index(self, conn):
+        """
+        Builds the exact and trigram indexes over every name a player had (Player, Player_History and Player_Game_Stats),
+        along with every team the player played for.
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+
+        names_df = pd.read_sql_query(
+            """
+            SELECT PLAYER_ID, FULL_NAME AS NAME, TEAM_ABBR AS TEAM FROM Player
+            UNION SELECT PLAYER_ID, FULL_NAME, TEAM_ABBR FROM Player_History
+            UNION SELECT PLAYER_ID, PLAYER_NAME, TEAM FROM Player_Game_Stats
+            """,
+            conn,
+        )
+        players_df = pd.read_sql_query("SELECT PLAYER_ID, FULL_NAME, POSITION FROM Player", conn)
+
+        self.full_names = dict(zip(players_df['PLAYER_ID'], players_df['FULL_NAME']))
+        self.positions = dict(zip(players_df['PLAYER_ID'], players_df['POSITION']))
+        self.teams = names_df.dropna(subset=['TEAM']).groupby('PLAYER_ID')['TEAM'].agg(set).to_dict()
+
+        # Unique normalized names, the players that had each name, and the name's trigrams
+        self.name_keys = []
+        self.name_players = []
+        self.name_trigram_counts = []
+        self.name_ids = {}
+        self.trigram_index = {}
+        for player_id, name in zip(names_df['PLAYER_ID'], names_df['NAME']):
+            name_key = self.normalize_name(name)
+            if not name_key:
+                continue
+            name_id = self.name_ids.get(name_key)
+            if name_id is None:
+                name_id = len(self.name_keys)
+                self.name_ids[name_key] = name_id
+                self.name_keys.append(name_key)
+                self.name_players.append(set())
+                trigrams = self.trigrams(name_key)
+                self.name_trigram_counts.append(len(trigrams))
+                for trigram in trigrams:
+                    self.trigram_index.setdefault(trigram, []).append(name_id)
+            self.name_players[name_id].add(player_id)
+            self.full_names.setdefault(player_id, name)
+
+        self.log.info(f"Indexed {len(self.name_keys)} player names ({len(self.trigram_index)} trigrams) for {len(self.full_names)} players")
+
+
+    def load_aliases(self, conn):
+        """ Loads the aliases confirmed for the resolver's source, keyed by (ALIAS_KEY, TEAM, POSITION). """
+        aliases_df = pd.read_sql_query("SELECT ALIAS_KEY, TEAM, POSITION, PLAYER_ID FROM Player_Alias WHERE SOURCE = ?", conn, params=[self.source or ''])
+        self.aliases = dict(zip(zip(aliases_df['ALIAS_KEY'], aliases_df['TEAM'].fillna(''), aliases_df['POSITION'].fillna('')), aliases_df['PLAYER_ID']))
+
+
+    def find_alias(self, name_key, team, position):
+        """
+        Returns the PLAYER_ID of the most specific confirmed alias for a name that fits the given team/position
+        (None if there is none).
+
+        An alias is skipped when its player never played for the given team or has another position, and an alias
+        confirmed for any team/position isn't used for a name several players share once a team or position is given
+        (the ranking in resolve picks between them).
+        """
+        shared_name = len(self.name_players[self.name_ids[name_key]]) > 1 if name_key in self.name_ids else False
+        for alias_team, alias_position in [(team or '', position or ''), (team or '', ''), ('', position or ''), ('', '')]:
+            player_id = self.aliases.get((name_key, alias_team, alias_position))
+            if player_id is None:
+                continue
+            if team is not None and player_id in self.teams and team not in self.teams[player_id]:
+                continue
+            if position is not None and self.positions.get(player_id) and position != self.positions[player_id]:
+                continue
+            if shared_name and not alias_team and not alias_position and (team is not None or position is not None):
+                continue
+            return player_id
+        return None
+
+
+    def similar_names(self, name_key):
+        """
+        Returns {name_id: similarity} of the indexed names sharing trigrams with a name, for names with a Dice
+        similarity of at least min_similarity.
+        """
+        trigrams = self.trigrams(name_key)
+        shared_counts = Counter()
+        for trigram in trigrams:
+            shared_counts.update(self.trigram_index.get(trigram, ()))
+
+        similar = {}
+        for name_id, shared in shared_counts.items():
+            similarity = 2 * shared / (len(trigrams) + self.name_trigram_counts[name_id])
+            if similarity >= self.min_similarity:
+                similar[name_id] = similarity
+        return similar
+
+
+    def resolve(self, name, team=None, position=None):
+        """
+        Resolves a single name to a player.
+
+        Parameters
+        ----------
+        name : str
+            Player name as written in the source.
+        team : str, optional
+            Team abbreviation in the source (used to pick between players with similar names).
+        position : str, optional
+            Position in the source (used to pick between players with similar names).
+
+        Returns
+        -------
+        dict
+            PLAYER_ID (None if unmatched/ambiguous), FULL_NAME, MATCH_TYPE ('alias', 'exact', 'fuzzy', 'ambiguous' or
+            'unmatched') and MATCH_SCORE (similarity plus team/position bonus).
+        """
+        name_key = self.normalize_name(name)
+        team = self.normalize_team(team)
+        position = self.normalize_position(position)
+        player_id = self.find_alias(name_key, team, position)
+        if player_id is not None:
+            return {'PLAYER_ID': player_id, 'FULL_NAME': self.full_names.get(player_id), 'MATCH_TYPE': 'alias', 'MATCH_SCORE': 1.0}
+
+        # Exact normalized name first, trigram similarity otherwise
+        name_id = self.name_ids.get(name_key)
+        similar = {name_id: 1.0} if name_id is not None else self.similar_names(name_key)
+        match_type = 'exact' if name_id is not None else 'fuzzy'
+
+        candidates = {}
+        for similar_id, similarity in similar.items():
+            for player_id in self.name_players[similar_id]:
+                candidates[player_id] = max(candidates.get(player_id, 0), similarity)
+        if not candidates:
+            return {'PLAYER_ID': None, 'FULL_NAME': None, 'MATCH_TYPE': 'unmatched', 'MATCH_SCORE': 0.0}
+
+        scores = {
+            player_id: similarity
+            + (self.team_bonus if team is not None and team in self.teams.get(player_id, ()) else 0)
+            + (self.position_bonus if position is not None and position == self.positions.get(player_id) else 0)
+            for player_id, similarity in candidates.items()
+        }
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_id, best_score = ranked[0]
+        if len(ranked) > 1 and best_score - ranked[1][1] < self.ambiguity_margin:
+            return {'PLAYER_ID': None, 'FULL_NAME': None, 'MATCH_TYPE': 'ambiguous', 'MATCH_SCORE': round(best_score, 4)}
+        return {'PLAYER_ID': best_id, 'FULL_NAME': self.full_names.get(best_id), 'MATCH_TYPE': match_type, 'MATCH_SCORE': round(best_score, 4)}
+
+
+    def resolve_batch(self, names_df, name_column, team_column=None, position_column=None):
+        """
+        Resolves every row of a DataFrame (each distinct name/team/position is resolved once).
+
+        Parameters
+        ----------
+        names_df : DataFrame
+            The external data.
+        name_column : str
+            Column with the player names.
+        team_column, position_column : str, optional
+            Columns with the team abbreviations/positions.
+
+        Returns
+        -------
+        DataFrame
+            names_df with PLAYER_ID, FULL_NAME, MATCH_TYPE and MATCH_SCORE columns added (see resolve).
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+
+        key_columns = [column for column in [name_column, team_column, position_column] if column is not None]
+        keys_df = names_df[key_columns].drop_duplicates()
+        matches = [
+            self.resolve(row[name_column], row[team_column] if team_column else None, row[position_column] if position_column else None)
+            for row in keys_df.to_dict('records')
+        ]
+        matches_df = pd.concat([keys_df.reset_index(drop=True), pd.DataFrame(matches, columns=['PLAYER_ID', 'FULL_NAME', 'MATCH_TYPE', 'MATCH_SCORE'])], axis=1)
+        matches_df['PLAYER_ID'] = matches_df['PLAYER_ID'].astype('Int64')
+
+        resolved_df = names_df.merge(matches_df, on=key_columns, how='left')
+        match_counts = matches_df['MATCH_TYPE'].value_counts().to_dict()
+        self.log.info(f"Resolved {len(keys_df)} distinct names: {match_counts}")
+        return resolved_df
+
+
+    def confirm(self, conn, matches, source=None):
+        """
+        Stores confirmed matches in the Player_Alias table (replacing a previous match of the same name, team and
+        position) and commits.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        matches : iterable of tuple
+            (name as written in the source, PLAYER_ID) pairs, or (name, PLAYER_ID, team, position) to confirm the name
+            only for a team/position (None for any).
+        source : str, optional
+            Source of the names (defaults to the resolver's source).
+
+        Raises
+        ------
+        ValueError
+            If a PLAYER_ID isn't one of the indexed players.
+        """
+        source = source or self.source or ''
+        matches = [tuple(match) for match in matches]
+        unknown = [(match[0], match[1]) for match in matches if int(match[1]) not in self.full_names]
+        if unknown:
+            raise ValueError(f"Can't confirm aliases of players that aren't in the database: {unknown}")
+        confirmed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = []
+        for match in matches:
+            name, player_id, team, position = (match + (None, None))[:4]
+            rows.append((source, name, self.normalize_name(name), self.normalize_team(team) or '', self.normalize_position(position) or '', int(player_id), confirmed_at))
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO Player_Alias (SOURCE, ALIAS_NAME, ALIAS_KEY, TEAM, POSITION, PLAYER_ID, CONFIRMED_AT) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(SOURCE, ALIAS_KEY, TEAM, POSITION) DO UPDATE SET
+                    ALIAS_NAME = excluded.ALIAS_NAME, PLAYER_ID = excluded.PLAYER_ID, CONFIRMED_AT = excluded.CONFIRMED_AT
+                """,
+                rows,
+            )
+
+        if source == (self.source or ''):
+            for _, _, alias_key, team, position, player_id, _ in rows:
+                self.aliases[(alias_key, team, position)] = player_id
+        self.log.info(f"Confirmed {len(rows)} player aliases for {source}")
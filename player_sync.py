@@ -0,0 +1,108 @@
+import pandas as pd
+import os
+import inspect
+from datetime import datetime
+from log_helper import NFL_Logging
+from config_helper import load_config
+from db_helper import bump_data_version
+
+
+class PlayerSync:
+    """
+    Class used to sync the Player table with a freshly scraped players DataFrame.
+
+    Instead of deleting and reloading every player, each incoming row is hashed and compared against the stored
+    ROW_HASH. Only new or changed players are upserted, players missing from the API are soft-retired (ACTIVE = 0), and
+    every change is appended to Player_History (which keeps the injury designation history).
+    """
+
+    def __init__(self):
+        """
+        Initializes the PlayerSync class.
+
+        Loads the Player table columns from 'config.json' (the columns that are hashed and copied into Player_History).
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+        self.player_columns = list(config['Player_Table_Mapping']['df_datatypes_to_db_datatypes'])
+
+
+    def hash_players(self, players_df):
+        """
+        Hashes every player row (all Player table columns) into a 16 character hex string.
+
+        Parameters
+        ----------
+        players_df : DataFrame
+            The cleaned players DataFrame (with database dtypes, i.e., after restore_column_types).
+
+        Returns
+        -------
+        Series
+            The row hashes, aligned with players_df.
+        """
+        row_hashes = pd.util.hash_pandas_object(players_df[self.player_columns].astype(str), index=False)
+        return row_hashes.map('{:016x}'.format)
+
+
+    def sync(self, conn, players_df):
+        """
+        Upserts new/changed players, soft-retires missing players, and records every change in Player_History.
+        All writes happen in a single transaction.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        players_df : DataFrame
+            The cleaned players DataFrame (with database dtypes, i.e., after restore_column_types).
+
+        Returns
+        -------
+        dict
+            Number of players per change type (Added, Updated, Returned, Baseline, Retired).
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+        change_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        incoming_df = players_df.drop_duplicates('PLAYER_ID', keep='last').copy()
+        incoming_df['ROW_HASH'] = self.hash_players(incoming_df)
+        existing_df = pd.read_sql_query("SELECT PLAYER_ID, ROW_HASH AS DB_ROW_HASH, ACTIVE FROM Player", conn)
+
+        merged_df = incoming_df.merge(existing_df, on='PLAYER_ID', how='left', indicator=True)
+        in_db = merged_df['_merge'] == 'both'
+        merged_df['CHANGE_TYPE'] = None
+        merged_df.loc[~in_db, 'CHANGE_TYPE'] = 'Added'
+        merged_df.loc[in_db & (merged_df['ROW_HASH'] != merged_df['DB_ROW_HASH']), 'CHANGE_TYPE'] = 'Updated'
+        merged_df.loc[in_db & (merged_df['ROW_HASH'] == merged_df['DB_ROW_HASH']) & (merged_df['ACTIVE'] == 0), 'CHANGE_TYPE'] = 'Returned'
+        # Rows loaded before hashing existed have no stored hash yet, record their first snapshot as a baseline
+        merged_df.loc[in_db & merged_df['DB_ROW_HASH'].isna(), 'CHANGE_TYPE'] = 'Baseline'
+
+        changed_df = merged_df[merged_df['CHANGE_TYPE'].notna()]
+        retired_ids = existing_df.loc[(existing_df['ACTIVE'] != 0) & ~existing_df['PLAYER_ID'].isin(incoming_df['PLAYER_ID']), 'PLAYER_ID'].tolist()
+
+        columns = self.player_columns + ['ROW_HASH']
+        upsert_query = "INSERT INTO Player ({cols}, ACTIVE, LAST_UPDATED) VALUES ({seq}, 1, ?) ON CONFLICT(PLAYER_ID) DO UPDATE SET {updates}, ACTIVE = 1, LAST_UPDATED = excluded.LAST_UPDATED".format(
+            cols=', '.join(columns),
+            seq=', '.join(['?'] * len(columns)),
+            updates=', '.join(f"{col} = excluded.{col}" for col in columns if col != 'PLAYER_ID'),
+        )
+        history_query = "INSERT INTO Player_History (PLAYER_ID, CHANGE_TYPE, CHANGE_DATE, {cols}) SELECT PLAYER_ID, ?, ?, {cols} FROM Player WHERE PLAYER_ID = ?".format(
+            cols=', '.join(col for col in columns if col != 'PLAYER_ID'),
+        )
+
+        upsert_rows = [row + [change_date] for row in changed_df[columns].astype(object).values.tolist()]
+        history_rows = [(change_type, change_date, player_id) for player_id, change_type in zip(changed_df['PLAYER_ID'].tolist(), changed_df['CHANGE_TYPE'].tolist())]
+        history_rows += [('Retired', change_date, player_id) for player_id in retired_ids]
+
+        with conn:
+            conn.executemany(upsert_query, upsert_rows)
+            conn.executemany("UPDATE Player SET ACTIVE = 0, LAST_UPDATED = ? WHERE PLAYER_ID = ?", [(change_date, player_id) for player_id in retired_ids])
+            conn.executemany(history_query, history_rows)
+            if history_rows:
+                bump_data_version(conn)
+
+        changes = changed_df['CHANGE_TYPE'].value_counts().to_dict()
+        changes['Retired'] = len(retired_ids)
+        self.log.info(f"Synced Player table: {changes} ({len(incoming_df) - len(changed_df)} unchanged)")
+        return changes
@@ -0,0 +1,438 @@
+import pandas as pd
+import hashlib
+import glob
+import json
+import os
+from collections import OrderedDict
+from db_helper import read_data_version, connect_reader, snapshot
+
+
+class NFL_Queries:
+    """
+    Class used to read the common views of the NFL database (for the notebooks and other downstream tools).
+
+    Every query result is memoized in an in-memory LRU cache, and optionally pickled to an on-disk cache, keyed by the
+    query name, its arguments and the database's Data_Version counter. The pipeline bumps Data_Version whenever it loads
+    new data, so repeated reads are served from memory until then and re-run against the database afterwards.
+
+    Examples:
+        >>> queries = NFL_Queries('..\\..\\nfl_fantasy.db')
+        >>> queries.season_leaderboard(2023, platform='DK_PTS', position='WR', limit=10)
+    """
+
+    def __init__(self, db_path='nfl_fantasy.db', cache_size=128, cache_dir=None, scoring_path='fantasy_scoring.json'):
+        """
+        Initializes the NFL_Queries class with a read-only connection to the database.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to nfl_fantasy.db.
+        cache_size : int
+            Number of query results kept in the in-memory LRU cache.
+        cache_dir : str, optional
+            Directory for the on-disk cache (results survive notebook kernel restarts). Disabled if None.
+        scoring_path : str
+            Path to fantasy_scoring.json, relative to the database's folder (its platforms are the valid leaderboard platforms).
+        """
+        # Connection is opened on the first query (the *_sql methods can be used without one, see stats_service.py)
+        self.db_path = db_path
+        self.conn = None
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Fantasy point columns in Player_Game_Stats (e.g., HOME_LEAGUE_PTS, DK_PTS, FD_PTS)
+        with open(os.path.join(os.path.dirname(os.path.abspath(db_path)), scoring_path)) as f:
+            self.platforms = list(json.load(f))
+
+        self.cache = OrderedDict()
+        self.cache_version = None
+        self.hits = 0
+        self.misses = 0
+
+
+    def connect(self):
+        """ Returns the read-only database connection, opening it if needed. """
+        if self.conn is None:
+            self.conn = connect_reader(self.db_path)
+        return self.conn
+
+
+    def close(self):
+        """ Closes the database connection. """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+    def query(self, name, sql, params=()):
+        """
+        Runs a SQL query through the cache (also usable for ad hoc notebook queries).
+
+        Parameters
+        ----------
+        name : str
+            Name of the query (part of the cache key).
+        sql : str
+            The SQL query, with ? placeholders.
+        params : tuple
+            Values for the placeholders (part of the cache key).
+
+        Returns
+        -------
+        DataFrame
+            A copy of the (cached) result.
+        """
+        conn = self.connect()
+        # Version and rows are read in one snapshot, so a result is never cached under the wrong version
+        with snapshot(conn):
+            version = read_data_version(conn)
+            if version != self.cache_version:
+                # New data was loaded > every cached result is stale
+                self.cache.clear()
+                self.cache_version = version
+                self.prune_disk_cache(version)
+
+            key = (name, sql, tuple(params))
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key].copy()
+
+            disk_path = self.disk_cache_path(key, version)
+            if disk_path is not None and os.path.exists(disk_path):
+                result_df = pd.read_pickle(disk_path)
+                self.hits += 1
+            else:
+                result_df = pd.read_sql_query(sql, conn, params=list(params))
+                self.misses += 1
+                if disk_path is not None:
+                    result_df.to_pickle(disk_path)
+
+            self.cache[key] = result_df
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return result_df.copy()
+
+
+    def disk_cache_path(self, key, version):
+        """
+        Returns the on-disk cache file for a query key at a data version (None if the disk cache is disabled).
+        """
+        if self.cache_dir is None:
+            return None
+        key_hash = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{key[0]}_{key_hash}_v{version}.pkl")
+
+
+    def prune_disk_cache(self, version):
+        """
+        Deletes on-disk cache files of older data versions.
+        """
+        if self.cache_dir is None:
+            return
+        for path in glob.glob(os.path.join(self.cache_dir, '*.pkl')):
+            if not path.endswith(f"_v{version}.pkl"):
+                os.remove(path)
+
+
+    def player_game_log(self, player_id, season=None):
+        """
+        Returns a player's stat line for every game (optionally a single season), oldest first.
+        See player_game_log_sql for the parameters.
+        """
+        return self.query('player_game_log', *self.player_game_log_sql(player_id, season))
+
+
+    def player_game_log_sql(self, player_id, season=None):
+        """
+        Returns the (sql, params) of a player's game log.
+
+        Parameters
+        ----------
+        player_id : int
+            PLAYER_ID of the player.
+        season : int, optional
+            Season to filter on (e.g., 2023).
+        """
+        sql = """
+            SELECT g.SEASON_ID, g.GAME_WEEK, g.GAME_DATE, g.GAME_TYPE, pgs.*
+            FROM Player_Game_Stats pgs
+                INNER JOIN Game g ON g.GAME_ID = pgs.GAME_ID
+            WHERE pgs.PLAYER_ID = ?
+        """
+        params = [int(player_id)]
+        if season is not None:
+            sql += " AND g.SEASON_ID = ?"
+            params.append(str(season))
+        sql += " ORDER BY g.GAME_DATE, g.GAME_ID"
+        return sql, params
+
+
+    def season_leaderboard(self, season, platform='HOME_LEAGUE_PTS', position=None, game_type='Regular Season', limit=None):
+        """
+        Returns the season's fantasy point leaders for a scoring platform, with their totals of the main stats.
+        See leaderboard_sql for the parameters.
+        """
+        return self.query('season_leaderboard', *self.leaderboard_sql(season, None, platform, position, game_type, limit))
+
+
+    def weekly_leaderboard(self, season, week, platform='HOME_LEAGUE_PTS', position=None, limit=None):
+        """
+        Returns a single week's fantasy point leaders for a scoring platform (e.g., weekly_leaderboard(2023, 5)).
+        See leaderboard_sql for the parameters.
+        """
+        return self.query('weekly_leaderboard', *self.leaderboard_sql(season, week, platform, position, None, limit))
+
+
+    def leaderboard_sql(self, season, week=None, platform='HOME_LEAGUE_PTS', position=None, game_type='Regular Season', limit=None):
+        """
+        Returns the (sql, params) of a season or weekly fantasy point leaderboard.
+
+        Parameters
+        ----------
+        season : int
+            Season of the leaderboard (e.g., 2023).
+        week : int or str, optional
+            Week of the leaderboard, a regular season week number (5 > 'Week 5') or a GAME_WEEK (e.g., 'Wild Card').
+            Whole season if None.
+        platform : str
+            Fantasy points column to rank on, one of the platforms in fantasy_scoring.json (HOME_LEAGUE_PTS, DK_PTS, FD_PTS).
+        position : str, optional
+            Position to filter on (QB, RB, WR, TE).
+        game_type : str, optional
+            GAME_TYPE of the games to include (Preseason, Regular Season, Postseason), all if None.
+        limit : int, optional
+            Number of players to return (all if None).
+        """
+        # The points column is put into the SQL itself, so only allow known platforms
+        if platform not in self.platforms:
+            raise ValueError(f"Unknown platform '{platform}', expected one of {self.platforms}")
+
+        sql = f"""
+            SELECT
+                pgs.PLAYER_ID,
+                MAX(pgs.PLAYER_NAME) AS PLAYER_NAME,
+                p.POSITION,
+                GROUP_CONCAT(DISTINCT pgs.TEAM) AS TEAMS,
+                COUNT(*) AS GAMES_PLAYED,
+                ROUND(SUM(pgs.{platform}), 2) AS FANTASY_PTS,
+                ROUND(AVG(pgs.{platform}), 2) AS FANTASY_PTS_PER_GAME,
+                SUM(pgs.PASSING_YARDS) AS PASSING_YARDS,
+                SUM(pgs.PASSING_TOUCHDOWNS) AS PASSING_TOUCHDOWNS,
+                SUM(pgs.PASSING_INTERCEPTIONS) AS PASSING_INTERCEPTIONS,
+                SUM(pgs.RUSHING_CARRIES) AS RUSHING_CARRIES,
+                SUM(pgs.RUSHING_RUSH_YARDS) AS RUSHING_YARDS,
+                SUM(pgs.RUSHING_RUSH_TOUCHDOWNS) AS RUSHING_TOUCHDOWNS,
+                SUM(pgs.RECEIVING_TARGETS) AS RECEIVING_TARGETS,
+                SUM(pgs.RECEIVING_RECEPTIONS) AS RECEIVING_RECEPTIONS,
+                SUM(pgs.RECEIVING_REC_YARDS) AS RECEIVING_YARDS,
+                SUM(pgs.RECEIVING_REC_TOUCHDOWNS) AS RECEIVING_TOUCHDOWNS
+            FROM Player_Game_Stats pgs
+                INNER JOIN Game g ON g.GAME_ID = pgs.GAME_ID
+                LEFT JOIN Player p ON p.PLAYER_ID = pgs.PLAYER_ID
+            WHERE g.SEASON_ID = ?
+        """
+        params = [str(season)]
+        if week is not None:
+            sql += " AND g.GAME_WEEK = ?"
+            params.append(f"Week {week}" if str(week).isdigit() else week)
+        if game_type is not None:
+            sql += " AND g.GAME_TYPE = ?"
+            params.append(game_type)
+        if position is not None:
+            sql += " AND p.POSITION = ?"
+            params.append(position)
+        sql += " GROUP BY pgs.PLAYER_ID ORDER BY FANTASY_PTS DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return sql, params
+
+
+    def team_splits(self, season, team=None, game_type='Regular Season'):
+        """
+        Returns every team's home/away splits for a season (per game averages).
+        See team_splits_sql for the parameters.
+        """
+        return self.query('team_splits', *self.team_splits_sql(season, team, game_type))
+
+
+    def team_splits_sql(self, season, team=None, game_type='Regular Season'):
+        """
+        Returns the (sql, params) of the teams' home/away splits.
+
+        Parameters
+        ----------
+        season : int
+            Season of the splits (e.g., 2023).
+        team : str, optional
+            Team abbreviation to filter on (e.g., 'KC').
+        game_type : str
+            GAME_TYPE of the games to include (Preseason, Regular Season, Postseason).
+        """
+        sql = """
+            SELECT
+                tgs.TEAM_ABBR,
+                tgs.HOME_OR_AWAY,
+                COUNT(*) AS GAMES,
+                SUM(CASE WHEN g.WINNING_TEAM_ID = tgs.TEAM_ID THEN 1 ELSE 0 END) AS WINS,
+                ROUND(AVG(CASE WHEN tgs.HOME_OR_AWAY = 'Home' THEN g.HOME_POINTS ELSE g.AWAY_POINTS END), 2) AS POINTS_FOR,
+                ROUND(AVG(tgs.POINTS_ALLOWED), 2) AS POINTS_ALLOWED,
+                ROUND(AVG(tgs.OFF_PASSING_YARDS), 2) AS PASSING_YARDS,
+                ROUND(AVG(tgs.OFF_RUSHING_YARDS), 2) AS RUSHING_YARDS,
+                ROUND(AVG(tgs.TOTAL_YARDS), 2) AS TOTAL_YARDS,
+                ROUND(AVG(tgs.TURNOVERS), 2) AS TURNOVERS,
+                ROUND(AVG(tgs.DEF_SACKS), 2) AS DEF_SACKS,
+                ROUND(AVG(tgs.DEF_YARDS_ALLOWED), 2) AS DEF_YARDS_ALLOWED
+            FROM Team_Game_Stats tgs
+                INNER JOIN Game g ON g.GAME_ID = tgs.GAME_ID
+            WHERE g.SEASON_ID = ? AND g.GAME_TYPE = ?
+        """
+        params = [str(season), game_type]
+        if team is not None:
+            sql += " AND tgs.TEAM_ABBR = ?"
+            params.append(team)
+        sql += " GROUP BY tgs.TEAM_ABBR, tgs.HOME_OR_AWAY ORDER BY tgs.TEAM_ABBR, tgs.HOME_OR_AWAY DESC"
+        return sql, params
+
+
+    def weather_joined_stats(self, season=None, position=None, game_type='Regular Season'):
+        """
+        Returns player game stats joined with the weather during the game (observations from kickoff until 4 hours
+        after) and the home stadium type. See weather_joined_stats_sql for the parameters.
+        """
+        return self.query('weather_joined_stats', *self.weather_joined_stats_sql(season, position, game_type))
+
+
+    def weather_joined_stats_sql(self, season=None, position=None, game_type='Regular Season'):
+        """
+        Returns the (sql, params) of the weather-joined player game stats.
+
+        Parameters
+        ----------
+        season : int, optional
+            Season to filter on (e.g., 2023).
+        position : str, optional
+            Position to filter on (QB, RB, WR, TE).
+        game_type : str
+            GAME_TYPE of the games to include (Preseason, Regular Season, Postseason).
+        """
+        sql = """
+            WITH game_weather AS (
+                SELECT
+                    w.GAME_ID,
+                    ROUND(AVG(w.TEMPERATURE), 1) AS AVG_TEMPERATURE,
+                    ROUND(AVG(w.HUMIDITY), 1) AS AVG_HUMIDITY,
+                    ROUND(AVG(w.WIND_SPEED), 1) AS AVG_WIND_SPEED,
+                    ROUND(SUM(w.PRECIPITATION), 2) AS TOTAL_PRECIPITATION
+                FROM Weather w
+                    INNER JOIN Game g ON g.GAME_ID = w.GAME_ID
+                WHERE w.OBSERVATION_TIME_UTC BETWEEN g.KICKOFF_UTC AND strftime('%Y-%m-%dT%H:%M:%SZ', g.KICKOFF_UTC, '+4 hours')
+                GROUP BY w.GAME_ID
+            )
+            SELECT
+                g.SEASON_ID, g.GAME_WEEK, g.GAME_DATE, g.GAME_TYPE,
+                home_team.STADIUM_TYPE,
+                gw.AVG_TEMPERATURE, gw.AVG_HUMIDITY, gw.AVG_WIND_SPEED, gw.TOTAL_PRECIPITATION,
+                p.POSITION,
+                pgs.*
+            FROM Player_Game_Stats pgs
+                INNER JOIN Game g ON g.GAME_ID = pgs.GAME_ID
+                LEFT JOIN game_weather gw ON gw.GAME_ID = pgs.GAME_ID
+                LEFT JOIN Team home_team ON home_team.TEAM_ID = g.HOME_TEAM_ID
+                LEFT JOIN Player p ON p.PLAYER_ID = pgs.PLAYER_ID
+            WHERE g.GAME_TYPE = ?
+        """
+        params = [game_type]
+        if season is not None:
+            sql += " AND g.SEASON_ID = ?"
+            params.append(str(season))
+        if position is not None:
+            sql += " AND p.POSITION = ?"
+            params.append(position)
+        sql += " ORDER BY g.GAME_DATE, pgs.GAME_ID, pgs.PLAYER_ID"
+        return sql, params
+
+
+    def injury_search(self, terms, history=False, position=None, active_only=True, limit=50):
+        """
+        Returns the players whose injury designation/description match the search terms, best match first.
+        See injury_search_sql for the parameters.
+        """
+        return self.query('injury_search', *self.injury_search_sql(terms, history, position, active_only, limit))
+
+
+    def injury_search_sql(self, terms, history=False, position=None, active_only=True, limit=50):
+        """
+        Returns the (sql, params) of a ranked full-text search over the injury text (Player_Injury_Search, or
+        Player_History_Injury_Search for every recorded change). Words are stemmed, so 'hamstring' also matches
+        'hamstrings'. Matches are ranked by bm25, with the designation weighted above the description.
+
+        Parameters
+        ----------
+        terms : str or list of str
+            An FTS5 query (e.g., 'hamstring OR groin', 'knee NOT acl', 'concuss*'), or a list of words of which any
+            has to match (quoted, so user input can't break the query syntax).
+        history : bool
+            Search Player_History (one row per change, with its CHANGE_DATE) instead of the current Player rows.
+        position : str, optional
+            Position to filter on (QB, RB, WR, TE).
+        active_only : bool
+            Only players still in the league (Player.ACTIVE).
+        limit : int
+            Maximum number of matches.
+        """
+        if not isinstance(terms, str):
+            terms = ' OR '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+        search_table, source, source_id = ('Player_History_Injury_Search', 'Player_History', 'PLAYER_HISTORY_ID') if history else ('Player_Injury_Search', 'Player', 'PLAYER_ID')
+        sql = f"""
+            SELECT
+                s.PLAYER_ID,
+                {'s.CHANGE_DATE, ' if history else ''}s.FULL_NAME,
+                s.POSITION,
+                s.TEAM_ABBR,
+                t.CITY || ' ' || t.NICKNAME AS TEAM_NAME,
+                s.INJURY_DESIGNATION,
+                s.INJURY_DATE,
+                s.INJURY_DESCRIPTION,
+                highlight({search_table}, 1, '[', ']') AS MATCHED_TEXT,
+                ROUND(bm25({search_table}, 2.0, 1.0), 4) AS RANK
+            FROM {search_table}
+                INNER JOIN {source} s ON s.{source_id} = {search_table}.rowid
+                INNER JOIN Player p ON p.PLAYER_ID = s.PLAYER_ID
+                LEFT JOIN Team t ON t.ABBREVIATION = s.TEAM_ABBR
+            WHERE {search_table} MATCH ?
+        """
+        params = [terms]
+        if position is not None:
+            sql += " AND s.POSITION = ?"
+            params.append(position)
+        if active_only:
+            sql += " AND p.ACTIVE = 1"
+        # bm25 is negative, lower is a better match
+        sql += f" ORDER BY RANK{', s.CHANGE_DATE DESC' if history else ''} LIMIT ?"
+        params.append(int(limit))
+        return sql, params
+
+
+    def game_summary(self, game_id):
+        """
+        Returns a game's summary as a dict of DataFrames: 'game' (the Game row), 'teams' (both teams' stats) and
+        'players' (player stat lines, highest home league points first).
+        """
+        return {part: self.query(f"game_summary_{part}", sql, params) for part, (sql, params) in self.game_summary_sql(game_id).items()}
+
+
+    def game_summary_sql(self, game_id):
+        """
+        Returns the {part: (sql, params)} of a game's summary (see game_summary).
+        """
+        return {
+            'game': ("SELECT * FROM Game WHERE GAME_ID = ?", [game_id]),
+            'teams': ("SELECT * FROM Team_Game_Stats WHERE GAME_ID = ? ORDER BY HOME_OR_AWAY DESC", [game_id]),
+            'players': ("SELECT * FROM Player_Game_Stats WHERE GAME_ID = ? ORDER BY HOME_LEAGUE_PTS DESC", [game_id]),
+        }
@@ -1,9 +1,13 @@
-import pandas as pd
 from datetime import datetime
 from log_helper import NFL_Logging
-from scrape import Scrape
-from clean import Clean
-import sqlite3
+from db_helper import connect_writer, apply_migrations, insert_df, delete_games, analyze_tables, record_dead_letter, read_dead_letters, resolve_dead_letters, bump_data_version, SEASON_TABLES
+import importlib.util
+import argparse
+import json
+import os
+
+# pandas, selenium, requests and the pipeline classes are imported inside the functions that use them, so quick
+# commands (e.g., reset-db, rescore) don't pay their import time (see benchmarks/cold_start.py)
 
 # Temp saves df for testing purposes (so I don't need to re-run API call over and over)
 def save_df(df, filename):
@@ -11,6 +15,7 @@ def save_df(df, filename):
 
 # Load saved df for testing
 def load_local_df(filename):
+    import pandas as pd
     df = pd.read_csv('Test-DataFrames\\' + filename + '.csv', low_memory=False)
     return df
 
@@ -19,23 +24,207 @@ def load_local_df(filename):
 
 def etl_players(conn, cursor, scraper, cleaner, log):
     """ Scrape Players"""
+    from player_sync import PlayerSync
+
     players_df = scraper.scrape_players()
     players_df = cleaner.clean_players(players_df)
     # save_df(players_df, 'players_df')
     # players_df = load_local_df('players_df')
 
-    # Drop data in Player table > we do this to get rid of past players out of the league, and also changes to existing players
-    cursor.execute("DELETE FROM Player")
-    conn.commit() # update data deletion
-    log.info("Reset Players table in database")
-
-    players_df.to_sql('Player', conn, if_exists='append', index=False)
+    # Sync Player table > only new/changed players are written, players no longer in the league are soft-retired,
+    # and every change (e.g., injury designation) is appended to Player_History
+    players_df = cleaner.restore_column_types(players_df)
+    PlayerSync().sync(conn, players_df)
     log.info("Completed ETL process for players table. ")
-    conn.commit() # update players_df upload
+
+
+def extract_game(conn, game, schedule, scraper, cleaner, log):
+    """
+    Scrape and clean a single game into its table dataframes (restored to database dtypes).
+    Returns a dict of table name -> dataframe, or None if the game couldn't be scraped.
+    Fetches that still fail after retries are recorded in the Dead_Letter table (see replay_dead_letters).
+    """
+    import pandas as pd
+    from fetch_policy import FetchError
+
+    # Scrape individual game info & game time (originally not included)
+    try:
+        game_info_df = scraper.scrape_game_info(game)
+        game_time = scraper.scrape_game_time(game)
+    except FetchError as e:
+        game_schedule = schedule[schedule['gameID'] == game].iloc[0].to_dict()
+        record_dead_letter(conn, 'game', game, game_schedule, e.reason, e.attempts)
+        log.critical(f"Dead-lettered game {game}: {e}")
+        return None
+    if game_info_df is None:
+        return None
+
+    # Organize each game into their separate dataframes
+    game_data_df, home_team_data_df, away_team_data_df, players_stats_df = cleaner.organize_game_info_df(game_info_df)
+    # Add game week into game_data_df, we do this by merging it with data from the season df
+    game_data_df = game_data_df.merge(schedule[['gameID', 'gameWeek']], on='gameID', how='left')
+
+    # Add game time into game_data_df, and clean game_data_df
+    game_data_df['gameTime'] = game_time
+    game_data_df = cleaner.clean_game(game_data_df)
+
+    # Clean home & away team game stats for SQL load
+    home_team_data_df = cleaner.clean_team_game_stats(home_team_data_df)
+    away_team_data_df = cleaner.clean_team_game_stats(away_team_data_df)
+
+    # Clean player game stats
+    players_stats_df = cleaner.clean_player_game_stats(players_stats_df)
+
+    # Restore the compact dtypes from cleaning to int64/float64/str for the database load
+    game_frames = {
+        'Game': cleaner.restore_column_types(game_data_df),
+        'Team_Game_Stats': cleaner.restore_column_types(pd.concat([home_team_data_df, away_team_data_df], ignore_index=True)),
+        'Player_Game_Stats': cleaner.restore_column_types(players_stats_df),
+    }
+
+    # Scrape & clean weather data for particular game
+    weather_df = extract_weather(conn, game_data_df['HOME_TEAM'].iloc[0], game_data_df['GAME_DATE'].iloc[0], game_data_df['GAME_ID'].iloc[0], game_data_df['GAME_TIME'].iloc[0], scraper, cleaner, log)
+    if weather_df is not None:
+        game_frames['Weather'] = weather_df
+
+    return game_frames
+
+
+def extract_weather(conn, home_team, game_date, game_id, game_time, scraper, cleaner, log):
+    """
+    Scrape and clean a game's weather (restored to database dtypes). Returns None (and dead-letters the weather) if it
+    couldn't be scraped, the game is still loaded without it.
+    """
+    from fetch_policy import FetchError
+
+    try:
+        weather_df = scraper.scrape_weather_data(home_team, game_date, game_id)
+    except FetchError as e:
+        payload = {'home_team': home_team, 'game_date': game_date, 'game_id': game_id, 'game_time': game_time}
+        record_dead_letter(conn, 'weather', game_id, payload, e.reason, e.attempts)
+        log.critical(f"No weather data could be collected for {game_id}, dead-lettered: {e}")
+        return None
+
+    weather_df = cleaner.clean_weather_df(weather_df, game_time, game_date, home_team)
+    return cleaner.restore_column_types(weather_df)
+
+
+def load_games(conn, games_frames, validator, log):
+    """
+    Validate the cleaned dataframes of a batch of games and load the valid games in one transaction.
+    Games with any invalid row keep their existing rows in the database, and their invalid rows go to the Quarantine table.
+    Returns the list of loaded game IDs.
+    """
+    import pandas as pd
+
+    # Batch every game's rows per table so validation runs once over the whole season
+    frames = {}
+    for table in SEASON_TABLES:
+        table_frames = [game_frames[table] for game_frames in games_frames if table in game_frames]
+        if table_frames:
+            frames[table] = pd.concat(table_frames, ignore_index=True)
+    if 'Game' not in frames:
+        return []
+
+    valid_frames, quarantine_df = validator.validate(frames)
+    loaded_games = valid_frames['Game']['GAME_ID'].tolist()
+    # Games whose weather couldn't be scraped keep the weather they already have (if any)
+    weather_games = valid_frames['Weather']['GAME_ID'].unique().tolist() if 'Weather' in valid_frames else []
+
+    # Replace the loaded games' rows (removes possible duplicate entries for re-runs in pipeline and allows us to update throughout the season)
+    with conn:
+        delete_games(conn, loaded_games, tables=[table for table in SEASON_TABLES if table != 'Weather'])
+        delete_games(conn, weather_games, tables=['Weather'])
+        for table, df in valid_frames.items():
+            insert_df(conn, table, df)
+        insert_df(conn, 'Quarantine', quarantine_df)
+        resolve_dead_letters(conn, 'game', loaded_games)
+        resolve_dead_letters(conn, 'weather', weather_games)
+        bump_data_version(conn)
+    analyze_tables(conn)
+
+    log.info(f"Loaded {len(loaded_games)} games into Game, Player_Game_Stats, Team_Game_Stats, and Weather tables ({quarantine_df.loc[quarantine_df['TABLE_NAME'] != 'Weather', 'GAME_ID'].nunique()} games quarantined, {len(loaded_games) - len(weather_games)} without new weather)")
+    return loaded_games
+
+
+def load_weather(conn, weather_frames, validator, log):
+    """
+    Validate and load weather for games already in the database (used when replaying dead-lettered weather).
+    Returns the list of game IDs whose weather was loaded.
+    """
+    import pandas as pd
+
+    weather_df = pd.concat(weather_frames, ignore_index=True)
+    game_ids = weather_df['GAME_ID'].unique().tolist()
+    # Validate against the stored Game rows (so only the Weather rows get written)
+    game_df = pd.read_sql_query(f"SELECT * FROM Game WHERE GAME_ID IN ({','.join(['?'] * len(game_ids))})", conn, params=game_ids)
+
+    valid_frames, quarantine_df = validator.validate({'Game': game_df, 'Weather': weather_df})
+    weather_games = valid_frames['Weather']['GAME_ID'].unique().tolist()
+
+    with conn:
+        delete_games(conn, weather_games, tables=['Weather'])
+        insert_df(conn, 'Weather', valid_frames['Weather'])
+        insert_df(conn, 'Quarantine', quarantine_df)
+        resolve_dead_letters(conn, 'weather', weather_games)
+        bump_data_version(conn)
+    analyze_tables(conn, ['Weather'])
+
+    log.info(f"Loaded weather for {len(weather_games)} games ({quarantine_df['GAME_ID'].nunique()} games quarantined)")
+    return weather_games
+
+
+def replay_dead_letters(conn, scraper, cleaner, log):
+    """
+    Retry only the game/weather fetches in the Dead_Letter table (instead of re-running the whole season).
+    Items that fail again stay in the table with their attempts increased.
+    """
+    import pandas as pd
+    from validate import Validate
+    from stat_cube import StatCube
+    from player_comps import PlayerComps
+    from league_scoring import LeagueScorer
+    from team_game_context import TeamGameContext
+
+    dead_letters = read_dead_letters(conn)
+    log.info(f"Replaying {len(dead_letters)} dead-lettered fetches")
+
+    # Games > re-run the normal game extract & load with the stored schedule row
+    games_frames = []
+    for _, dead_letter in dead_letters[dead_letters['ITEM_TYPE'] == 'game'].iterrows():
+        schedule = pd.DataFrame([json.loads(dead_letter['PAYLOAD'])])
+        game_frames = extract_game(conn, dead_letter['ITEM_KEY'], schedule, scraper, cleaner, log)
+        if game_frames is not None:
+            games_frames.append(game_frames)
+    loaded_games = load_games(conn, games_frames, Validate(), log)
+
+    # Weather > only re-scrape weather for games that are already loaded (a game replayed above brought its own weather)
+    weather_frames = []
+    for _, dead_letter in dead_letters[dead_letters['ITEM_TYPE'] == 'weather'].iterrows():
+        if dead_letter['ITEM_KEY'] in loaded_games:
+            continue
+        payload = json.loads(dead_letter['PAYLOAD'])
+        weather_df = extract_weather(conn, payload['home_team'], payload['game_date'], payload['game_id'], payload['game_time'], scraper, cleaner, log)
+        if weather_df is not None:
+            weather_frames.append(weather_df)
+    weather_games = load_weather(conn, weather_frames, Validate(), log) if weather_frames else []
+
+    # Refresh the memory-mapped stat cube, the player comps, the league scores and the schedule context with the games we just loaded
+    StatCube().update(conn, loaded_games)
+    PlayerComps().update(conn, loaded_games)
+    LeagueScorer().sync(conn, loaded_games)
+    TeamGameContext().update(conn, loaded_games)
+    log.info(f"Replayed dead letters: {len(loaded_games)} games and weather for {len(weather_games)} games loaded")
 
 
 def etl_seasons_game_data(conn, cursor, year, scraper, cleaner, log):
     """ Scrape schedule for the given year"""
+    from validate import Validate
+    from stat_cube import StatCube
+    from player_comps import PlayerComps
+    from league_scoring import LeagueScorer
+    from team_game_context import TeamGameContext
+
     schedule = scraper.scrape_nfl_schedule(year)
 
     # save_df(schedule, 'schedule')
@@ -45,89 +234,145 @@ def etl_seasons_game_data(conn, cursor, year, scraper, cleaner, log):
     # with open('2022-games.txt', 'r') as file:
     #     games_list = file.read().splitlines()
 
-    # Drop entries in the tables from current year (removes possible duplicate entries for re-runs in pipeline and allows us to update throughout the season)
-    cursor.execute("DELETE FROM Game WHERE GAME_ID IN ({seq})".format(seq=','.join(['?']*len(games_list))), games_list)
-    cursor.execute("DELETE FROM Player_Game_Stats WHERE GAME_ID IN ({seq})".format(seq=','.join(['?']*len(games_list))), games_list)
-    cursor.execute("DELETE FROM Team_Game_Stats WHERE GAME_ID IN ({seq})".format(seq=','.join(['?']*len(games_list))), games_list)
-    cursor.execute("DELETE FROM Weather WHERE GAME_ID IN ({seq})".format(seq=','.join(['?']*len(games_list))), games_list)
-
-    conn.commit()
-    log.info("Reset Game, Player_Game_Stats, Team_Game_Stats, and Weather table in database")
-
-    # with open('games_list_subset.txt', 'r') as file:
-    #     games_list = file.read().splitlines()
-
     """ 
     Scrape game info for the year's games 
     - Cycle through each game in list > then clean up the entire games df (this df contains all player/team/stat/etc. data) 
         - Need to break it down separately as it gets super messy (+10,000 lines)
     - Extract into separate general game info, player stats, and home/away team stats
+    - Nothing is written until every game is scraped, then the season is validated and loaded in one transaction
     """
+    games_frames = []
     for game in games_list:
-        # Scrape individual game info
-        game_info_df = scraper.scrape_game_info(game)
+        game_frames = extract_game(conn, game, schedule, scraper, cleaner, log)
+        if game_frames is not None:
+            games_frames.append(game_frames)
+            log.info(f"Extracted {game} for load")
+
+    loaded_games = load_games(conn, games_frames, Validate(), log)
+    log.info(f"Completed ETL process for {len(loaded_games)} of {len(games_list)} games in {year}")
+
+    # Refresh the memory-mapped stat cube, the player comps, the league scores and the schedule context with the games we just (re)loaded
+    StatCube().update(conn, loaded_games)
+    PlayerComps().update(conn, loaded_games)
+    LeagueScorer().sync(conn, loaded_games)
+    TeamGameContext().update(conn, loaded_games)
+    log.info("Updated stat cube, player comps, league scores and team game context for the season's games")
+
+
+
+
+def etl_single_game(conn, game_id, scraper, cleaner, log):
+    """ Refresh a single game (e.g., a stat correction) without re-running its season """
+    from validate import Validate
+    from stat_cube import StatCube
+    from player_comps import PlayerComps
+    from league_scoring import LeagueScorer
+    from team_game_context import TeamGameContext
+
+    # Season of the game from its ID (YYYYMMDD_AWAY@HOME), January/February games belong to the previous season
+    game_date = datetime.strptime(game_id[:8], '%Y%m%d')
+    season = game_date.year - (game_date.month < 3)
+
+    # The schedule holds the game's week
+    schedule = scraper.scrape_nfl_schedule(season)
+    schedule = schedule[schedule['gameID'] == game_id]
+    if schedule.empty:
+        log.critical(f"Game {game_id} isn't on the {season} schedule")
+        print(f"Game {game_id} isn't on the {season} schedule")
+        return []
+
+    game_frames = extract_game(conn, game_id, schedule, scraper, cleaner, log)
+    loaded_games = load_games(conn, [game_frames] if game_frames is not None else [], Validate(), log)
+    StatCube().update(conn, loaded_games)
+    PlayerComps().update(conn, loaded_games)
+    LeagueScorer().sync(conn, loaded_games)
+    TeamGameContext().update(conn, loaded_games)
+    return loaded_games
+
+
+def rescore_player_game_stats(conn, cleaner, log, season=None):
+    """
+    Recalculate the fantasy points of stored player game stats with the current fantasy_scoring.json (no scraping).
+    Returns the number of rescored rows.
+    """
+    import pandas as pd
+    from stat_cube import StatCube
+    from player_comps import PlayerComps
+    from league_scoring import LeagueScorer
+
+    query = "SELECT pgs.* FROM Player_Game_Stats pgs INNER JOIN Game g ON g.GAME_ID = pgs.GAME_ID"
+    params = []
+    if season is not None:
+        query += " WHERE g.SEASON_ID = ?"
+        params.append(str(season))
+    stats_df = pd.read_sql_query(query, conn, params=params)
+    # Same numeric types (NULL stats > 0) as when the rows were first cleaned
+    stats_df = cleaner.convert_column_types(stats_df, cleaner.player_game_df_to_player_game_table_datatypes)
+
+    platforms = ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']
+    stats_df = cleaner.add_fantasy_points(stats_df)
+
+    rows = stats_df[platforms + ['PLAYER_GAME_ID']].astype(object).values.tolist()
+    with conn:
+        conn.executemany(f"UPDATE Player_Game_Stats SET {', '.join(f'{platform} = ?' for platform in platforms)} WHERE PLAYER_GAME_ID = ?", rows)
+        bump_data_version(conn)
+
+    # Fantasy points are part of the stat cube and the player comps
+    StatCube().update(conn, stats_df['GAME_ID'].unique().tolist())
+    PlayerComps().update(conn, stats_df['GAME_ID'].unique().tolist())
+    # Leagues whose rules changed (e.g., the fantasy_scoring.json platforms) are rescored in full
+    LeagueScorer().sync(conn, [])
+    log.info(f"Rescored fantasy points of {len(rows)} player game stats")
+    return len(rows)
+
+
+def rescore_team_game_stats(conn, cleaner, log, season=None):
+    """
+    Recalculate the team defense (DST) fantasy points of stored team game stats with the current fantasy_scoring.json,
+    scored vectorized over every team game at once (no scraping). Returns the number of rescored rows.
+    """
+    import pandas as pd
+
+    query = "SELECT tgs.* FROM Team_Game_Stats tgs INNER JOIN Game g ON g.GAME_ID = tgs.GAME_ID"
+    params = []
+    if season is not None:
+        query += " WHERE g.SEASON_ID = ?"
+        params.append(str(season))
+    team_game_df = pd.read_sql_query(query, conn, params=params)
+
+    platforms = ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']
+    for platform in platforms:
+        team_game_df[platform] = cleaner.calculate_dst_points(team_game_df, platform)
+
+    rows = team_game_df[platforms + ['TEAM_GAME_ID']].astype(object).values.tolist()
+    with conn:
+        conn.executemany(f"UPDATE Team_Game_Stats SET {', '.join(f'{platform} = ?' for platform in platforms)} WHERE TEAM_GAME_ID = ?", rows)
+        bump_data_version(conn)
+
+    log.info(f"Rescored DST fantasy points of {len(rows)} team game stats")
+    return len(rows)
+
+
+def connect(log):
+    """ Open the database (WAL mode, see db_helper.connect_writer) and bring it up to the current schema """
+    conn = connect_writer('nfl_fantasy.db')
+    apply_migrations(conn, log)
+    return conn
+
+
+def run_pipeline(year=None, players=True, dry_run=False, vacuum=False):
+    from scrape import Scrape
+    from clean import Clean
 
-        if game_info_df is not None:
-            # Organize each game into their separate dataframes
-            game_data_df, home_team_data_df, away_team_data_df, players_stats_df = cleaner.organize_game_info_df(game_info_df)
-            # Add game week into game_data_df, we do this by merging it with data from the season df
-            game_data_df = game_data_df.merge(schedule[['gameID', 'gameWeek']], on='gameID', how='left')
-            
-            # Scrape game time into game_data_df (originally not included), and clean game_data_df
-            game_data_df['gameTime'] = scraper.scrape_game_time(game_data_df['gameID'].iloc[0])
-            game_data_df = cleaner.clean_game(game_data_df)
-
-            # Clean home & away team game stats for SQL load
-            home_team_data_df = cleaner.clean_team_game_stats(home_team_data_df)
-            away_team_data_df = cleaner.clean_team_game_stats(away_team_data_df)
-
-            # Clean player game stats
-            players_stats_df = cleaner.clean_player_game_stats(players_stats_df)
-
-            # Scrape & clean weather data for particular game
-            weather_df = scraper.scrape_weather_data(game_data_df['HOME_TEAM'].iloc[0], game_data_df['GAME_DATE'].iloc[0], game_data_df['GAME_ID'].iloc[0])
-            weather_df = cleaner.clean_weather_df(weather_df, game_data_df['GAME_TIME'].iloc[0])
-            # No weather data was able to get collected
-            if not isinstance(weather_df, pd.DataFrame):
-                log.critical(f"No weather data could be collected for {game_data_df["GAME_ID"].iloc[0]}")
-                weather_flag = False
-            else:
-                weather_flag = True
-
-            # save_df(game_data_df, 'game_data_df')
-            # save_df(home_team_data_df, 'home_team_data_df')
-            # save_df(away_team_data_df, 'away_team_data_df')
-            # save_df(players_stats_df, 'players_stats_df')
-            # save_df(weather_df, 'weather_df')
-
-            # game_data_df = load_local_df('game_data_df')
-            # home_team_data_df = load_local_df('home_team_data_df')
-            # away_team_data_df = load_local_df('away_team_data_df')
-            # players_stats_df = load_local_df('players_stats_df')
-            # weather_df = load_local_df('weather_df')
-
-            # load dfs to individual tables
-            game_data_df.to_sql('Game', conn, if_exists='append', index=False)
-            home_team_data_df.to_sql('Team_Game_Stats', conn, if_exists='append', index=False)
-            away_team_data_df.to_sql('Team_Game_Stats', conn, if_exists='append', index=False)
-            players_stats_df.to_sql('Player_Game_Stats', conn, if_exists='append', index=False)
-            if weather_flag:
-                weather_df.to_sql('Weather', conn, if_exists='append', index=False)
-            conn.commit()
-            log.info(f"Completed ETL process for {game_data_df["GAME_ID"].iloc[0]}")
-                   
-
-
-def run_pipeline(year=None):
     scraper = Scrape()
     cleaner = Clean()
     log = NFL_Logging()
+    if dry_run:
+        return
     log.reset_log_file()
-    
-    conn = sqlite3.connect('nfl_fantasy.db')
-    cursor = conn.cursor()
-
 
+    conn = connect(log)
+    cursor = conn.cursor()
 
     # If no year specified, run for current year (season)
     if year is None:
@@ -136,23 +381,176 @@ def run_pipeline(year=None):
     print(f"Running pipeline for the year: {year}")
     log.info(f"Running pipeline for the year: {year}")
 
-    etl_players(conn, cursor, scraper, cleaner, log)
+    if players:
+        etl_players(conn, cursor, scraper, cleaner, log)
     etl_seasons_game_data(conn, cursor, year, scraper, cleaner, log)
 
+    if vacuum:
+        # Rewrite the file without the free pages left behind by the replaced rows
+        conn.execute("VACUUM")
+        log.info("Vacuumed nfl_fantasy.db")
+
     print(f"Completed pipeline for the year: {year}")
     log.info(f"Completed pipeline for the year: {year}\n\t")
 
+    conn.close()
+
+
+def command_players(args, log):
+    from scrape import Scrape
+    from clean import Clean
+
+    scraper = Scrape()
+    cleaner = Clean()
+    if args.dry_run:
+        return
+
+    conn = connect(log)
+    etl_players(conn, conn.cursor(), scraper, cleaner, log)
+    conn.close()
+    print("Completed ETL process for players table")
+
+
+def command_season(args, log):
+    for year in args.years or [None]:
+        run_pipeline(year, players=not args.skip_players, dry_run=args.dry_run, vacuum=args.vacuum)
+
+
+def command_game(args, log):
+    from scrape import Scrape
+    from clean import Clean
+
+    scraper = Scrape()
+    cleaner = Clean()
+    if args.dry_run:
+        return
+
+    conn = connect(log)
+    loaded_games = etl_single_game(conn, args.game_id, scraper, cleaner, log)
+    conn.close()
+    print(f"Refreshed {args.game_id}" if loaded_games else f"Could not refresh {args.game_id} (see logs)")
+
+
+def command_rescore(args, log):
+    # Only needs pandas (through Clean), no scraping
+    from clean import Clean
+
+    cleaner = Clean()
+    if args.dry_run:
+        return
+
+    conn = connect(log)
+    rescored = rescore_player_game_stats(conn, cleaner, log, args.season)
+    rescored_teams = rescore_team_game_stats(conn, cleaner, log, args.season)
+    conn.close()
+    print(f"Rescored fantasy points of {rescored} player game stats and {rescored_teams} team game stats")
+
+
+def command_score_leagues(args, log):
+    # Only needs pandas/numpy, no scraping
+    from league_scoring import LeagueScorer
+
+    scorer = LeagueScorer()
+    if args.dry_run:
+        return
 
+    conn = connect(log)
+    written = scorer.sync(conn, None if args.all else [])
     conn.close()
+    print(f"Wrote {written} league scores for {len(scorer.league_ids)} leagues")
 
 
-def main():
-    nfl_seasons = [2024]
+def command_team_context(args, log):
+    # Only needs pandas, no scraping
+    from team_game_context import TeamGameContext
 
-    for year in nfl_seasons:
-        run_pipeline(year)
+    context = TeamGameContext()
+    if args.dry_run:
+        return
 
+    conn = connect(log)
+    context.update(conn)
+    conn.close()
+    print("Rebuilt Team_Game_Context for every season")
+
+
+def command_replay(args, log):
+    from scrape import Scrape
+    from clean import Clean
+
+    scraper = Scrape()
+    cleaner = Clean()
+    if args.dry_run:
+        return
+
+    conn = connect(log)
+    print("Replaying dead-lettered fetches")
+    replay_dead_letters(conn, scraper, cleaner, log)
+    print("Completed replay of dead-lettered fetches")
+    conn.close()
+
+
+def command_reset_db(args, log):
+    # reset_db.py lives in 'Standard DB Queries' (not an importable package name), load it from its path
+    reset_db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Standard DB Queries', 'reset_db.py')
+    spec = importlib.util.spec_from_file_location('reset_db', reset_db_path)
+    reset_db = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(reset_db)
+    if args.dry_run:
+        return
+
+    if not args.yes:
+        print("reset-db drops every table in nfl_fantasy.db, re-run with --yes to confirm")
+        return
+    reset_db.main('nfl_fantasy.db')
+    log.info("Reset nfl_fantasy.db to an empty database")
+    print("Reset nfl_fantasy.db to an empty database")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="NFL fantasy data pipeline")
+    parser.add_argument('--dry-run', action='store_true', help="Load the command's modules and config, then exit without running it (see benchmarks/cold_start.py)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    players = commands.add_parser('players', help="Scrape and sync the Player table")
+    players.set_defaults(handler=command_players)
+
+    season = commands.add_parser('season', help="Run the full pipeline (players + every game) for seasons")
+    season.add_argument('years', nargs='*', type=int, help="Seasons to run (default: current year)")
+    season.add_argument('--skip-players', action='store_true', help="Don't sync the Player table first")
+    season.add_argument('--vacuum', action='store_true', help="VACUUM the database after the load to reclaim space from replaced rows")
+    season.set_defaults(handler=command_season)
+
+    game = commands.add_parser('game', help="Refresh a single game")
+    game.add_argument('game_id', help="Game ID, e.g., 20231015_DET@TB")
+    game.set_defaults(handler=command_game)
+
+    rescore = commands.add_parser('rescore', help="Recalculate fantasy points from fantasy_scoring.json (no scraping)")
+    rescore.add_argument('--season', type=int, help="Only rescore one season")
+    rescore.set_defaults(handler=command_rescore)
+
+    score_leagues = commands.add_parser('score-leagues', help="Score player games in every league of fantasy_scoring.json and leagues/*.json into Player_Game_Score")
+    score_leagues.add_argument('--all', action='store_true', help="Rescore every league (default: only new leagues and leagues whose rules changed)")
+    score_leagues.set_defaults(handler=command_score_leagues)
+
+    team_context = commands.add_parser('team-context', help="Rebuild Team_Game_Context for every season (e.g., after editing neutral_sites in config.json)")
+    team_context.set_defaults(handler=command_team_context)
+
+    replay = commands.add_parser('replay', help="Retry the fetches in the Dead_Letter table")
+    replay.set_defaults(handler=command_replay)
+
+    reset_db = commands.add_parser('reset-db', help="Drop and recreate every table (empty database)")
+    reset_db.add_argument('--yes', action='store_true', help="Confirm dropping every table")
+    reset_db.set_defaults(handler=command_reset_db)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    log = NFL_Logging()
+    args.handler(args, log)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,18 +1,14 @@
 import requests
 import pandas as pd
 import os
-import inspect
 import json
+import inspect
 from dotenv import load_dotenv
 from log_helper import NFL_Logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from config_helper import load_config
+from fetch_policy import FetchPolicy, FetchError
 from io import StringIO
 import pandas as pd
-import json
 from datetime import datetime, timedelta
 import time
 
@@ -31,13 +27,35 @@ class Scrape:
         self.params = ""
 
         # open json dict defining weather scrape details
-        with open('config.json') as f:
-            config = json.load(f)
+        config = load_config()
         self.team_data_map = config['Weather_Table_Mapping']
 
+        # Raw payloads can be archived per game, to replay them through Clean later (see shadow.py)
+        self.payload_dir = config['Payload_Archive']['directory'] if config['Payload_Archive']['enabled'] else None
+
         # Counter to assist in recording API inquirys (to help keep track of limit while pipeline running. )
         self.api_request_count = 0
 
+        # Retries with backoff and per-host circuit breaking for every API request/weather page load
+        self.fetch_policy = FetchPolicy()
+
+
+    def archive_payload(self, game_id, filename, content):
+        """
+        Saves a raw payload of a game to '<Payload_Archive directory>/<game_id>/<filename>' (if archiving is enabled in 'config.json').
+
+        Args:
+            game_id (str): The game the payload belongs to.
+            filename (str): 'box_score.json', 'game_time.txt' or 'weather.html'.
+            content (str): The payload.
+        """
+        if self.payload_dir is None:
+            return
+        game_dir = os.path.join(self.payload_dir, game_id)
+        os.makedirs(game_dir, exist_ok=True)
+        with open(os.path.join(game_dir, filename), 'w', encoding='utf-8') as file:
+            file.write(content)
+
 
     def check_api_count(self):
         """
@@ -63,6 +81,24 @@ class Scrape:
             self.api_request_count = 0
 
 
+    def count_api_request(self):
+        """
+        Counts a single API request (called before every attempt, so retries count towards the daily limit too).
+        """
+        self.api_request_count += 1 # Increase API Count
+        self.check_api_count()  # Check if we've hit max queries for today
+
+
+    def api_get(self, query):
+        """
+        Sends a GET request to the API with the current headers/params under the fetch policy.
+
+        Raises:
+            FetchError: If the request still failed after retries (or the API's circuit is open).
+        """
+        return self.fetch_policy.get(query, headers=self.headers, params=self.params, on_attempt=self.count_api_request)
+
+
     def scrape_players(self):
         """
         Scrapes player data from the NFL API and returns it as a pandas DataFrame.
@@ -93,9 +129,7 @@ class Scrape:
             self.endpoint = "getNFLPlayerList"
             query = self.api_base_url + self.endpoint
             # get response and convert to pd dataframe
-            response = requests.get(query, headers=self.headers, params=self.params)
-            self.api_request_count += 1 # Increase API Count
-            self.check_api_count()  # Check if we've hit max queries for today
+            response = self.api_get(query)
 
             data = response.json().get('body', {})
             players_df = pd.json_normalize(data)
@@ -126,7 +160,7 @@ class Scrape:
             self.log.info(f"Successfully scraped players dataframe from: {query}")
             return players_df
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, FetchError) as e:
             self.log.critical(f"Failed to retrieve data at {query}: {str(e)}")
 
 
@@ -165,9 +199,7 @@ class Scrape:
                 "season": year,         # Specify what season from year param
             }
             # get response and convert to pd dataframe
-            response = requests.get(query, headers=self.headers, params=self.params)
-            self.api_request_count += 1 # Increase API Count
-            self.check_api_count()  # Check if we've hit max queries for today
+            response = self.api_get(query)
 
             data = response.json().get('body', {})
             season_games_df = pd.json_normalize(data)
@@ -191,7 +223,7 @@ class Scrape:
             self.log.info(f"Successfully scraped {year} season schedule dataframe from: {query}")
             return season_games_df
         
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, FetchError) as e:
             self.log.critical(f"Failed to retrieve data at {query}: {str(e)}")
 
 
@@ -209,7 +241,7 @@ class Scrape:
             pandas.DataFrame: A DataFrame containing detailed information about the specified game.
 
         Raises:
-            requests.exceptions.RequestException: If the API request fails or there is an error in retrieving data.
+            FetchError: If the API request still fails after retries or the response can't be read.
 
         Examples:
             >>> scraper = Scrape()
@@ -228,19 +260,24 @@ class Scrape:
                 "fantasyPoints": "false"
             }
             # get response and convert to pd dataframe
-            response = requests.get(query, headers=self.headers, params=self.params)
-            self.api_request_count += 1 # Increase API Count
-            self.check_api_count()  # Check if we've hit max queries for today
+            response = self.api_get(query)
 
             data = response.json().get('body', {})
+            self.archive_payload(game, 'box_score.json', json.dumps(data))
             game_info_df = pd.json_normalize(data)
 
             # return scraped and filtered dataframe
             self.log.info(f"Successfully scraped [{game}] game information dataframe from: {query}")
             return game_info_df
         
+        except FetchError as e:
+            # Raise so the pipeline can dead-letter the game (see replay_dead_letters in run_pipeline.py)
+            self.log.critical(f"Failed to retrieve data at {query}: {str(e)}")
+            raise
         except requests.exceptions.RequestException as e:
+            # Response came back but couldn't be read (e.g., invalid JSON)
             self.log.critical(f"Failed to retrieve data at {query}: {str(e)}")
+            raise FetchError(query, f"{type(e).__name__}: {e}", attempts=1) from e
 
 
     def scrape_game_time(self, game_id):
@@ -257,7 +294,7 @@ class Scrape:
             str: The start time of the specified NFL game.
 
         Raises:
-            requests.exceptions.RequestException: If the API request fails or there is an error in retrieving data.
+            FetchError: If the API request still fails after retries or the response can't be read.
 
         Examples:
             >>> scraper = Scrape()
@@ -274,9 +311,7 @@ class Scrape:
                 'topPerformers': "false"
             }
             # get response and convert to pd dataframe
-            response = requests.get(query, headers=self.headers, params=self.params)
-            self.api_request_count += 1 # Increase API Count
-            self.check_api_count()  # Check if we've hit max queries for today
+            response = self.api_get(query)
             
             data = response.json().get('body', {})
             temp_df = pd.json_normalize(data)
@@ -297,12 +332,19 @@ class Scrape:
 
             # Format the time string
             game_time = f"{time_str} {period_str}"
+            self.archive_payload(game_id, 'game_time.txt', game_time)
             # return scraped and filtered dataframe
             self.log.info(f"Successfully scraped [{game_id}] start time from: {query}")
             return game_time
         
+        except FetchError as e:
+            # Raise so the pipeline can dead-letter the game (see replay_dead_letters in run_pipeline.py)
+            self.log.critical(f"Failed to retrieve data at {query}: {str(e)}")
+            raise
         except requests.exceptions.RequestException as e:
+            # Response came back but couldn't be read (e.g., invalid JSON)
             self.log.critical(f"Failed to retrieve data at {query}: {str(e)}")
+            raise FetchError(query, f"{type(e).__name__}: {e}", attempts=1) from e
 
 
     def scrape_weather_data(self, home_team, game_date, game_id):
@@ -315,41 +357,58 @@ class Scrape:
         Returns:
             pandas.DataFrame: A DataFrame containing information about weather at specific location
         Raises:
-            requests.exceptions.RequestException: If there is an error in retrieving data.
+            FetchError: If the page still couldn't be scraped after retries (or the site's circuit is open).
 
         Examples:
             >>> scraper = Scrape()
-            >>> df = scraper.scrape_weather_data('LV', '08-04-2022', '20220804_JAX@LV')
+            >>> df = scraper.scrape_weather_data('LV', '2022-08-04', '20220804_JAX@LV')
             >>> print(df.head(1))
                         GAME_ID      Time Temperature Dew Point Humidity  Wind Wind Speed Wind Gust   Pressure  Precip.                Condition
             0   20220804_JAX@LV  12:53 AM       94 °F     55 °F    27 °%     N     5 °mph    0 °mph  27.54 °in  0.0 °in                     Fair
         """
         self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
-        try:
-            # Define parameters for URL query
-            state_abbr = self.team_data_map[home_team]['state']
-            city = self.team_data_map[home_team]['city']
-            formatted_date = datetime.strptime(game_date, '%m-%d-%Y').strftime('%Y-%m-%d')
-            url = f"https://www.wunderground.com/history/daily/us/{state_abbr}/{city}/date/{formatted_date}"
-
-            # Define chrome driver and run request (run headless)
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--disable-gpu")  # Disable GPU for headless mode
-            chrome_options.add_argument("--no-sandbox")  # Bypass OS security model
-            chrome_options.add_argument("--disable-dev-shm-usage")  # Overcome limited resource problems
-            chrome_options.add_argument("window-size=1920x1080")  # Set window size to avoid issues
-        
+        # Selenium is only imported when weather is scraped (keeps it out of the startup of every other command)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import WebDriverException
+
+        # Define parameters for URL query
+        state_abbr = self.team_data_map[home_team]['state']
+        city = self.team_data_map[home_team]['city']
+        formatted_date = game_date # Already YYYY-MM-DD (see Clean.format_date)
+        url = f"https://www.wunderground.com/history/daily/us/{state_abbr}/{city}/date/{formatted_date}"
+
+        # Define chrome driver options (run headless)
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")  # Disable GPU for headless mode
+        chrome_options.add_argument("--no-sandbox")  # Bypass OS security model
+        chrome_options.add_argument("--disable-dev-shm-usage")  # Overcome limited resource problems
+        chrome_options.add_argument("window-size=1920x1080")  # Set window size to avoid issues
+
+        def fetch():
             driver = webdriver.Chrome(options=chrome_options)
-            driver.get(url)
+            try:
+                driver.get(url)
+                # Scrape for tables, and get second table (daily observations table)
+                web_page_tables = WebDriverWait(driver,20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table")))
+                return web_page_tables[1].get_attribute('outerHTML')
+            finally:
+                driver.quit()
 
-            # Scrape for tables, and get second table (daily observations table)
-            web_page_tables = WebDriverWait(driver,20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table")))
-            daily_obs_html = web_page_tables[1].get_attribute('outerHTML')
+        try:
+            # Page loads that time out (TimeoutException is a WebDriverException) or are missing the observations table are retried
+            daily_obs_html = self.fetch_policy.run(url, fetch, retry_exceptions=(WebDriverException, IndexError, AttributeError))
+            self.archive_payload(game_id, 'weather.html', daily_obs_html)
             daily_obs_df = pd.read_html(StringIO(daily_obs_html))[0]
             daily_obs_df.insert(0, 'GAME_ID', game_id)
             self.log.info(f"Successfully scraped weather data for [{game_id}] from: {url}")
             return daily_obs_df
-        
-        except (requests.exceptions.RequestException, IndexError, AttributeError) as e:
-            self.log.critical(f"Failed to retrieve data at {url}: {str(e)}")
\ No newline at end of file
+
+        except FetchError as e:
+            # Raise so the pipeline can dead-letter the weather (see replay_dead_letters in run_pipeline.py)
+            self.log.critical(f"Failed to retrieve data at {url}: {str(e)}")
+            raise
@@ -0,0 +1,264 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from clean import Clean
+from log_helper import NFL_Logging
+
+
+class Shadow:
+    """
+    Class used to run the legacy and the fast path implementation of Clean's stages side by side over archived payloads
+    (see Scrape.archive_payload) and diff their output frames column by column, so a fast path can be switched on in
+    the Clean_Fast_Paths section of 'config.json' once it matches over whole seasons.
+
+    Every stage gets the same input (taken from the legacy implementation of the previous stage), values are compared
+    with a tolerance for numeric columns and exactly for everything else (dtypes aren't compared, they are normalized
+    by restore_column_types before loading).
+
+    Examples:
+        >>> python shadow.py Payloads --games "2023*" --workers 8
+    """
+
+    def __init__(self, fast_paths=Clean.FAST_PATHS, rtol=1e-9, atol=1e-6):
+        """
+        Initializes the Shadow class.
+
+        Parameters
+        ----------
+        fast_paths : iterable of str
+            Fast paths to compare against the legacy implementation (default every fast path in Clean.FAST_PATHS).
+        rtol, atol : float
+            Relative and absolute tolerance for numeric columns (see numpy.isclose).
+        """
+        self.log = NFL_Logging()
+        self.legacy = Clean(fast_paths=())
+        self.fast = Clean(fast_paths=fast_paths)
+        self.rtol = rtol
+        self.atol = atol
+
+
+    def load_payload(self, game_dir):
+        """
+        Reads a game's archived payloads the way Scrape parses them.
+
+        Returns
+        -------
+        dict
+            'game_info_df' (json-normalized box score), 'game_time' (str or None) and 'weather_df' (DataFrame or None).
+        """
+        game_id = os.path.basename(os.path.normpath(game_dir))
+        with open(os.path.join(game_dir, 'box_score.json'), 'r', encoding='utf-8') as file:
+            payload = {'game_info_df': pd.json_normalize(json.load(file)), 'game_time': None, 'weather_df': None}
+
+        game_time_path = os.path.join(game_dir, 'game_time.txt')
+        if os.path.exists(game_time_path):
+            with open(game_time_path, 'r', encoding='utf-8') as file:
+                payload['game_time'] = file.read().strip()
+
+        weather_path = os.path.join(game_dir, 'weather.html')
+        if os.path.exists(weather_path):
+            with open(weather_path, 'r', encoding='utf-8') as file:
+                weather_df = pd.read_html(StringIO(file.read()))[0]
+            weather_df.insert(0, 'GAME_ID', game_id)
+            payload['weather_df'] = weather_df
+
+        return payload
+
+
+    def run_stage(self, function, *args):
+        """ Runs a stage on copies of its inputs, returns (output, seconds) or (exception, None) if it raised. """
+        args = [arg.copy() if isinstance(arg, pd.DataFrame) else arg for arg in args]
+        start = time.perf_counter()
+        try:
+            output = function(*args)
+        except Exception as e:
+            return e, None
+        return output, time.perf_counter() - start
+
+
+    def run_game(self, game_dir):
+        """
+        Runs every stage of a game through both implementations.
+
+        Returns
+        -------
+        list of dict
+            One result per stage: GAME_ID, STAGE, LEGACY_SECONDS, FAST_SECONDS, MISMATCHES (number of differing
+            columns/frames) and DETAILS (description of each difference).
+        """
+        game_id = os.path.basename(os.path.normpath(game_dir))
+        try:
+            payload = self.load_payload(game_dir)
+        except (OSError, ValueError) as e:
+            return [{'GAME_ID': game_id, 'STAGE': 'load_payload', 'LEGACY_SECONDS': None, 'FAST_SECONDS': None, 'MISMATCHES': 1, 'DETAILS': [f"Couldn't read payload: {e}"]}]
+
+        results = []
+        def compare_stage(stage, legacy_call, fast_call, args, frame_names):
+            legacy_output, legacy_seconds = self.run_stage(legacy_call, *args)
+            fast_output, fast_seconds = self.run_stage(fast_call, *args)
+            if legacy_seconds is None or fast_seconds is None:
+                details = [f"{name} raised {type(output).__name__}: {output}" for name, output in [('legacy', legacy_output), ('fast', fast_output)] if isinstance(output, Exception)]
+            else:
+                legacy_frames = legacy_output if isinstance(legacy_output, tuple) else (legacy_output,)
+                fast_frames = fast_output if isinstance(fast_output, tuple) else (fast_output,)
+                details = [detail for name, legacy_df, fast_df in zip(frame_names, legacy_frames, fast_frames) for detail in self.compare_frames(legacy_df, fast_df, name)]
+            results.append({'GAME_ID': game_id, 'STAGE': stage, 'LEGACY_SECONDS': legacy_seconds, 'FAST_SECONDS': fast_seconds, 'MISMATCHES': len(details), 'DETAILS': details})
+            return legacy_output if legacy_seconds is not None else None
+
+        game_info_df = payload['game_info_df']
+        organized = compare_stage('organize_game_info_df', self.legacy.organize_game_info_df, self.fast.organize_game_info_df,
+                                  [game_info_df], ['game', 'home_team', 'away_team', 'players'])
+        if organized is None:
+            return results
+
+        players_df = organized[3].rename(columns=self.legacy.player_game_df_to_player_game_table_map)
+        column_types = self.legacy.player_game_df_to_player_game_table_datatypes
+        converted_df = compare_stage('convert_column_types', lambda df: self.legacy.convert_column_types(df, column_types),
+                                     lambda df: self.fast.convert_column_types(df, column_types), [players_df], ['players'])
+
+        if converted_df is not None:
+            compare_stage('calculate_fantasy_points', self.legacy.add_fantasy_points, self.fast.add_fantasy_points, [converted_df], ['players'])
+
+        if payload['weather_df'] is not None and payload['game_time'] is not None:
+            game_date = self.legacy.format_date(str(game_info_df['gameDate'].iloc[0]))
+            home_team = game_info_df['home'].iloc[0]
+            compare_stage('clean_weather_df', lambda df: self.legacy.clean_weather_df(df, payload['game_time'], game_date, home_team),
+                          lambda df: self.fast.clean_weather_df(df, payload['game_time'], game_date, home_team), [payload['weather_df']], ['weather'])
+
+        return results
+
+
+    def compare_frames(self, legacy_df, fast_df, name):
+        """
+        Diffs two frames column by column.
+
+        Returns
+        -------
+        list of str
+            One description per difference (missing/extra columns, row counts, or columns with differing values).
+        """
+        if legacy_df is None or fast_df is None:
+            return [] if legacy_df is None and fast_df is None else [f"{name}: only one implementation returned a frame"]
+
+        details = []
+        missing = [column for column in legacy_df.columns if column not in fast_df.columns]
+        extra = [column for column in fast_df.columns if column not in legacy_df.columns]
+        if missing:
+            details.append(f"{name}: columns missing from fast path {missing}")
+        if extra:
+            details.append(f"{name}: extra columns in fast path {extra}")
+        if not missing and not extra and list(legacy_df.columns) != list(fast_df.columns):
+            details.append(f"{name}: column order differs")
+        if len(legacy_df) != len(fast_df):
+            details.append(f"{name}: {len(legacy_df)} legacy rows vs {len(fast_df)} fast rows")
+            return details
+
+        for column in legacy_df.columns:
+            if column not in fast_df.columns:
+                continue
+            legacy_values = legacy_df[column].reset_index(drop=True)
+            fast_values = fast_df[column].reset_index(drop=True)
+            different = self.different_values(legacy_values, fast_values)
+            if different.any():
+                row = np.flatnonzero(different)[0]
+                details.append(f"{name}.{column}: {different.sum()} rows differ (row {row}: {legacy_values[row]!r} vs {fast_values[row]!r})")
+        return details
+
+
+    def different_values(self, legacy_values, fast_values):
+        """ Returns a boolean array marking the rows where two columns differ (empty values only match empty values). """
+        legacy_empty = legacy_values.isna().to_numpy()
+        fast_empty = fast_values.isna().to_numpy()
+        numeric = all(pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values) for values in (legacy_values, fast_values))
+        if numeric:
+            return ~np.isclose(legacy_values.to_numpy(dtype=float), fast_values.to_numpy(dtype=float), rtol=self.rtol, atol=self.atol, equal_nan=True)
+        text_differs = legacy_values.astype(str).to_numpy() != fast_values.astype(str).to_numpy()
+        return (legacy_empty != fast_empty) | (~legacy_empty & ~fast_empty & text_differs)
+
+
+    def run(self, game_dirs, workers=1):
+        """
+        Runs every game through both implementations, spread over worker processes.
+
+        Parameters
+        ----------
+        game_dirs : list of str
+            Archived game folders ('<Payload_Archive directory>/<game_id>').
+        workers : int
+            Number of worker processes (1 runs in this process).
+
+        Returns
+        -------
+        DataFrame
+            The stage results of every game (see run_game).
+        """
+        if workers <= 1:
+            results = [result for game_dir in game_dirs for result in self.run_game(game_dir)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(sorted(self.fast.fast_paths), self.rtol, self.atol)) as executor:
+                results = [result for game_results in executor.map(shadow_game, game_dirs, chunksize=8) for result in game_results]
+        return pd.DataFrame(results, columns=['GAME_ID', 'STAGE', 'LEGACY_SECONDS', 'FAST_SECONDS', 'MISMATCHES', 'DETAILS'])
+
+
+    def summarize(self, results_df):
+        """
+        Summarizes the results per stage: games run, games with mismatches, total seconds of each implementation and
+        the speed ratio (legacy seconds / fast seconds).
+        """
+        summary = results_df.groupby('STAGE', sort=False).agg(
+            GAMES=('GAME_ID', 'nunique'),
+            MISMATCHED_GAMES=('MISMATCHES', lambda mismatches: int((mismatches > 0).sum())),
+            LEGACY_SECONDS=('LEGACY_SECONDS', 'sum'),
+            FAST_SECONDS=('FAST_SECONDS', 'sum'),
+        )
+        summary['SPEED_RATIO'] = (summary['LEGACY_SECONDS'] / summary['FAST_SECONDS']).round(2)
+        summary['FAST_PATH'] = [stage in self.fast.fast_paths for stage in summary.index]
+        return summary
+
+
+# Worker processes build their own Shadow (Clean instances aren't shared between processes)
+worker_shadow = None
+
+def init_worker(fast_paths, rtol, atol):
+    global worker_shadow
+    worker_shadow = Shadow(fast_paths, rtol, atol)
+
+def shadow_game(game_dir):
+    return worker_shadow.run_game(game_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare Clean's legacy and fast path implementations over archived payloads")
+    parser.add_argument('payload_dir', help="Payload archive directory (Payload_Archive in config.json)")
+    parser.add_argument('--games', default='*', help="Glob of game IDs to run, e.g., '2023*' (default: every archived game)")
+    parser.add_argument('--fast-paths', nargs='+', default=list(Clean.FAST_PATHS), choices=Clean.FAST_PATHS, help="Fast paths to compare (default: all)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument('--rtol', type=float, default=1e-9, help="Relative tolerance for numeric columns")
+    parser.add_argument('--atol', type=float, default=1e-6, help="Absolute tolerance for numeric columns")
+    args = parser.parse_args(argv)
+
+    game_dirs = sorted(path for path in glob.glob(os.path.join(args.payload_dir, args.games)) if os.path.exists(os.path.join(path, 'box_score.json')))
+    if not game_dirs:
+        print(f"No archived games matching {args.games} in {args.payload_dir}")
+        return 1
+
+    shadow = Shadow(args.fast_paths, args.rtol, args.atol)
+    results_df = shadow.run(game_dirs, args.workers)
+
+    print(shadow.summarize(results_df).to_string())
+    mismatches = results_df[results_df['MISMATCHES'] > 0]
+    for _, result in mismatches.iterrows():
+        for detail in result['DETAILS']:
+            print(f"{result['GAME_ID']} {result['STAGE']}: {detail}")
+    return 1 if len(mismatches) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
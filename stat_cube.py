@@ -0,0 +1,301 @@
+import numpy as np
+import pandas as pd
+import json
+import os
+import inspect
+from log_helper import NFL_Logging
+from config_helper import load_config
+
+
+class StatCube:
+    """
+    Class used to materialize Player_Game_Stats into a memory-mapped NumPy array (player index x game index x stat).
+
+    The cube lives in two files inside the cube directory:
+        - stats.npy  : float32 array of shape (player capacity, game capacity, stat count). Games a player did not
+                       record stats in are NaN.
+        - index.json : player/game ID dictionaries, stat column order, per-season offsets and the used sizes.
+
+    Games are stored sorted by season, then date, so a season (and in practice a week) is a contiguous block on the
+    game axis and can be sliced without copying.
+    """
+
+    def __init__(self, cube_dir='stat_cube'):
+        """
+        Initializes the StatCube class.
+
+        Loads the numeric Player_Game_Stats columns from 'config.json' (everything typed INTEGER/REAL that is not an ID)
+        plus the fantasy point columns, which make up the stat axis of the cube.
+        """
+        self.log = NFL_Logging()
+        self.cube_dir = cube_dir
+        self.data_path = os.path.join(cube_dir, 'stats.npy')
+        self.index_path = os.path.join(cube_dir, 'index.json')
+
+        config = load_config()
+
+        id_columns = ['PLAYER_ID', 'TEAM_ID', 'TEAM_ID_PLAYED_AGAINST']
+        column_types = config['Player_Game_Stats_Mapping']['df_datatypes_to_db_datatypes']
+        self.stat_columns = [col for col, sql_type in column_types.items() if sql_type in ('INTEGER', 'REAL') and col not in id_columns]
+        self.stat_columns += ['HOME_LEAGUE_PTS', 'DK_PTS', 'FD_PTS']
+
+        self.cube = None
+        self.index = None
+
+
+    def build(self, conn):
+        """
+        Builds the cube from scratch out of every row in Player_Game_Stats.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+
+        stats_df = self.read_player_game_stats(conn)
+        games_df = stats_df[['GAME_ID', 'SEASON_ID', 'GAME_WEEK']].drop_duplicates('GAME_ID')
+        games_df = self.sort_games(games_df)
+        player_ids = sorted(stats_df['PLAYER_ID'].unique().tolist())
+
+        # Leave some headroom on both axes so the next few loads don't force a reallocation
+        capacity = (self.grow(len(player_ids)), self.grow(len(games_df)))
+        os.makedirs(self.cube_dir, exist_ok=True)
+        tmp_path = self.data_path + '.tmp'
+        cube = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(*capacity, len(self.stat_columns)))
+        cube[:] = np.nan
+
+        self.index = {
+            'stat_columns': self.stat_columns,
+            'player_ids': player_ids,
+            'game_ids': games_df['GAME_ID'].tolist(),
+            'game_seasons': games_df['SEASON_ID'].tolist(),
+            'game_weeks': games_df['GAME_WEEK'].tolist(),
+        }
+        self.scatter(cube, stats_df)
+        cube.flush()
+        del cube
+
+        os.replace(tmp_path, self.data_path)
+        self.save_index()
+        self.log.info(f"Built stat cube with {len(player_ids)} players x {len(games_df)} games x {len(self.stat_columns)} stats")
+
+
+    def update(self, conn, game_ids):
+        """
+        Incrementally refreshes the cube after a load. Reloaded games are overwritten in place, new games and players are
+        appended. Falls back to a full build when there is no cube yet, the stat columns changed, or a new game would sort
+        before a game already in the cube (which would break the season/week ordering).
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        game_ids : list of str
+            IDs of the games that were just (re)loaded.
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+
+        if not os.path.exists(self.index_path) or not os.path.exists(self.data_path):
+            return self.build(conn)
+        self.load_index()
+        if self.index['stat_columns'] != self.stat_columns:
+            self.log.warning("Stat columns changed since the cube was built, rebuilding stat cube.")
+            return self.build(conn)
+
+        stats_df = self.read_player_game_stats(conn, game_ids)
+        known_games = set(self.index['game_ids'])
+        new_games_df = self.sort_games(stats_df[~stats_df['GAME_ID'].isin(known_games)][['GAME_ID', 'SEASON_ID', 'GAME_WEEK']].drop_duplicates('GAME_ID'))
+
+        if len(new_games_df) > 0 and len(known_games) > 0:
+            last_key = self.game_sort_key(self.index['game_seasons'][-1], self.index['game_ids'][-1])
+            first_new_key = self.game_sort_key(new_games_df['SEASON_ID'].iloc[0], new_games_df['GAME_ID'].iloc[0])
+            if first_new_key < last_key:
+                self.log.warning("New games sort before games already in the stat cube, rebuilding stat cube.")
+                return self.build(conn)
+
+        known_players = set(self.index['player_ids'])
+        new_players = sorted(set(stats_df['PLAYER_ID'].unique().tolist()) - known_players)
+
+        self.index['player_ids'] += new_players
+        self.index['game_ids'] += new_games_df['GAME_ID'].tolist()
+        self.index['game_seasons'] += new_games_df['SEASON_ID'].tolist()
+        self.index['game_weeks'] += new_games_df['GAME_WEEK'].tolist()
+
+        cube = self.ensure_capacity(len(self.index['player_ids']), len(self.index['game_ids']))
+
+        # Clear the reloaded games first so players removed from a game's box score don't linger
+        game_lookup = {game_id: i for i, game_id in enumerate(self.index['game_ids'])}
+        reloaded = [game_lookup[game_id] for game_id in game_ids if game_id in game_lookup]
+        if reloaded:
+            cube[:, reloaded, :] = np.nan
+
+        self.scatter(cube, stats_df)
+        cube.flush()
+        del cube
+
+        self.save_index()
+        self.log.info(f"Updated stat cube with {len(stats_df)} player games ({len(new_games_df)} new games, {len(new_players)} new players)")
+
+
+    def load(self):
+        """
+        Opens the cube read-only as a memory map. Slices returned by player(), game(), season() and week() are views
+        into this map.
+        """
+        self.load_index()
+        self.cube = np.load(self.data_path, mmap_mode='r')
+        self.player_lookup = {player_id: i for i, player_id in enumerate(self.index['player_ids'])}
+        self.game_lookup = {game_id: i for i, game_id in enumerate(self.index['game_ids'])}
+        self.stat_lookup = {stat: i for i, stat in enumerate(self.index['stat_columns'])}
+        return self
+
+
+    def player(self, player_id, season=None):
+        """
+        Returns a (game x stat) view of a player's stats, optionally limited to a single season.
+        """
+        games = self.season_slice(season) if season is not None else slice(0, len(self.index['game_ids']))
+        return self.cube[self.player_lookup[int(player_id)], games, :]
+
+
+    def game(self, game_id):
+        """
+        Returns a (player x stat) view of every player's stats from a single game.
+        """
+        return self.cube[:len(self.index['player_ids']), self.game_lookup[game_id], :]
+
+
+    def season(self, season):
+        """
+        Returns a (player x game x stat) view of every game from a single season.
+        """
+        return self.cube[:len(self.index['player_ids']), self.season_slice(season), :]
+
+
+    def week(self, season, week):
+        """
+        Returns a (player x game x stat) array of the games from a season's week (e.g., 2023, 'Week 5').
+        This is a view when the week's games are contiguous on the game axis (always the case for games sorted by date)
+        and a copy otherwise.
+        """
+        seasons = np.asarray(self.index['game_seasons'], dtype=str)
+        weeks = np.asarray(self.index['game_weeks'], dtype=str)
+        positions = np.flatnonzero((seasons == str(season)) & (weeks == week))
+        if len(positions) == 0:
+            raise KeyError(f"No games in stat cube for {season} {week}")
+
+        if positions[-1] - positions[0] + 1 == len(positions):
+            games = slice(positions[0], positions[-1] + 1)
+        else:
+            games = positions
+        return self.cube[:len(self.index['player_ids']), games, :]
+
+
+    def stat(self, name):
+        """
+        Returns the position of a stat column on the cube's last axis (e.g., cube.season(2023)[..., cube.stat('DK_PTS')]).
+        """
+        return self.stat_lookup[name]
+
+
+    def season_slice(self, season):
+        """
+        Returns the [start, end) range of a season on the game axis.
+        """
+        start, end = self.index['season_offsets'][str(season)]
+        return slice(start, end)
+
+
+    def read_player_game_stats(self, conn, game_ids=None):
+        """
+        Reads the cube's stat columns (plus the player/game keys) from Player_Game_Stats joined with Game.
+        """
+        query = f"""
+            SELECT pgs.PLAYER_ID, pgs.GAME_ID, g.SEASON_ID, g.GAME_WEEK, {', '.join('pgs.' + col for col in self.stat_columns)}
+            FROM Player_Game_Stats pgs
+            INNER JOIN Game g ON g.GAME_ID = pgs.GAME_ID
+        """
+        params = []
+        if game_ids is not None:
+            query += " WHERE pgs.GAME_ID IN ({seq})".format(seq=','.join(['?'] * len(game_ids)))
+            params = list(game_ids)
+        stats_df = pd.read_sql_query(query, conn, params=params)
+        stats_df['SEASON_ID'] = stats_df['SEASON_ID'].astype(str)
+        return stats_df
+
+
+    def scatter(self, cube, stats_df):
+        """
+        Writes the rows of stats_df into their (player, game) cells of the cube in one vectorized assignment.
+        """
+        if len(stats_df) == 0:
+            return
+        player_lookup = {player_id: i for i, player_id in enumerate(self.index['player_ids'])}
+        game_lookup = {game_id: i for i, game_id in enumerate(self.index['game_ids'])}
+        player_idx = stats_df['PLAYER_ID'].map(player_lookup).to_numpy()
+        game_idx = stats_df['GAME_ID'].map(game_lookup).to_numpy()
+        cube[player_idx, game_idx, :] = stats_df[self.stat_columns].to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+    def ensure_capacity(self, n_players, n_games):
+        """
+        Opens the cube for writing, first copying it into a larger file when the used sizes outgrow its capacity.
+        """
+        cube = np.load(self.data_path, mmap_mode='r+')
+        if n_players <= cube.shape[0] and n_games <= cube.shape[1]:
+            return cube
+
+        capacity = (max(cube.shape[0], self.grow(n_players)), max(cube.shape[1], self.grow(n_games)))
+        self.log.info(f"Growing stat cube from {cube.shape[:2]} to {capacity}")
+        tmp_path = self.data_path + '.tmp'
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(*capacity, cube.shape[2]))
+        grown[:] = np.nan
+        grown[:cube.shape[0], :cube.shape[1], :] = cube
+        grown.flush()
+        del cube, grown
+
+        os.replace(tmp_path, self.data_path)
+        return np.load(self.data_path, mmap_mode='r+')
+
+
+    def sort_games(self, games_df):
+        """
+        Sorts games by season, then date (GAME_ID starts with the YYYYMMDD date of the game), then GAME_ID.
+        """
+        games_df = games_df.copy()
+        games_df['SORT_KEY'] = [self.game_sort_key(season, game_id) for season, game_id in zip(games_df['SEASON_ID'], games_df['GAME_ID'])]
+        return games_df.sort_values('SORT_KEY').drop(columns=['SORT_KEY']).reset_index(drop=True)
+
+
+    def game_sort_key(self, season, game_id):
+        return (str(season), game_id)
+
+
+    def grow(self, size):
+        """
+        Returns the capacity to allocate for an axis currently holding `size` entries (25% headroom).
+        """
+        return max(16, int(size * 1.25))
+
+
+    def load_index(self):
+        with open(self.index_path) as f:
+            self.index = json.load(f)
+
+
+    def save_index(self):
+        """
+        Recomputes the per-season offsets on the game axis and writes index.json.
+        """
+        offsets = {}
+        for i, season in enumerate(self.index['game_seasons']):
+            start, _ = offsets.get(season, (i, i))
+            offsets[season] = (start, i + 1)
+        self.index['season_offsets'] = offsets
+
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
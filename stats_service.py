@@ -0,0 +1,273 @@
+import hashlib
+import json
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import pandas as pd
+from flask import Flask, Response, request
+from queries import NFL_Queries
+from db_helper import read_data_version, connect_reader, snapshot
+from log_helper import NFL_Logging
+
+
+class ReadPool:
+    """
+    Fixed set of read-only SQLite connections shared by the service's request threads.
+    """
+
+    def __init__(self, db_path, size=4, busy_timeout=10):
+        """
+        Opens the pool's connections.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to nfl_fantasy.db.
+        size : int
+            Number of connections (requests beyond that wait for a free connection).
+        busy_timeout : float
+            Seconds a read waits on the pipeline's write lock before failing.
+        """
+        self.connections = queue.Queue()
+        for _ in range(size):
+            self.connections.put(connect_reader(db_path, timeout=busy_timeout, check_same_thread=False))
+
+
+    @contextmanager
+    def connection(self):
+        """ Borrows a connection for the duration of the with block. """
+        conn = self.connections.get()
+        try:
+            yield conn
+        finally:
+            self.connections.put(conn)
+
+
+    def close(self):
+        """ Closes every connection in the pool. """
+        while not self.connections.empty():
+            self.connections.get().close()
+
+
+class StatsService:
+    """
+    Class used to serve player logs, leaderboards and game summaries from nfl_fantasy.db over local HTTP, so other tools
+    don't open the database themselves while the pipeline is writing.
+
+    Responses are serialized once and kept in a cache keyed by the request, together with an ETag. The cache is dropped
+    whenever the pipeline bumps Data_Version (see db_helper.bump_data_version), and the latest season's weekly
+    leaderboards are precomputed again in the background. Clients sending the ETag back in If-None-Match get a
+    304 Not Modified until new data lands.
+
+    Examples:
+        >>> python stats_service.py
+        >>> curl http://127.0.0.1:5050/leaderboards/2023/weeks/5?platform=DK_PTS&limit=10
+    """
+
+    def __init__(self, db_path='nfl_fantasy.db', pool_size=4, cache_size=2048):
+        """
+        Initializes the StatsService class.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to nfl_fantasy.db.
+        pool_size : int
+            Number of pooled read-only connections.
+        cache_size : int
+            Number of serialized responses kept in the cache.
+        """
+        self.log = NFL_Logging()
+        self.queries = NFL_Queries(db_path) # Only used to build the SQL, queries run on the pool's connections
+        self.pool = ReadPool(db_path, pool_size)
+        self.cache_size = cache_size
+
+        # Request key -> (etag, body) for the data version in responses_version
+        self.responses = OrderedDict()
+        self.responses_version = None
+        self.lock = threading.Lock()
+
+        self.app = self.create_app()
+
+
+    def create_app(self):
+        """
+        Creates the Flask app with the service's endpoints.
+        """
+        app = Flask(__name__)
+
+        @app.route('/health')
+        def health():
+            return self.respond(('health',), lambda conn: json.dumps({'data_version': self.current_version(conn)}), cache=False)
+
+        @app.route('/players/<int:player_id>/games')
+        def player_games(player_id):
+            season = request.args.get('season', type=int)
+            sql, params = self.queries.player_game_log_sql(player_id, season)
+            return self.respond(('player_games', player_id, season), lambda conn: self.query_json(conn, sql, params))
+
+        @app.route('/leaderboards/<int:season>', defaults={'week': None})
+        @app.route('/leaderboards/<int:season>/weeks/<week>')
+        def leaderboard(season, week):
+            # /weeks/5 is 'Week 5', other weeks are passed as their GAME_WEEK (e.g., /weeks/Wild%20Card)
+            week = f"Week {week}" if week is not None and week.isdigit() else week
+            platform = request.args.get('platform', 'HOME_LEAGUE_PTS')
+            position = request.args.get('position')
+            limit = request.args.get('limit', 50, type=int)
+            if platform not in self.queries.platforms:
+                return self.error(400, f"Unknown platform '{platform}', expected one of {self.queries.platforms}")
+            return self.respond(('leaderboard', season, week, platform, position, limit), lambda conn: self.leaderboard_json(conn, season, week, platform, position, limit))
+
+        @app.route('/injuries')
+        def injury_search():
+            # /injuries?q=hamstring+groin matches any of the words, history=1 searches every recorded change
+            words = tuple(request.args.get('q', '').split())
+            history = request.args.get('history', 0, type=int) == 1
+            position = request.args.get('position')
+            limit = request.args.get('limit', 50, type=int)
+            if not words:
+                return self.error(400, "Missing search words, e.g., /injuries?q=hamstring")
+            sql, params = self.queries.injury_search_sql(list(words), history, position, True, limit)
+            return self.respond(('injuries', words, history, position, limit), lambda conn: self.query_json(conn, sql, params))
+
+        @app.route('/games/<game_id>')
+        def game_summary(game_id):
+            return self.respond(('game_summary', game_id), lambda conn: self.game_summary_json(conn, game_id))
+
+        return app
+
+
+    def current_version(self, conn):
+        """ Returns the database's Data_Version counter. """
+        return read_data_version(conn)
+
+
+    def respond(self, key, build, cache=True):
+        """
+        Returns the (cached) response for a request, or 304 Not Modified if the client already has it.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key of the request.
+        build : callable
+            Function taking a pooled connection and returning the JSON body, or None if the item doesn't exist (used
+            on a cache miss).
+        cache : bool
+            Whether the response can be cached.
+        """
+        # Version and body are read in one snapshot, so a response is never cached under the wrong version
+        with self.pool.connection() as conn, snapshot(conn):
+            version = self.current_version(conn)
+            self.check_version(version)
+
+            with self.lock:
+                cached = self.responses.get(key) if cache else None
+                if cached is not None:
+                    self.responses.move_to_end(key)
+
+            if cached is None:
+                body = build(conn)
+                if body is None:
+                    return self.error(404, f"Not found: {request.path}")
+                cached = self.serialize(body, version)
+                if cache:
+                    self.store(key, cached, version)
+
+        etag, body = cached
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, status=200, mimetype='application/json')
+        response.set_etag(etag)
+        # Clients may keep the response but have to revalidate it (cheap 304) before using it
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+    def serialize(self, body, version):
+        """ Returns the (etag, body bytes) of a JSON body, the ETag is the data version plus a hash of the body. """
+        body = body.encode('utf-8')
+        return f"{version}-{hashlib.sha1(body).hexdigest()[:16]}", body
+
+
+    def check_version(self, version):
+        """
+        Drops every cached response once the pipeline loaded new data, and precomputes the common ones again.
+        """
+        with self.lock:
+            if version == self.responses_version:
+                return
+            self.responses.clear()
+            first_load = self.responses_version is None
+            self.responses_version = version
+
+        if not first_load:
+            self.log.info(f"Stats service cache invalidated, data version {version}")
+        threading.Thread(target=self.precompute, args=(version,), daemon=True).start()
+
+
+    def store(self, key, cached, version):
+        """ Stores a response, unless the data version changed while it was being built. """
+        with self.lock:
+            if version != self.responses_version:
+                return
+            self.responses[key] = cached
+            if len(self.responses) > self.cache_size:
+                self.responses.popitem(last=False)
+
+
+    def precompute(self, version):
+        """
+        Builds the latest season's weekly leaderboards (default arguments, every platform) into the response cache.
+        """
+        with self.pool.connection() as conn, snapshot(conn):
+            if self.current_version(conn) != version:
+                return # Newer data landed, a newer precompute takes over
+            season = conn.execute("SELECT MAX(SEASON_ID) FROM Game").fetchone()[0]
+            if season is None:
+                return
+            weeks = [row[0] for row in conn.execute("SELECT DISTINCT GAME_WEEK FROM Game WHERE SEASON_ID = ?", (season,))]
+            for platform in self.queries.platforms:
+                for week in [None] + weeks:
+                    if version != self.responses_version:
+                        return # Newer data landed, a newer precompute takes over
+                    body = self.leaderboard_json(conn, int(season), week, platform, None, 50)
+                    self.store(('leaderboard', int(season), week, platform, None, 50), self.serialize(body, version), version)
+
+
+    def query_json(self, conn, sql, params):
+        """ Runs a query and returns its rows as a JSON array. """
+        return pd.read_sql_query(sql, conn, params=params).to_json(orient='records')
+
+
+    def leaderboard_json(self, conn, season, week, platform, position, limit):
+        """ Returns a season (week None) or weekly leaderboard as a JSON array. """
+        # Regular season only for the full season leaderboard, a weekly one is a single week of any game type
+        game_type = 'Regular Season' if week is None else None
+        sql, params = self.queries.leaderboard_sql(season, week, platform, position, game_type, limit)
+        return self.query_json(conn, sql, params)
+
+
+    def game_summary_json(self, conn, game_id):
+        """ Returns a game's summary as a JSON object (None if the game doesn't exist). """
+        parts = {part: self.query_json(conn, sql, params) for part, (sql, params) in self.queries.game_summary_sql(game_id).items()}
+        if parts['game'] == '[]':
+            return None
+        return '{' + ', '.join(f'"{part}": {body}' for part, body in parts.items()) + '}'
+
+
+    def error(self, status, message):
+        """ Returns a JSON error response. """
+        return Response(json.dumps({'error': message}), status=status, mimetype='application/json')
+
+
+def main():
+    service = StatsService()
+    # Local only, threaded so the pooled connections serve requests concurrently
+    service.app.run(host='127.0.0.1', port=5050, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+import os
+import inspect
+from log_helper import NFL_Logging
+from config_helper import load_config
+from db_helper import bump_data_version
+
+
+class TeamGameContext:
+    """
+    Class used to build the Team_Game_Context table, the schedule context of every team's games (one row per team and
+    game), so rest/bye/travel splits are a join on (GAME_ID, TEAM_ID) instead of a self-join on Game.
+
+        - DAYS_REST / OPPONENT_DAYS_REST : days since the team's (opponent's) previous game of the season, NULL for the
+                                           first game. Preseason games only count against other preseason games.
+        - POST_BYE                       : 1 if the team had at least bye_min_rest_days of rest (regular season and
+                                           postseason, so a wild card round bye counts too). The Super Bowl (the
+                                           bye_excluded_weeks) is left out, both teams always get two weeks there.
+        - CONSECUTIVE_ROAD_GAMES         : games in a row away from the team's stadium, including this one (0 at home)
+        - TRAVEL_MILES                   : great-circle distance from the team's stadium to the game's site
+
+    Stadium coordinates are the latitude/longitude of Weather_Table_Mapping. Games away from both stadiums (international
+    games, Super Bowls, Hall of Fame games) take their site from the 'Team_Game_Context' section of 'config.json'.
+    neutral_sites lists those games by GAME_ID and has to be extended every season once the international games and
+    the Super Bowl are scheduled (then run `run_pipeline.py team-context`), any game missing from it is placed at the
+    home team's stadium. The table is rebuilt a season at a time for the seasons of newly loaded games.
+    """
+
+    def __init__(self):
+        """
+        Initializes the TeamGameContext class.
+
+        Loads the stadium coordinates, the bye threshold and the neutral sites from 'config.json'.
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+        self.stadiums = {team: (info['latitude'], info['longitude']) for team, info in config['Weather_Table_Mapping'].items() if 'latitude' in info}
+
+        settings = config['Team_Game_Context']
+        self.bye_min_rest_days = settings['bye_min_rest_days']
+        # Weeks whose rest isn't a bye (the two weeks before the Super Bowl are the same for both teams)
+        self.bye_excluded_weeks = settings['bye_excluded_weeks']
+        self.week_sites = settings['week_sites']
+        self.neutral_sites = settings['neutral_sites']
+        # Seasons with at least one neutral site listed (January/February games belong to the previous season)
+        self.neutral_site_seasons = {str(int(game_id[:4]) - (int(game_id[4:6]) < 3)) for game_id in self.neutral_sites}
+
+
+    def haversine_miles(self, latitude_1, longitude_1, latitude_2, longitude_2):
+        """
+        Returns the great-circle distances in miles between two arrays of coordinates (in degrees).
+        """
+        latitude_1, longitude_1, latitude_2, longitude_2 = (np.radians(np.asarray(values, dtype=float)) for values in (latitude_1, longitude_1, latitude_2, longitude_2))
+        a = np.sin((latitude_2 - latitude_1) / 2) ** 2 + np.cos(latitude_1) * np.cos(latitude_2) * np.sin((longitude_2 - longitude_1) / 2) ** 2
+        return 3958.8 * 2 * np.arcsin(np.sqrt(a))
+
+
+    def game_sites(self, games_df):
+        """
+        Returns the (latitude, longitude) of each game's site and whether it is a neutral site, as arrays aligned with
+        games_df (neutral_sites by GAME_ID first, then week_sites by GAME_WEEK, else the home team's stadium).
+        """
+        sites = []
+        for game_id, game_week, home_team in zip(games_df['GAME_ID'], games_df['GAME_WEEK'], games_df['HOME_TEAM']):
+            site = self.neutral_sites.get(game_id) or self.week_sites.get(game_week)
+            if site is not None:
+                sites.append((site['latitude'], site['longitude'], 1))
+            else:
+                sites.append(self.stadiums.get(home_team, (np.nan, np.nan)) + (0,))
+        latitude, longitude, neutral = (np.array(values) for values in zip(*sites)) if sites else (np.array([]),) * 3
+        return latitude, longitude, neutral.astype(int)
+
+
+    def compute(self, games_df):
+        """
+        Computes the context rows of a season's games.
+
+        Parameters
+        ----------
+        games_df : DataFrame
+            Game rows (GAME_ID, GAME_WEEK, GAME_TYPE, GAME_DATE_KEY, SEASON_ID, HOME/AWAY_TEAM and HOME/AWAY_TEAM_ID).
+
+        Returns
+        -------
+        DataFrame
+            One row per team and game with the Team_Game_Context columns.
+        """
+        games_df = games_df.reset_index(drop=True)
+        for season in sorted(set(games_df['SEASON_ID'].astype(str)) - self.neutral_site_seasons):
+            self.log.warning(f"No neutral sites listed for the {season} season in config.json (Team_Game_Context.neutral_sites), "
+                             f"its international games and Super Bowl are placed at the home team's stadium")
+        latitude, longitude, neutral = self.game_sites(games_df)
+        games_df = games_df.assign(SITE_LATITUDE=latitude, SITE_LONGITUDE=longitude, NEUTRAL_SITE=neutral)
+
+        # One row per team and game (home and away side)
+        sides = []
+        for side, opponent in [('HOME', 'AWAY'), ('AWAY', 'HOME')]:
+            side_df = games_df[['GAME_ID', 'SEASON_ID', 'GAME_WEEK', 'GAME_TYPE', 'GAME_DATE_KEY', 'SITE_LATITUDE', 'SITE_LONGITUDE', 'NEUTRAL_SITE']].copy()
+            side_df['TEAM_ID'] = games_df[f'{side}_TEAM_ID']
+            side_df['TEAM_ABBR'] = games_df[f'{side}_TEAM']
+            side_df['OPPONENT_TEAM_ID'] = games_df[f'{opponent}_TEAM_ID']
+            side_df['HOME_OR_AWAY'] = side.title()
+            sides.append(side_df)
+        context_df = pd.concat(sides, ignore_index=True)
+
+        # Rest since the previous game in the same part of the season (preseason games don't count toward week 1)
+        context_df['PRESEASON'] = context_df['GAME_TYPE'] == 'Preseason'
+        context_df['GAME_DATE_VALUE'] = pd.to_datetime(context_df['GAME_DATE_KEY'].astype(str), format='%Y%m%d')
+        context_df = context_df.sort_values(['TEAM_ID', 'SEASON_ID', 'PRESEASON', 'GAME_DATE_VALUE'], ignore_index=True)
+        team_games = context_df.groupby(['TEAM_ID', 'SEASON_ID', 'PRESEASON'], sort=False)
+        context_df['PREVIOUS_GAME_ID'] = team_games['GAME_ID'].shift()
+        context_df['DAYS_REST'] = team_games['GAME_DATE_VALUE'].diff().dt.days.astype('Int64')
+        bye_week = ~context_df['PRESEASON'] & ~context_df['GAME_WEEK'].isin(self.bye_excluded_weeks)
+        context_df['POST_BYE'] = ((context_df['DAYS_REST'] >= self.bye_min_rest_days) & bye_week).fillna(False).astype(int)
+
+        # Road streak: road games since the team's last game at its own stadium (neutral sites count as road games).
+        # Every home game starts a new segment, so a road game's streak is its position in the segment (the first
+        # segment has no home game in front of it)
+        at_home = ((context_df['HOME_OR_AWAY'] == 'Home') & (context_df['NEUTRAL_SITE'] == 0)).astype(int)
+        segment = at_home.groupby([context_df['TEAM_ID'], context_df['SEASON_ID'], context_df['PRESEASON']]).cumsum()
+        position = context_df.groupby([context_df['TEAM_ID'], context_df['SEASON_ID'], context_df['PRESEASON'], segment]).cumcount()
+        context_df['CONSECUTIVE_ROAD_GAMES'] = np.where(at_home == 1, 0, position + (segment == 0))
+
+        stadium_latitude = context_df['TEAM_ABBR'].map(lambda team: self.stadiums.get(team, (np.nan, np.nan))[0])
+        stadium_longitude = context_df['TEAM_ABBR'].map(lambda team: self.stadiums.get(team, (np.nan, np.nan))[1])
+        context_df['TRAVEL_MILES'] = self.haversine_miles(stadium_latitude, stadium_longitude, context_df['SITE_LATITUDE'], context_df['SITE_LONGITUDE']).round(1)
+
+        # Opponent's rest from the opponent's own row of the same game
+        opponent_rest = context_df[['GAME_ID', 'TEAM_ID', 'DAYS_REST']].rename(columns={'TEAM_ID': 'OPPONENT_TEAM_ID', 'DAYS_REST': 'OPPONENT_DAYS_REST'})
+        context_df = context_df.merge(opponent_rest, on=['GAME_ID', 'OPPONENT_TEAM_ID'], how='left')
+
+        columns = ['GAME_ID', 'TEAM_ID', 'TEAM_ABBR', 'OPPONENT_TEAM_ID', 'SEASON_ID', 'GAME_TYPE', 'HOME_OR_AWAY', 'NEUTRAL_SITE',
+                   'PREVIOUS_GAME_ID', 'DAYS_REST', 'OPPONENT_DAYS_REST', 'POST_BYE', 'CONSECUTIVE_ROAD_GAMES', 'TRAVEL_MILES']
+        return context_df[columns].sort_values(['GAME_ID', 'HOME_OR_AWAY'], ascending=[True, False], ignore_index=True)
+
+
+    def write_seasons(self, conn, seasons):
+        """
+        Replaces the Team_Game_Context rows of the given seasons (doesn't commit).
+
+        Returns
+        -------
+        int
+            Number of rows written.
+        """
+        seasons = [str(season) for season in seasons]
+        if not seasons:
+            return 0
+        placeholders = ','.join(['?'] * len(seasons))
+        games_df = pd.read_sql_query(f"""
+            SELECT GAME_ID, GAME_WEEK, GAME_TYPE, GAME_DATE_KEY, SEASON_ID, HOME_TEAM, HOME_TEAM_ID, AWAY_TEAM, AWAY_TEAM_ID
+            FROM Game WHERE SEASON_ID IN ({placeholders})
+        """, conn, params=seasons)
+        context_df = self.compute(games_df)
+
+        conn.execute(f"DELETE FROM Team_Game_Context WHERE SEASON_ID IN ({placeholders})", seasons)
+        rows = context_df.astype(object).where(context_df.notna(), None).values.tolist()
+        conn.executemany(f"INSERT INTO Team_Game_Context ({', '.join(context_df.columns)}) VALUES ({', '.join(['?'] * len(context_df.columns))})", rows)
+        return len(rows)
+
+
+    def update(self, conn, game_ids=None):
+        """
+        Rebuilds the context of the seasons the given games belong to (every season if game_ids is None) in one
+        transaction. A loaded game changes the rest days of the games around it, so whole seasons are recomputed.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            Connection to the NFL database.
+        game_ids : list of str, optional
+            IDs of the games that were just (re)loaded.
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+        if game_ids is None:
+            seasons = [row[0] for row in conn.execute("SELECT DISTINCT SEASON_ID FROM Game")]
+        elif game_ids:
+            placeholders = ','.join(['?'] * len(game_ids))
+            seasons = [row[0] for row in conn.execute(f"SELECT DISTINCT SEASON_ID FROM Game WHERE GAME_ID IN ({placeholders})", list(game_ids))]
+        else:
+            return
+
+        with conn:
+            written = self.write_seasons(conn, seasons)
+            if written:
+                bump_data_version(conn)
+        self.log.info(f"Rebuilt team game context for seasons {sorted(seasons)} ({written} rows)")
@@ -0,0 +1,152 @@
+import numpy as np
+import json
+import os
+import inspect
+from PIL import Image
+from log_helper import NFL_Logging
+from config_helper import load_config
+
+
+class TeamLogos:
+    """
+    Class used to hand out team logos (nfl-logos/*.png) as pre-decoded RGBA arrays for plotting, e.g., logos as scatter
+    plot markers.
+
+    Every logo is decoded and resized once per size into a sprite sheet, a uint8 array of shape
+    (team, size, size, 4) with the teams in the order of Weather_Table_Mapping (same abbreviations as Team.ABBREVIATION).
+    Sheets are kept in a process-level cache shared by every instance, and saved to the cache directory
+    ('logos_<size>.npy' plus 'index.json' with the teams and the source files' modification times), so new processes
+    (notebook kernels) load one array instead of decoding 32 PNGs. A sheet is rebuilt when a logo file changes.
+
+    Examples:
+        >>> logos = TeamLogos()
+        >>> ax.add_artist(AnnotationBbox(logos.offset_image('KC', 64, zoom=0.5), (x, y), frameon=False))
+    """
+
+    # (logo directory, size) > sprite sheet, shared by every TeamLogos in the process
+    sheets = {}
+
+    def __init__(self, logo_dir=None, cache_dir=None):
+        """
+        Initializes the TeamLogos class.
+
+        Loads the logo/cache directories and the pre-rendered sizes from the 'Team_Logos' section of 'config.json',
+        and the team abbreviations from 'Weather_Table_Mapping'.
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+        settings = config['Team_Logos']
+        self.logo_dir = logo_dir or settings['directory']
+        self.cache_dir = cache_dir or settings['cache_directory']
+        self.sizes = settings['sizes']
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+
+        # Team entries of Weather_Table_Mapping, the other keys are the weather table mappings
+        self.teams = [team for team, info in config['Weather_Table_Mapping'].items() if 'timezone' in info]
+        self.team_lookup = {team: i for i, team in enumerate(self.teams)}
+
+
+    def logo(self, team, size=64):
+        """
+        Returns a team's logo as a (size, size, 4) uint8 RGBA view into the sprite sheet (no copy, don't modify it).
+
+        Parameters
+        ----------
+        team : str
+            Team abbreviation (e.g., 'KC').
+        size : int
+            Width and height in pixels, logos keep their aspect ratio and are centered on a transparent square.
+        """
+        if team not in self.team_lookup:
+            raise KeyError(f"No logo for team '{team}', expected one of {self.teams}")
+        return self.sheet(size)[self.team_lookup[team]]
+
+
+    def offset_image(self, team, size=64, zoom=1.0, **kwargs):
+        """
+        Returns a matplotlib OffsetImage of a team's logo (for AnnotationBbox), backed by the sprite sheet view.
+        Extra keyword arguments are passed to OffsetImage.
+        """
+        from matplotlib.offsetbox import OffsetImage
+        return OffsetImage(self.logo(team, size), zoom=zoom, **kwargs)
+
+
+    def sheet(self, size=64):
+        """
+        Returns the (team, size, size, 4) sprite sheet of a size: from the process cache, else from the cache
+        directory, else decoded from the PNGs (and saved for the next process).
+        """
+        key = (os.path.abspath(self.logo_dir), int(size))
+        sheet = TeamLogos.sheets.get(key)
+        if sheet is None:
+            sheet = self.read_sheet(size)
+            if sheet is None:
+                sheet = self.build_sheet(size)
+                self.save_sheet(size, sheet)
+            TeamLogos.sheets[key] = sheet
+        return sheet
+
+
+    def prerender(self):
+        """
+        Builds and saves the sprite sheets of every size in config.json (run after the logos change).
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+        for size in self.sizes:
+            sheet = self.build_sheet(size)
+            self.save_sheet(size, sheet)
+            TeamLogos.sheets[(os.path.abspath(self.logo_dir), int(size))] = sheet
+        self.log.info(f"Pre-rendered team logos at sizes {self.sizes} into {self.cache_dir}")
+
+
+    def build_sheet(self, size):
+        """ Decodes every team's PNG and resizes it into a new (team, size, size, 4) sprite sheet. """
+        sheet = np.zeros((len(self.teams), size, size, 4), dtype=np.uint8)
+        for i, team in enumerate(self.teams):
+            with Image.open(os.path.join(self.logo_dir, f"{team}.png")) as image:
+                image = image.convert('RGBA')
+                image.thumbnail((size, size), Image.LANCZOS)
+            top, left = (size - image.height) // 2, (size - image.width) // 2
+            sheet[i, top:top + image.height, left:left + image.width] = np.asarray(image)
+        return sheet
+
+
+    def source_signature(self):
+        """ Returns the modification time and file size of every team's PNG (a sheet is stale when they change). """
+        signature = {}
+        for team in self.teams:
+            stat = os.stat(os.path.join(self.logo_dir, f"{team}.png"))
+            signature[team] = [stat.st_mtime_ns, stat.st_size]
+        return signature
+
+
+    def read_sheet(self, size):
+        """ Loads a saved sprite sheet, or returns None if it doesn't exist or the logos changed since it was saved. """
+        sheet_path = os.path.join(self.cache_dir, f"logos_{size}.npy")
+        if not os.path.exists(self.index_path) or not os.path.exists(sheet_path):
+            return None
+        with open(self.index_path, 'r') as file:
+            index = json.load(file)
+        if index['teams'] != self.teams or index['sources'] != self.source_signature():
+            return None
+        return np.load(sheet_path)
+
+
+    def save_sheet(self, size, sheet):
+        """ Saves a sprite sheet and the index it was built from (tmp file + rename, so readers never see half a file). """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sheet_path = os.path.join(self.cache_dir, f"logos_{size}.npy")
+        np.save(sheet_path + '.tmp.npy', sheet)
+        os.replace(sheet_path + '.tmp.npy', sheet_path)
+
+        # Sheets of other sizes built from different sources are dropped, so every saved sheet matches the index
+        index = {'teams': self.teams, 'sources': self.source_signature()}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r') as file:
+                if json.load(file) != index:
+                    for name in os.listdir(self.cache_dir):
+                        if name.startswith('logos_') and name != os.path.basename(sheet_path):
+                            os.remove(os.path.join(self.cache_dir, name))
+        with open(self.index_path + '.tmp', 'w') as file:
+            json.dump(index, file)
+        os.replace(self.index_path + '.tmp', self.index_path)
@@ -0,0 +1,170 @@
+import pandas as pd
+import numpy as np
+import re
+import os
+import inspect
+from datetime import datetime
+from log_helper import NFL_Logging
+from config_helper import load_config
+from clean import Clean
+
+
+class Validate:
+    """
+    Class used to validate batched, cleaned game DataFrames against the database schema before anything is written.
+
+    The checks are compiled once from 'Standard DB Queries/create_db.sql' (CHECK(LENGTH(..) <= n) constraints) and the
+    df_datatypes_to_db_datatypes maps in 'config.json', then run vectorized over every row of a season at once. Games
+    with any failing row are held back from the load and their failing rows are written to the Quarantine table.
+    """
+
+    def __init__(self, schema_path=os.path.join('Standard DB Queries', 'create_db.sql')):
+        """
+        Initializes the Validate class.
+
+        Loads column types from 'config.json' and length constraints from the create_db.sql schema.
+        """
+        self.log = NFL_Logging()
+        config = load_config()
+
+        # SQL column types for each table that gets loaded per game
+        self.column_types = {
+            'Game': config['Game_Table_Mapping']['df_datatypes_to_db_datatypes'],
+            'Team_Game_Stats': config['Team_Game_Stats_Mapping']['df_datatypes_to_db_datatypes'],
+            'Player_Game_Stats': config['Player_Game_Stats_Mapping']['df_datatypes_to_db_datatypes'],
+            'Weather': config['Weather_Table_Mapping']['df_datatypes_to_db_datatypes'],
+        }
+
+        # Columns that identify a row, can't be empty (NULL, '' or 0)
+        self.key_columns = {
+            'Game': ['GAME_ID'],
+            'Team_Game_Stats': ['GAME_ID', 'TEAM_ID'],
+            'Player_Game_Stats': ['GAME_ID', 'PLAYER_ID'],
+            'Weather': ['GAME_ID'],
+        }
+
+        self.length_constraints = self.parse_length_constraints(schema_path)
+
+
+    def parse_length_constraints(self, schema_path):
+        """
+        Reads the CHECK(LENGTH(COLUMN) <= n) constraints out of the schema file.
+
+        Returns
+        -------
+        dict
+            Table name -> {column: max length}
+        """
+        with open(schema_path, 'r') as file:
+            schema = file.read()
+
+        constraints = {}
+        for table, body in re.findall(r'CREATE TABLE (\w+) \((.*?)\);', schema, re.DOTALL):
+            checks = re.findall(r'CHECK\(LENGTH\((\w+)\) <= (\d+)\)', body)
+            constraints[table] = {column: int(max_length) for column, max_length in checks}
+        return constraints
+
+
+    def validate(self, frames):
+        """
+        Validates a batch of cleaned game DataFrames (database dtypes, i.e., after restore_column_types).
+
+        Parameters
+        ----------
+        frames : dict
+            Table name -> DataFrame with the rows of every game in the batch.
+
+        Returns
+        -------
+        tuple
+            (valid_frames, quarantine_df). valid_frames holds only rows of games that passed every check (a game
+            with only failing Weather rows keeps its other rows and loses just its weather), quarantine_df holds the
+            failing rows with their reasons (columns of the Quarantine table).
+        """
+        self.log.label_log(os.path.basename(__file__), inspect.currentframe().f_code.co_name)
+
+        game_ids = set(frames['Game']['GAME_ID']) if 'Game' in frames else set()
+        failures = []
+        for table, df in frames.items():
+            reasons = self.check_table(table, df, game_ids)
+            failed = reasons != ''
+            if failed.any():
+                failed_df = df[failed].drop(columns=[Clean.COERCED_COLUMN], errors='ignore')
+                failures.append(pd.DataFrame({
+                    'GAME_ID': failed_df['GAME_ID'].astype(str).to_numpy() if 'GAME_ID' in failed_df else '',
+                    'TABLE_NAME': table,
+                    'REASON': reasons[failed],
+                    'ROW_DATA': [row.to_json() for _, row in failed_df.iterrows()],
+                }))
+
+        quarantine_df = pd.concat(failures, ignore_index=True) if failures else pd.DataFrame(columns=['GAME_ID', 'TABLE_NAME', 'REASON', 'ROW_DATA'])
+        quarantine_df['QUARANTINED_AT'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # Hold back every row of a game with a failing row, so a game is never partially loaded. Weather has its own
+        # load and replay path (run_pipeline.load_weather), so failing weather only holds back the game's weather
+        weather_failed = quarantine_df['TABLE_NAME'] == 'Weather'
+        bad_games = set(quarantine_df.loc[~weather_failed, 'GAME_ID'])
+        bad_weather_games = bad_games | set(quarantine_df.loc[weather_failed, 'GAME_ID'])
+        valid_frames = {
+            table: df[~df['GAME_ID'].isin(bad_weather_games if table == 'Weather' else bad_games)].drop(columns=[Clean.COERCED_COLUMN], errors='ignore')
+            for table, df in frames.items()
+        }
+
+        if bad_games:
+            self.log.warning(f"Quarantined {(~weather_failed).sum()} rows from {len(bad_games)} games: {sorted(bad_games)}")
+        if bad_weather_games - bad_games:
+            self.log.warning(f"Quarantined weather rows, weather held back for {len(bad_weather_games - bad_games)} games: {sorted(bad_weather_games - bad_games)}")
+        self.log.info(f"Validated {sum(len(df) for df in frames.values())} rows from {len(game_ids)} games")
+        return valid_frames, quarantine_df
+
+
+    def check_table(self, table, df, game_ids):
+        """
+        Runs every check for a table over all of its rows at once.
+
+        Returns
+        -------
+        numpy.ndarray
+            One string per row with the reasons that row failed ('' for valid rows).
+        """
+        checks = []
+
+        for column in self.key_columns.get(table, []):
+            if column not in df.columns:
+                checks.append((np.ones(len(df), dtype=bool), f"missing {column}"))
+                continue
+            values = df[column]
+            checks.append((values.isna() | values.astype(str).isin(['', '0']), f"empty {column}"))
+
+        # Child rows need their game in the batch (otherwise they'd load without a Game row)
+        if table != 'Game' and 'GAME_ID' in df.columns:
+            checks.append((~df['GAME_ID'].isin(game_ids), "no Game row for GAME_ID"))
+
+        for column, sql_type in self.column_types.get(table, {}).items():
+            if column not in df.columns or sql_type not in ('INTEGER', 'REAL'):
+                continue
+            values = df[column]
+            numbers = pd.to_numeric(values, errors='coerce')
+            if sql_type == 'INTEGER':
+                checks.append((values.notna() & (numbers.isna() | (numbers % 1 != 0)), f"{column} is not an INTEGER"))
+            else:
+                checks.append((values.notna() & numbers.isna(), f"{column} is not a REAL"))
+
+        for column, max_length in self.length_constraints.get(table, {}).items():
+            if column in df.columns:
+                values = df[column]
+                checks.append((values.notna() & (values.astype(str).str.len() > max_length), f"{column} is longer than {max_length} characters"))
+
+        # Only build reason strings for the (few) rows that failed something
+        reasons = np.full(len(df), '', dtype=object)
+        masks = [np.asarray(mask, dtype=bool) for mask, _ in checks]
+        if masks and np.logical_or.reduce(masks).any():
+            for mask, reason in zip(masks, (reason for _, reason in checks)):
+                reasons[mask] = reasons[mask] + reason + '; '
+
+        # Values convert_column_types coerced to 0 (numeric columns already hold 0, so the checks above can't see them)
+        if Clean.COERCED_COLUMN in df.columns:
+            coerced = df[Clean.COERCED_COLUMN].fillna('').astype(str).to_numpy(dtype=object)
+            failed = coerced != ''
+            reasons[failed] = reasons[failed] + 'not a number: ' + coerced[failed]
+        return reasons